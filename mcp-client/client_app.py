@@ -25,49 +25,55 @@ class WeatherClient:
         """Send query to server and stream response"""
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.post(
+                async with client.stream(
+                    "POST",
                     f"{self.server_url}/api/query",
                     json={"query": query},
                     headers={"Content-Type": "application/json"},
                     timeout=120.0
-                )
-                response.raise_for_status()
-                
-                # 스트리밍 응답 처리
-                async for line in response.aiter_lines():
-                    line = line.strip()
-                    if not line:
-                        continue
-                        
-                    if line.startswith("data: "):
-                        try:
-                            data = json.loads(line[6:])  # "data: " 제거
+                ) as response:
+                    if response.is_error:
+                        await response.aread()
+                    response.raise_for_status()
+                    
+                    # 스트리밍 응답 처리
+                    streamed = False  # delta로 결과를 이미 출력했는지 여부
+                    async for line in response.aiter_lines():
+                        line = line.strip()
+                        if not line:
+                            continue
                             
-                            if data["type"] == "status":
-                                print(f"\n[상태] {data['message']}", end="", flush=True)
-                            elif data["type"] == "result":
-                                # 결과를 chunk 단위로 출력
-                                content = data['content']
-                                print(f"\n[결과] ", end="", flush=True)
+                        if line.startswith("data: "):
+                            try:
+                                data = json.loads(line[6:])  # "data: " 제거
                                 
-                                # 한 글자씩 출력하여 타이핑 효과 생성
-                                for char in content:
-                                    print(char, end="", flush=True)
-                                    await asyncio.sleep(0.01)  # 10ms 지연
-                                print()  # 줄바꿈
-                                
-                            elif data["type"] == "error":
-                                print(f"\n[오류] {data['message']}")
-                                
-                        except json.JSONDecodeError as e:
-                            print(f"JSON 파싱 오류: {e}, 라인: {line}")
-                            continue
-                        except KeyError as e:
-                            print(f"응답 형식 오류: {e}, 데이터: {data}")
-                            continue
-                    else:
-                        # 일반 텍스트 응답도 처리
-                        print(f"응답: {line}")
+                                if data["type"] == "status":
+                                    print(f"\n[상태] {data['message']}", end="", flush=True)
+                                elif data["type"] == "delta":
+                                    # 토큰이 도착하는 대로 출력
+                                    if not streamed:
+                                        print(f"\n[결과] ", end="", flush=True)
+                                        streamed = True
+                                    print(data['content'], end="", flush=True)
+                                elif data["type"] == "result":
+                                    if streamed:
+                                        print()  # 줄바꿈
+                                    else:
+                                        # delta 없이 전체 결과만 받은 경우
+                                        print(f"\n[결과] {data['content']}")
+                                    
+                                elif data["type"] == "error":
+                                    print(f"\n[오류] {data['message']}")
+                                    
+                            except json.JSONDecodeError as e:
+                                print(f"JSON 파싱 오류: {e}, 라인: {line}")
+                                continue
+                            except KeyError as e:
+                                print(f"응답 형식 오류: {e}, 데이터: {data}")
+                                continue
+                        else:
+                            # 일반 텍스트 응답도 처리
+                            print(f"응답: {line}")
                             
         except httpx.HTTPStatusError as e:
             print(f"\nHTTP 오류: {e.response.status_code} - {e.response.text}")
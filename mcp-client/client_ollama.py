@@ -25,6 +25,9 @@ def _flatten_to_str_list(obj):
     else:
         return [str(obj)]
 
+# 서버에 route_weather_query 도구가 없을 때의 기본 도구 호출 (LA 예보)
+DEFAULT_TOOL_CALL = ("get_forecast", {"latitude": 34.0522, "longitude": -118.2437})
+
 class MCPClientOllama:
     def __init__(self, ollama_url: str = "http://localhost:11434"):
         # Initialize session and client objects
@@ -143,6 +146,18 @@ class MCPClientOllama:
                 print(f"Error Type: {type(e)}")
                 raise Exception(f"Ollama API error: {str(e)}")
 
+    async def route_query(self, query: str) -> tuple[str, dict]:
+        """서버의 route_weather_query 도구로 질의에 맞는 (도구 이름, 도구 인수)를 고릅니다."""
+        if "route_weather_query" not in [tool.name for tool in self.tools]:
+            return DEFAULT_TOOL_CALL
+        try:
+            result = await self.session.call_tool("route_weather_query", {"query": query})
+            route = json.loads(result.content[0].text)
+            return route["tool"], route["arguments"]
+        except Exception as e:
+            print(f"Error routing query: {e}")
+            return DEFAULT_TOOL_CALL
+
     async def process_query(self, query: str) -> str:
         """Process a query using Ollama and available tools"""
         # Create a system message to guide the AI
@@ -207,23 +222,8 @@ When asked about weather, I will automatically call the appropriate weather tool
             if any(keyword in query_lower for keyword in weather_keywords):
                 should_call_tool = True
                 
-                # 위치에 따른 도구 선택
-                if any(location in query_lower for location in ["los angeles", "la", "캘리포니아", "california"]):
-                    tool_name = "get_forecast"
-                    tool_args = {"latitude": 34.0522, "longitude": -118.2437}
-                elif any(location in query_lower for location in ["new york", "뉴욕", "ny"]):
-                    tool_name = "get_forecast"
-                    tool_args = {"latitude": 40.7128, "longitude": -74.0060}
-                elif any(location in query_lower for location in ["texas", "텍사스", "tx"]):
-                    tool_name = "get_alerts"
-                    tool_args = {"state": "TX"}
-                elif any(location in query_lower for location in ["california", "캘리포니아", "ca"]):
-                    tool_name = "get_alerts"
-                    tool_args = {"state": "CA"}
-                else:
-                    # 기본적으로 LA 날씨 제공
-                    tool_name = "get_forecast"
-                    tool_args = {"latitude": 34.0522, "longitude": -118.2437}
+                # 질의에 언급된 지명으로 도구 선택 (지명이 없으면 LA 예보)
+                tool_name, tool_args = await self.route_query(query)
             
             # 도구 호출 실행
             if should_call_tool and tool_name:
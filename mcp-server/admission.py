@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+업스트림별 입장 제어 모듈
+NWS, GROQ, Ollama마다 동시 호출 수와 대기열 길이를 제한하고,
+대기 시간이 기한을 넘을 것으로 예상되는 질의는 처리하지 않고 바로 거절(503, Retry-After)합니다.
+"""
+
+import os
+import math
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable, Optional
+from logger_config import setup_logger
+
+# 로거 설정
+logger = setup_logger("admission")
+
+# 서비스 시간 이동 평균 가중치
+SERVICE_TIME_ALPHA = 0.2
+
+class AdmissionRejected(Exception):
+    """업스트림 대기열이 가득 찼거나 대기 시간이 기한을 넘어 요청을 거절함"""
+
+    def __init__(self, upstream: str, reason: str, retry_after: float):
+        super().__init__(f"{upstream}: {reason}")
+        self.upstream = upstream
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+class UpstreamLimiter:
+    """업스트림 하나의 동시 호출 수 제한과 대기열"""
+
+    def __init__(self, name: str, concurrency: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.concurrency = max(concurrency, 1)
+        self.max_queue = max(max_queue, 0)
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.service_ms: Optional[float] = None
+        self.rejected = 0
+        self.wait_timeouts = 0
+        self.waits = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def load(self) -> int:
+        """이 업스트림을 사용 중이거나 사용할 예정인 요청 수"""
+        return max(self.admitted, self.active + self.waiting)
+
+    def estimated_wait(self, ahead: int) -> float:
+        """앞에 ahead개의 요청이 있을 때 새 요청의 예상 대기 시간 (초)"""
+        over = ahead + 1 - self.concurrency
+        if over <= 0 or not self.service_ms:
+            return 0.0
+        return over / self.concurrency * self.service_ms / 1000
+
+    def check(self) -> None:
+        """새 요청을 받을 수 있는지 검사합니다 (받을 수 없으면 AdmissionRejected)."""
+        ahead = self.load()
+        wait = self.estimated_wait(ahead)
+        if ahead - self.concurrency >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected(self.name, "대기열이 가득 참", wait or self.max_wait)
+        if wait > self.max_wait:
+            self.rejected += 1
+            raise AdmissionRejected(self.name, f"예상 대기 시간 {wait:.1f}초가 기한 {self.max_wait:.0f}초를 넘음", wait)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        호출 슬롯을 얻은 뒤 블록을 실행합니다.
+        슬롯이 없으면 대기열에서 기다리며, 대기열이 가득 찼거나 기한 안에 슬롯을 얻지 못하면 AdmissionRejected를 발생시킵니다.
+        """
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected(self.name, "대기열이 가득 참", self.estimated_wait(self.load()) or self.max_wait)
+
+        self.waiting += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait if self.max_wait > 0 else None)
+        except asyncio.TimeoutError:
+            self.wait_timeouts += 1
+            raise AdmissionRejected(self.name, f"{self.max_wait:.0f}초 안에 호출 슬롯을 얻지 못함", self.max_wait)
+        finally:
+            self.waiting -= 1
+
+        waited = (time.perf_counter() - started) * 1000
+        self.waits += 1
+        self.wait_total_ms += waited
+        self.wait_max_ms = max(self.wait_max_ms, waited)
+
+        self.active += 1
+        acquired = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            elapsed = (time.perf_counter() - acquired) * 1000
+            self.service_ms = elapsed if self.service_ms is None else (
+                (1 - SERVICE_TIME_ALPHA) * self.service_ms + SERVICE_TIME_ALPHA * elapsed
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """동시 호출/대기열/대기 시간 통계를 반환합니다."""
+        return {
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_timeouts": self.wait_timeouts,
+            "avg_wait_ms": round(self.wait_total_ms / self.waits, 1) if self.waits else 0.0,
+            "max_wait_ms": round(self.wait_max_ms, 1),
+            "avg_service_ms": round(self.service_ms, 1) if self.service_ms else None,
+            "estimated_wait_ms": round(self.estimated_wait(self.load()) * 1000, 1),
+        }
+
+class AdmissionTicket:
+    """입장한 질의가 사용할 업스트림 목록 (질의가 끝나면 release)"""
+
+    def __init__(self, limiters: list[UpstreamLimiter]):
+        self._limiters = limiters
+        for limiter in limiters:
+            limiter.admitted += 1
+
+    def release(self) -> None:
+        """업스트림 사용 예정 수를 되돌립니다 (여러 번 호출해도 한 번만 반영)."""
+        limiters, self._limiters = self._limiters, []
+        for limiter in limiters:
+            limiter.admitted -= 1
+
+class AdmissionController:
+    """업스트림별 입장 제어기 모음"""
+
+    def __init__(self, max_wait: Optional[float] = None):
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv("ADMISSION_MAX_WAIT", "10"))
+        self.limiters: dict[str, UpstreamLimiter] = {
+            "nws": UpstreamLimiter(
+                "nws",
+                int(os.getenv("ADMISSION_NWS_CONCURRENCY", "20")),
+                int(os.getenv("ADMISSION_NWS_QUEUE", "200")),
+                self.max_wait,
+            ),
+            "groq": UpstreamLimiter(
+                "groq",
+                int(os.getenv("GROQ_MAX_CONCURRENCY", "8")),
+                int(os.getenv("ADMISSION_GROQ_QUEUE", "32")),
+                self.max_wait,
+            ),
+            "ollama": UpstreamLimiter(
+                "ollama",
+                int(os.getenv("ADMISSION_OLLAMA_CONCURRENCY", "2")),
+                int(os.getenv("ADMISSION_OLLAMA_QUEUE", "8")),
+                self.max_wait,
+            ),
+        }
+
+    def limiter(self, name: str) -> UpstreamLimiter:
+        return self.limiters[name]
+
+    def admit(self, upstreams: Iterable[str]) -> AdmissionTicket:
+        """
+        질의가 사용할 업스트림 모두에 여유가 있으면 입장시킵니다.
+
+        Raises:
+            AdmissionRejected: 한 업스트림이라도 대기열이 가득 찼거나 예상 대기 시간이 기한을 넘는 경우
+        """
+        limiters = [self.limiters[name] for name in dict.fromkeys(upstreams) if name in self.limiters]
+        for limiter in limiters:
+            limiter.check()
+        return AdmissionTicket(limiters)
+
+    def stats(self) -> dict[str, Any]:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+# 프로세스 전역 입장 제어기
+_controller: Optional[AdmissionController] = None
+
+def get_admission_controller() -> AdmissionController:
+    """프로세스 전역 입장 제어기를 반환합니다 (처음 호출 시 환경변수로 생성)."""
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
+
+def upstream_slot(name: str):
+    """업스트림 호출 슬롯 (async with upstream_slot("groq"): ...)"""
+    return get_admission_controller().limiter(name).slot()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+전국 기상 경보 수집 모듈
+/alerts/active를 주기적으로 한 번 가져와 파싱하고, 주(state)/존(zone)별 인덱스를 만들어
+get_alerts 요청을 메모리 조회로 처리합니다. (stale-while-revalidate)
+"""
+
+import os
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+from logger_config import setup_logger
+from nws_client import DEFAULT_API_BASE, get_nws_client
+from admission import AdmissionRejected
+from metrics import ALERTS_SECONDS
+from tracing import trace_span
+
+# 로거 설정
+logger = setup_logger("alerts-index")
+
+class AlertsIndex:
+    """한 번 수집한 경보 목록과 주/존별 인덱스 (읽기 전용 스냅샷)"""
+
+    def __init__(self, features: list[dict[str, Any]], fetched_at: float):
+        # 경보는 한 번만 저장하고, 인덱스는 같은 객체를 참조
+        self.features = features
+        self.fetched_at = fetched_at
+        self.by_state: dict[str, list[dict[str, Any]]] = {}
+        self.by_zone: dict[str, list[dict[str, Any]]] = {}
+
+        for feature in features:
+            ugc_codes = feature.get("properties", {}).get("geocode", {}).get("UGC", []) or []
+            states = []
+            for code in ugc_codes:
+                # UGC 코드 예: CAZ041, TXC201 → 앞 두 글자가 주/해역 코드
+                self.by_zone.setdefault(code, []).append(feature)
+                state = code[:2]
+                if state not in states:
+                    states.append(state)
+            for state in states:
+                self.by_state.setdefault(state, []).append(feature)
+
+    def for_state(self, state: str) -> list[dict[str, Any]]:
+        """주 코드(예: CA)에 해당하는 경보 목록을 반환합니다."""
+        return self.by_state.get(state.upper(), [])
+
+    def for_zone(self, zone: str) -> list[dict[str, Any]]:
+        """UGC 존 코드(예: CAZ041)에 해당하는 경보 목록을 반환합니다."""
+        return self.by_zone.get(zone.upper(), [])
+
+class AlertsIngester:
+    """전국 경보를 주기적으로 수집하여 AlertsIndex를 갱신하는 백그라운드 작업"""
+
+    def __init__(
+        self,
+        api_base: Optional[str] = None,
+        interval: Optional[float] = None,
+        max_stale: Optional[float] = None,
+    ):
+        # 인수가 없으면 환경변수 사용
+        self.api_base = api_base or os.getenv("NWS_API_BASE", DEFAULT_API_BASE)
+        self.interval = interval if interval is not None else float(os.getenv("ALERTS_REFRESH_INTERVAL", "60"))
+        self.max_stale = max_stale if max_stale is not None else float(os.getenv("ALERTS_MAX_STALE", "600"))
+        self.index: Optional[AlertsIndex] = None
+        self.refreshes = 0
+        self.failures = 0
+        self._raw: Optional[dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refreshing: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """백그라운드 수집 루프를 시작합니다."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"경보 수집 시작 - 주기: {self.interval}초")
+
+    async def stop(self) -> None:
+        """백그라운드 수집 루프를 중지합니다."""
+        for task in (self._task, self._refreshing):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._task = None
+        self._refreshing = None
+        logger.info("경보 수집 중지")
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self) -> bool:
+        """/alerts/active를 가져와 인덱스를 갱신합니다. 진행 중인 갱신이 있으면 그 결과를 기다립니다."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._refresh())
+        return await asyncio.shield(self._refreshing)
+
+    async def _refresh(self) -> bool:
+        try:
+            data = await get_nws_client().get_json(f"{self.api_base}/alerts/active")
+        except AdmissionRejected as e:
+            # NWS 호출이 혼잡하면 이번 갱신만 건너뜀 (수집 루프는 계속)
+            self.failures += 1
+            logger.warning(f"전국 경보 수집 건너뜀 - NWS 혼잡 ({e}), 기존 인덱스 유지")
+            return False
+        if not data or "features" not in data:
+            self.failures += 1
+            logger.error("전국 경보 수집 실패 - 기존 인덱스 유지")
+            return False
+
+        now = time.time()
+        if data is self._raw and self.index is not None:
+            # 304 재검증으로 같은 응답이면 다시 인덱싱하지 않음
+            self.index.fetched_at = now
+        else:
+            self.index = AlertsIndex(data["features"], now)
+            self._raw = data
+            logger.debug(f"경보 인덱스 갱신: {len(data['features'])}개 경보, {len(self.index.by_state)}개 주")
+        self.refreshes += 1
+        return True
+
+    def age(self) -> Optional[float]:
+        """현재 인덱스의 경과 시간(초)을 반환합니다."""
+        return time.time() - self.index.fetched_at if self.index is not None else None
+
+    async def get_state_alerts(self, state: str) -> list[dict[str, Any]] | None:
+        """
+        주별 경보를 메모리에서 조회합니다.
+        인덱스가 오래되었으면 기존 값을 바로 반환하고 백그라운드에서 갱신합니다.
+
+        Returns:
+            경보 목록, 인덱스가 없거나 max_stale보다 오래되었으면 None
+        """
+        if self.index is None:
+            # 첫 수집이 끝나지 않았으면 기다림
+            await self.refresh()
+
+        age = self.age()
+        if age is None or age > self.max_stale:
+            return None
+        if age > self.interval and (self._refreshing is None or self._refreshing.done()):
+            self._refreshing = asyncio.ensure_future(self._refresh())
+        return self.index.for_state(state)
+
+    def stats(self) -> dict[str, Any]:
+        """수집 통계를 반환합니다."""
+        return {
+            "alerts": len(self.index.features) if self.index is not None else 0,
+            "states": len(self.index.by_state) if self.index is not None else 0,
+            "age_seconds": self.age(),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+        }
+
+# 프로세스 전역 수집기
+_alerts_ingester: Optional[AlertsIngester] = None
+
+def get_alerts_ingester() -> Optional[AlertsIngester]:
+    """프로세스 전역 경보 수집기를 반환합니다 (시작되지 않았으면 None)."""
+    return _alerts_ingester
+
+async def fetch_state_alerts(state: str, api_base: Optional[str] = None) -> dict[str, Any] | None:
+    """
+    주별 경보를 /alerts/active/area/{state} 응답과 같은 형태로 반환합니다.
+    수집기 인덱스를 우선 사용하고, 사용할 수 없으면 NWS에 직접 요청합니다.
+
+    Args:
+        state: 두 글자 주 코드 (예: CA, NY)
+        api_base: NWS API 주소 (None이면 NWS_API_BASE 환경변수 사용)
+    """
+    started = time.perf_counter()
+    state = state.upper()
+    with trace_span("nws.alerts", state=state) as span:
+        try:
+            if _alerts_ingester is not None:
+                features = await _alerts_ingester.get_state_alerts(state)
+                if features is not None:
+                    logger.debug(f"경보 인덱스 조회: {state} ({len(features)}개)")
+                    span.set_attribute("source", "alerts_index")
+                    return {"features": features}
+
+            api_base = api_base or os.getenv("NWS_API_BASE", DEFAULT_API_BASE)
+            return await get_nws_client().get_json(f"{api_base}/alerts/active/area/{state}")
+        finally:
+            ALERTS_SECONDS.observe_since(started)
+
+@asynccontextmanager
+async def alerts_lifespan(api_base: Optional[str] = None):
+    """
+    서버 시작/종료 시 전국 경보 수집기를 시작하고 중지하는 컨텍스트 매니저
+    ALERTS_INGEST_ENABLED=false이면 아무것도 하지 않습니다 (주별 직접 요청).
+
+    Args:
+        api_base: NWS API 주소 (None이면 NWS_API_BASE 환경변수 사용)
+    """
+    global _alerts_ingester
+    if os.getenv("ALERTS_INGEST_ENABLED", "true").lower() != "true":
+        yield None
+        return
+
+    _alerts_ingester = AlertsIngester(api_base)
+    await _alerts_ingester.start()
+    try:
+        yield _alerts_ingester
+    finally:
+        await _alerts_ingester.stop()
+        _alerts_ingester = None
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+End-to-end 지연 시간 벤치마크
+HTTP 엔드포인트(/api/query SSE, /api/get_forecast, /api/get_alerts), mcp_bridge 도구,
+stdio MCP 서버를 지정한 동시성으로 호출하고 p50/p95/p99 지연과 처리량을 보고합니다.
+
+사용법:
+    # 대체 서버(fake_nws, fake_llm)와 server_app을 직접 띄워서 측정
+    python bench_e2e.py --spawn --requests 200 --concurrency 20
+
+    # 이미 실행 중인 서버를 측정
+    python bench_e2e.py --server-url http://localhost:8000 --targets query,forecast,alerts
+
+    # 결과 저장
+    python bench_e2e.py --spawn --json bench.json --markdown bench.md
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import subprocess
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+import httpx
+
+SERVER_DIR = Path(__file__).parent
+
+# 벤치마크에 사용할 좌표 (반복 사용하여 캐시 효과 포함)
+LOCATIONS = [
+    (34.0522, -118.2437),  # Los Angeles
+    (40.7128, -74.0060),   # New York
+    (29.7604, -95.3698),   # Houston
+    (41.8781, -87.6298),   # Chicago
+    (47.6062, -122.3321),  # Seattle
+]
+STATES = ["CA", "TX", "NY", "NV", "AZ"]
+QUERIES = ["LA 날씨 알려줘", "뉴욕 날씨 예보", "텍사스 날씨 경보", "what is the weather in los angeles"]
+
+HTTP_TARGETS = ["query", "forecast", "alerts"]
+MCP_TARGETS = ["bridge", "weather.py", "weather_mcp_simple.py", "weather_mcp.py"]
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """정렬된 값에서 nearest-rank 백분위수를 반환합니다."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+def summarize(values: list[float]) -> dict[str, float]:
+    """지연 값(초)을 ms 단위 통계로 요약합니다."""
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    return {
+        "p50": round(percentile(ordered, 50) * 1000, 2),
+        "p95": round(percentile(ordered, 95) * 1000, 2),
+        "p99": round(percentile(ordered, 99) * 1000, 2),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 2),
+        "max": round(ordered[-1] * 1000, 2),
+    }
+
+class Recorder:
+    """대상별 요청 결과 기록"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: list[float] = []
+        self.first_event: list[float] = []
+        self.errors = 0
+        self.started = 0.0
+        self.finished = 0.0
+
+    def report(self) -> dict[str, Any]:
+        elapsed = self.finished - self.started
+        completed = len(self.latencies)
+        return {
+            "requests": completed + self.errors,
+            "errors": self.errors,
+            "elapsed_s": round(elapsed, 3),
+            "rps": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+            "latency_ms": summarize(self.latencies),
+            "first_event_ms": summarize(self.first_event),
+        }
+
+async def run_load(
+    recorder: Recorder,
+    requests: int,
+    concurrency: int,
+    one_request: Callable[[int], Awaitable[tuple[Optional[float], float]]],
+) -> None:
+    """one_request를 requests번, 최대 concurrency개 동시에 실행합니다."""
+    counter = iter(range(requests))
+
+    async def worker():
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                first_event, total = await one_request(index)
+            except Exception as e:
+                recorder.errors += 1
+                print(f"[{recorder.name}] 요청 실패: {e}", file=sys.stderr)
+                continue
+            recorder.latencies.append(total - started)
+            if first_event is not None:
+                recorder.first_event.append(first_event - started)
+
+    recorder.started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    recorder.finished = time.perf_counter()
+
+def http_request_factory(client: httpx.AsyncClient, server_url: str, target: str):
+    """HTTP 대상별 단일 요청 함수를 만듭니다. (첫 이벤트 시각, 완료 시각)을 반환합니다."""
+
+    async def query(index: int):
+        first_event = None
+        async with client.stream("POST", f"{server_url}/api/query", json={"query": QUERIES[index % len(QUERIES)]}) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                if first_event is None:
+                    first_event = time.perf_counter()
+                data = json.loads(line[6:])
+                if data["type"] == "error":
+                    raise RuntimeError(data["message"])
+        return first_event, time.perf_counter()
+
+    async def forecast(index: int):
+        latitude, longitude = LOCATIONS[index % len(LOCATIONS)]
+        response = await client.post(f"{server_url}/api/get_forecast", json={"latitude": latitude, "longitude": longitude})
+        response.raise_for_status()
+        if not response.json()["success"]:
+            raise RuntimeError(response.json()["error"])
+        return None, time.perf_counter()
+
+    async def alerts(index: int):
+        response = await client.post(f"{server_url}/api/get_alerts", json={"state": STATES[index % len(STATES)]})
+        response.raise_for_status()
+        if not response.json()["success"]:
+            raise RuntimeError(response.json()["error"])
+        return None, time.perf_counter()
+
+    return {"query": query, "forecast": forecast, "alerts": alerts}[target]
+
+async def bench_mcp(target: str, server_url: str, requests: int, concurrency: int, env: dict[str, str]) -> Recorder:
+    """stdio MCP 서버(또는 mcp_bridge)를 띄우고 get_forecast 도구를 호출합니다."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    if target == "bridge":
+        args = [str(SERVER_DIR / "mcp_bridge.py"), "--url", server_url]
+        name = "mcp_bridge"
+    else:
+        args = [str(SERVER_DIR / target)]
+        name = target
+
+    recorder = Recorder(f"mcp:{name}")
+    params = StdioServerParameters(command=sys.executable, args=args, env=env, cwd=str(SERVER_DIR))
+    async with stdio_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+
+            async def one_request(index: int):
+                latitude, longitude = LOCATIONS[index % len(LOCATIONS)]
+                result = await session.call_tool("get_forecast", {"latitude": latitude, "longitude": longitude})
+                if result.isError:
+                    raise RuntimeError(result.content[0].text if result.content else "tool error")
+                return None, time.perf_counter()
+
+            await run_load(recorder, requests, concurrency, one_request)
+    return recorder
+
+def wait_for_http(url: str, timeout: float = 30.0) -> None:
+    """서버가 응답할 때까지 기다립니다."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"서버가 응답하지 않습니다: {url}")
+
+def spawn_stack(args: argparse.Namespace, env: dict[str, str]) -> list[subprocess.Popen]:
+    """fake_nws, fake_llm, server_app을 하위 프로세스로 실행합니다."""
+    python = sys.executable
+    processes = [
+        subprocess.Popen(
+            [python, "fake_nws.py", "--port", str(args.nws_port),
+             "--latency-ms", str(args.nws_latency_ms), "--error-rate", str(args.nws_error_rate)],
+            cwd=SERVER_DIR, env=env,
+        ),
+        subprocess.Popen(
+            [python, "fake_llm.py", "--port", str(args.llm_port),
+             "--first-token-ms", str(args.llm_first_token_ms), "--token-ms", str(args.llm_token_ms)],
+            cwd=SERVER_DIR, env=env,
+        ),
+    ]
+    wait_for_http(f"http://127.0.0.1:{args.nws_port}/_fake/stats")
+    wait_for_http(f"http://127.0.0.1:{args.llm_port}/_fake/stats")
+
+    processes.append(subprocess.Popen(
+        [python, "-m", "uvicorn", "server_app:app", "--port", str(args.server_port), "--log-level", "warning"],
+        cwd=SERVER_DIR, env=env,
+    ))
+    wait_for_http(f"{args.server_url}/health")
+    return processes
+
+def to_markdown(report: dict[str, Any]) -> str:
+    """보고서를 markdown 표로 변환합니다."""
+    lines = [
+        f"# Benchmark report ({report['meta']['timestamp']})",
+        "",
+        f"- requests per target: {report['meta']['requests']}, concurrency: {report['meta']['concurrency']}",
+        f"- python: {report['meta']['python']}, platform: {report['meta']['platform']}",
+        "",
+        "| target | requests | errors | req/s | p50 ms | p95 ms | p99 ms | max ms | first event p50 ms | first event p95 ms |",
+        "|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for name, result in report["targets"].items():
+        latency = result["latency_ms"]
+        first = result["first_event_ms"]
+        lines.append(
+            f"| {name} | {result['requests']} | {result['errors']} | {result['rps']} "
+            f"| {latency.get('p50', '-')} | {latency.get('p95', '-')} | {latency.get('p99', '-')} | {latency.get('max', '-')} "
+            f"| {first.get('p50', '-')} | {first.get('p95', '-')} |"
+        )
+    return "\n".join(lines) + "\n"
+
+async def run(args: argparse.Namespace, env: dict[str, str]) -> dict[str, Any]:
+    targets = [target.strip() for target in args.targets.split(",") if target.strip()]
+    recorders: list[Recorder] = []
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        for target in targets:
+            if target not in HTTP_TARGETS:
+                continue
+            # 워밍업 (연결 수립, 캐시 채우기)
+            one_request = http_request_factory(client, args.server_url, target)
+            for index in range(args.warmup):
+                await one_request(index)
+            recorder = Recorder(f"http:{target}")
+            await run_load(recorder, args.requests, args.concurrency, one_request)
+            recorders.append(recorder)
+
+    for target in targets:
+        if target in MCP_TARGETS:
+            recorders.append(await bench_mcp(target, args.server_url, args.requests, args.concurrency, env))
+        elif target not in HTTP_TARGETS:
+            print(f"알 수 없는 대상 무시: {target}", file=sys.stderr)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "server_url": args.server_url,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "targets": {recorder.name: recorder.report() for recorder in recorders},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end latency benchmark")
+    parser.add_argument("--server-url", default=None, help="측정할 HTTP 서버 URL (기본값: http://127.0.0.1:<server-port>)")
+    parser.add_argument("--targets", default="query,forecast,alerts,bridge,weather.py",
+                        help=f"측정 대상 (쉼표 구분): {', '.join(HTTP_TARGETS + MCP_TARGETS)}")
+    parser.add_argument("--requests", "-n", type=int, default=100, help="대상별 요청 수 (기본값: 100)")
+    parser.add_argument("--concurrency", "-c", type=int, default=10, help="동시 요청 수 (기본값: 10)")
+    parser.add_argument("--warmup", type=int, default=5, help="HTTP 대상별 워밍업 요청 수 (기본값: 5)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--json", dest="json_path", help="JSON 보고서 저장 경로")
+    parser.add_argument("--markdown", dest="markdown_path", help="markdown 보고서 저장 경로")
+    parser.add_argument("--spawn", action="store_true", help="fake_nws, fake_llm, server_app을 직접 실행")
+    parser.add_argument("--server-port", type=int, default=8000)
+    parser.add_argument("--nws-port", type=int, default=9000)
+    parser.add_argument("--llm-port", type=int, default=9100)
+    parser.add_argument("--llm-provider", default="ollama", choices=["ollama", "groq"], help="--spawn 시 사용할 LLM Provider")
+    parser.add_argument("--nws-latency-ms", type=float, default=50.0, help="--spawn 시 fake NWS 지연 (ms)")
+    parser.add_argument("--nws-error-rate", type=float, default=0.0, help="--spawn 시 fake NWS 오류 비율")
+    parser.add_argument("--llm-first-token-ms", type=float, default=200.0, help="--spawn 시 fake LLM 첫 토큰 지연 (ms)")
+    parser.add_argument("--llm-token-ms", type=float, default=10.0, help="--spawn 시 fake LLM 토큰 간 지연 (ms)")
+    args = parser.parse_args()
+    args.server_url = args.server_url or f"http://127.0.0.1:{args.server_port}"
+
+    # 하위 프로세스(서버, MCP 서버)가 대체 서버를 사용하도록 환경 구성
+    env = os.environ.copy()
+    env.update({
+        "PYTHONIOENCODING": "utf-8",
+        "NWS_API_BASE": f"http://127.0.0.1:{args.nws_port}",
+        "OLLAMA_URL": f"http://127.0.0.1:{args.llm_port}",
+        "GROQ_BASE_URL": f"http://127.0.0.1:{args.llm_port}",
+        "LOG_LEVEL": env.get("LOG_LEVEL", "WARNING"),
+    })
+    if args.spawn:
+        env["LLM_PROVIDER"] = args.llm_provider
+        env.setdefault("GROQ_API_KEY", "fake")
+        if env["GROQ_API_KEY"] == "your_groq_api_key_here":
+            env["GROQ_API_KEY"] = "fake"
+
+    processes = spawn_stack(args, env) if args.spawn else []
+    try:
+        report = asyncio.run(run(args, env))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+    print(to_markdown(report))
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.markdown_path:
+        Path(args.markdown_path).write_text(to_markdown(report), encoding="utf-8")
+
+if __name__ == "__main__":
+    main()
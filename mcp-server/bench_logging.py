@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+로깅 오버헤드 벤치마크
+/api/query 요청 하나가 남기는 로그(상태 INFO, 단계별 DEBUG, LLM 메시지 payload)를 흉내 내어
+요청 처리 스레드(이벤트 루프)가 로깅에 쓰는 시간을 요청당 µs로 측정합니다.
+
+- 호출 방식: eager (f-string + json.dumps를 항상 계산) / lazy (%-style + lazy_json)
+- 기록 방식: sync (핸들러가 호출 스레드에서 파일 기록) / queue (QueueHandler → 백그라운드 기록)
+- 로그 레벨: INFO / DEBUG
+
+실제 서버는 요청 사이에 NWS/LLM 응답을 기다리므로 요청 사이에 --gap-ms만큼 쉬고,
+로깅 호출에 걸린 시간만 합산합니다 (--gap-ms 0이면 쉬지 않고 연속 호출).
+
+사용법:
+    python bench_logging.py --requests 1000
+    python bench_logging.py --requests 1000 --gap-ms 0 --markdown bench_logging.md
+"""
+
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+from logger_config import lazy_json, setup_logger, stop_log_listeners
+
+# /api/query 번역 요청과 비슷한 크기의 LLM 메시지
+PERIOD = (
+    "{name}:\nTemperature: 75°F\nWind: 5 to 10 mph SW\n"
+    "Forecast: Sunny, with a high near 75. Southwest wind 5 to 10 mph.\n"
+)
+MESSAGES = [
+    {"role": "system", "content": "다음 날씨 정보를 한국어로 번역하고, 단위를 한국에서 사용하는 단위로 변경해주세요."},
+    {
+        "role": "user",
+        "content": "\n---\n".join(PERIOD.format(name=name) for name in ["Today", "Tonight", "Monday", "Monday Night", "Tuesday"]),
+    },
+]
+URLS = ["http://localhost:9000/points/34.0522,-118.2437", "http://localhost:9000/gridpoints/LOX/154,44/forecast"]
+QUERY = "What is the weather in Los Angeles?"
+
+def request_eager(logger) -> None:
+    """기존 방식: 레벨과 관계없이 메시지 문자열과 payload를 먼저 만듦"""
+    logger.info(f"쿼리 처리 시작: {QUERY}")
+    logger.debug(f"LLM Provider: {'groq'}")
+    logger.debug(f"쿼리 (소문자): {QUERY.lower()}")
+    logger.debug(f"선택된 도구: {'get_forecast'}")
+    logger.debug(f"도구 인수: {({'latitude': 34.0522, 'longitude': -118.2437})}")
+    for url in URLS:
+        logger.debug(f"NWS API 호출: {url}")
+        logger.debug(f"NWS API 응답 상태: {200} ({'HTTP/1.1'})")
+    logger.debug(f"GROQ API 스트리밍 시작 - 모델: {'llama3-8b-8192'}")
+    logger.debug(f"메시지 개수: {len(MESSAGES)}")
+    logger.debug(f"GROQ 메시지: {json.dumps(MESSAGES, ensure_ascii=False, indent=2)}")
+    logger.debug(f"시스템 메시지: {MESSAGES[0]['content']}")
+    logger.debug(f"GROQ API 스트리밍 완료 (max_tokens: {1024}, finish_reason: {'stop'})")
+    logger.debug(f"LLM 응답: {MESSAGES[1]['content']}")
+    logger.info("쿼리 처리 완료")
+
+def request_lazy(logger) -> None:
+    """새 방식: 레벨이 꺼져 있으면 문자열 결합과 직렬화를 하지 않음"""
+    logger.info("쿼리 처리 시작: %s", QUERY)
+    logger.debug("LLM Provider: %s", "groq")
+    logger.debug("쿼리 (소문자): %s", QUERY)
+    logger.debug("선택된 도구: %s", "get_forecast")
+    logger.debug("도구 인수: %s", {"latitude": 34.0522, "longitude": -118.2437})
+    for url in URLS:
+        logger.debug("NWS API 호출: %s", url)
+        logger.debug("NWS API 응답 상태: %s (%s)", 200, "HTTP/1.1")
+    logger.debug("GROQ API 스트리밍 시작 - 모델: %s", "llama3-8b-8192")
+    logger.debug("메시지 개수: %s", len(MESSAGES))
+    logger.debug("GROQ 메시지: %s", lazy_json(MESSAGES))
+    logger.debug("시스템 메시지: %s", MESSAGES[0]["content"])
+    logger.debug("GROQ API 스트리밍 완료 (max_tokens: %s, finish_reason: %s)", 1024, "stop")
+    logger.debug("LLM 응답: %s", MESSAGES[1]["content"])
+    logger.info("쿼리 처리 완료")
+
+STYLES: dict[str, Callable[[Any], None]] = {"eager": request_eager, "lazy": request_lazy}
+
+def measure(style: str, mode: str, level: str, requests: int, gap: float, log_dir: Path) -> dict[str, Any]:
+    """한 조합의 요청당 로깅 시간(호출 스레드 기준)과 기록 완료까지의 시간을 측정합니다."""
+    log_file = log_dir / f"{style}-{mode}-{level}.log"
+    logger = setup_logger(f"bench-logging.{style}.{mode}.{level}", str(log_file), level, "file", mode == "queue")
+    logger.propagate = False
+    one_request = STYLES[style]
+
+    for _ in range(min(requests, 50)):
+        one_request(logger)
+
+    caller = 0.0
+    for _ in range(requests):
+        started = time.perf_counter()
+        one_request(logger)
+        caller += time.perf_counter() - started
+        if gap > 0:
+            time.sleep(gap)
+
+    # 백그라운드 기록기가 큐에 남은 로그를 모두 기록하는 데 걸린 시간
+    started = time.perf_counter()
+    stop_log_listeners()
+    drain = time.perf_counter() - started
+
+    return {
+        "style": style,
+        "mode": mode,
+        "level": level,
+        "us_per_request": round(caller / requests * 1e6, 1),
+        "drain_ms": round(drain * 1000, 1),
+        # 로테이션된 파일 포함
+        "log_bytes": sum(path.stat().st_size for path in log_dir.glob(f"{log_file.name}*")),
+    }
+
+def to_markdown(results: list[dict[str, Any]], requests: int) -> str:
+    lines = [
+        f"### 요청당 로깅 시간 ({requests}회 평균)",
+        "",
+        "| 호출 방식 | 기록 방식 | 레벨 | 호출 스레드 (µs/요청) | 남은 큐 기록 (ms) | 로그 크기 |",
+        "|---|---|---|---:|---:|---:|",
+    ]
+    for result in results:
+        lines.append(
+            f"| {result['style']} | {result['mode']} | {result['level']} | {result['us_per_request']} "
+            f"| {result['drain_ms']} | {result['log_bytes']:,} B |"
+        )
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-request logging overhead benchmark")
+    parser.add_argument("--requests", "-n", type=int, default=1000, help="조합별 요청 수 (기본값: 1000)")
+    parser.add_argument("--gap-ms", type=float, default=1.0, help="요청 사이 대기 시간 (ms, 기본값: 1)")
+    parser.add_argument("--json", dest="json_path", help="JSON 보고서 저장 경로")
+    parser.add_argument("--markdown", dest="markdown_path", help="markdown 보고서 저장 경로")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as log_dir:
+        for level in ["INFO", "DEBUG"]:
+            for mode in ["sync", "queue"]:
+                for style in STYLES:
+                    results.append(measure(style, mode, level, args.requests, args.gap_ms / 1000, Path(log_dir)))
+
+    report = to_markdown(results, args.requests)
+    print(report)
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.markdown_path:
+        Path(args.markdown_path).write_text(report + "\n", encoding="utf-8")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+MCP 브리지 → HTTP 서버 공용 클라이언트 모듈
+브리지 프로세스 전체에서 하나의 커넥션 풀(keep-alive, 선택적으로 HTTP/2 또는 Unix 도메인 소켓)을 공유하고,
+종료 시 연결 재사용 통계를 로그로 남깁니다.
+"""
+
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+import httpx
+from logger_config import setup_logger
+
+# 로거 설정
+logger = setup_logger("bridge-client")
+
+DEFAULT_SERVER_URL = "http://localhost:8000"
+
+# 새 연결이 만들어질 때 httpcore가 보내는 trace 이벤트
+_CONNECT_EVENTS = ("connection.connect_tcp.complete", "connection.connect_unix_socket.complete")
+
+class BridgeClient:
+    """HTTP 서버와의 keep-alive 커넥션 풀을 유지하는 브리지 클라이언트"""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_SERVER_URL,
+        uds: Optional[str] = None,
+        http2: Optional[bool] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ):
+        # 인수가 없으면 환경변수 사용
+        self.base_url = base_url.rstrip("/")
+        self.uds = uds or os.getenv("BRIDGE_UDS") or None
+        self.http2 = http2 if http2 is not None else os.getenv("BRIDGE_HTTP2", "false").lower() == "true"
+        self.limits = httpx.Limits(
+            max_connections=max_connections or int(os.getenv("BRIDGE_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=max_keepalive_connections or int(os.getenv("BRIDGE_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=keepalive_expiry or float(os.getenv("BRIDGE_KEEPALIVE_EXPIRY", "60")),
+        )
+        # /api/query는 LLM 응답이 끝날 때까지 스트리밍하므로 읽기 타임아웃을 길게 둠
+        read = read_timeout or float(os.getenv("BRIDGE_READ_TIMEOUT", "120"))
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout or float(os.getenv("BRIDGE_CONNECT_TIMEOUT", "5")),
+            read=read,
+            write=read,
+            pool=read,
+        )
+        self.requests = 0
+        self.connections = 0
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        """커넥션 풀을 생성합니다."""
+        if self._client is not None:
+            return
+
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("h2 패키지가 없어 HTTP/1.1로 동작합니다. (pip install 'httpx[http2]')")
+                http2 = False
+
+        uds = self.uds
+        if uds and not os.path.exists(uds):
+            logger.warning(f"Unix 소켓 {uds}이 없어 TCP로 연결합니다: {self.base_url}")
+            uds = None
+
+        # uds를 쓰면 base_url의 호스트는 Host 헤더로만 쓰이고 실제 연결은 소켓 파일로 감
+        transport = httpx.AsyncHTTPTransport(http2=http2, limits=self.limits, uds=uds)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=transport,
+            timeout=self.timeout,
+        )
+        logger.info(
+            f"브리지 HTTP 클라이언트 시작 - {self.base_url}"
+            f"{f' (Unix 소켓: {uds})' if uds else ''}, HTTP/2: {http2}, "
+            f"최대 연결: {self.limits.max_connections}, keep-alive: {self.limits.max_keepalive_connections}"
+        )
+
+    async def aclose(self) -> None:
+        """커넥션 풀을 닫고 연결 재사용 통계를 남깁니다."""
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+        stats = self.stats()
+        logger.info(
+            f"브리지 HTTP 클라이언트 종료 - 요청 {stats['requests']}건, 새 연결 {stats['connections']}개, "
+            f"재사용 {stats['reused']}건 (재사용률 {stats['reuse_ratio']:.0%})"
+        )
+
+    async def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        """httpcore trace 콜백: 새 연결 수를 셈 (요청 수와의 차이가 재사용 수)"""
+        if event_name in _CONNECT_EVENTS:
+            self.connections += 1
+
+    def stream(self, method: str, path: str, **kwargs: Any):
+        """
+        풀의 연결로 스트리밍 요청을 보냅니다 (async with client.stream(...) as response).
+        path는 HTTP 서버 기준 경로 (예: "/api/query")
+        """
+        if self._client is None:
+            raise RuntimeError("브리지 HTTP 클라이언트가 시작되지 않았습니다. (start_bridge_client 호출 필요)")
+        self.requests += 1
+        return self._client.stream(method, path, extensions={"trace": self._trace}, **kwargs)
+
+    async def post_json(self, path: str, payload: dict[str, Any], headers: Optional[dict[str, str]] = None) -> Any:
+        """풀의 연결로 JSON을 POST하고 응답 JSON을 반환합니다 (HTTP 오류 상태면 httpx.HTTPStatusError)."""
+        if self._client is None:
+            raise RuntimeError("브리지 HTTP 클라이언트가 시작되지 않았습니다. (start_bridge_client 호출 필요)")
+        self.requests += 1
+        response = await self._client.post(path, json=payload, headers=headers, extensions={"trace": self._trace})
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self) -> dict[str, Any]:
+        """요청 수, 새 연결 수, 재사용한 요청 수와 비율"""
+        reused = max(self.requests - self.connections, 0)
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reused": reused,
+            "reuse_ratio": reused / self.requests if self.requests else 0.0,
+        }
+
+# 프로세스 전역 브리지 클라이언트
+_bridge_client: Optional[BridgeClient] = None
+
+def get_bridge_client() -> BridgeClient:
+    """프로세스 전역 브리지 클라이언트를 반환합니다 (없으면 기본 설정으로 생성)."""
+    global _bridge_client
+    if _bridge_client is None:
+        _bridge_client = BridgeClient(os.getenv("HTTP_SERVER_URL", DEFAULT_SERVER_URL))
+    return _bridge_client
+
+async def start_bridge_client(base_url: str, uds: Optional[str] = None) -> BridgeClient:
+    """프로세스 전역 브리지 클라이언트를 생성하고 커넥션 풀을 엽니다."""
+    global _bridge_client
+    if _bridge_client is None:
+        _bridge_client = BridgeClient(base_url, uds)
+    await _bridge_client.start()
+    return _bridge_client
+
+async def close_bridge_client() -> None:
+    """프로세스 전역 브리지 클라이언트를 닫습니다."""
+    global _bridge_client
+    if _bridge_client is not None:
+        await _bridge_client.aclose()
+        _bridge_client = None
+
+@asynccontextmanager
+async def bridge_lifespan(base_url: str, uds: Optional[str] = None):
+    """
+    브리지 시작/종료 시 HTTP 서버 커넥션 풀을 열고 닫는 컨텍스트 매니저
+
+    Args:
+        base_url: HTTP 서버 URL
+        uds: HTTP 서버가 듣고 있는 Unix 도메인 소켓 경로 (None이면 BRIDGE_UDS 환경변수, 없으면 TCP)
+    """
+    await start_bridge_client(base_url, uds)
+    try:
+        yield get_bridge_client()
+    finally:
+        await close_bridge_client()
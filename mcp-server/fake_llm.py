@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Fake LLM Server - 오프라인 부하 테스트용 Ollama / Groq 대체 서버
+Ollama `/api/generate`와 Groq(OpenAI 호환) `/openai/v1/chat/completions`를 흉내 내며
+첫 토큰 지연, 토큰당 지연, 오류 비율을 설정할 수 있습니다.
+
+사용법:
+    python fake_llm.py --port 9100 --first-token-ms 300 --token-ms 20
+    OLLAMA_URL=http://localhost:9100 LLM_PROVIDER=ollama python server_app.py
+    GROQ_BASE_URL=http://localhost:9100 GROQ_API_KEY=fake LLM_PROVIDER=groq python server_app.py
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from typing import AsyncGenerator
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+import uvicorn
+
+# 기본 설정 (환경변수 또는 명령행 인수로 변경 가능)
+settings = {
+    "first_token_ms": float(os.getenv("FAKE_LLM_FIRST_TOKEN_MS", "0")),
+    "token_ms": float(os.getenv("FAKE_LLM_TOKEN_MS", "0")),
+    "error_rate": float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+    "max_tokens": int(os.getenv("FAKE_LLM_MAX_TOKENS", "256")),
+}
+
+stats = {"requests": 0, "errors": 0, "tokens": 0}
+
+CANNED_RESPONSE = (
+    "오늘 오후: 맑음, 최고 기온 약 30°C. 남서풍 시속 8~16km.\n"
+    "오늘 밤: 대체로 맑음, 최저 기온 약 19°C. 남서풍 시속 0~16km.\n"
+    "화요일: 오전 11시 이전 곳에 따라 안개, 이후 대체로 맑음, 최고 기온 약 29°C.\n"
+    "화요일 밤: 대체로 흐림, 최저 기온 약 18°C.\n"
+    "수요일: 맑음, 최고 기온 약 29°C. 남남서풍 시속 0~16km."
+)
+
+app = FastAPI(title="Fake LLM API", version="1.0.0")
+
+def tokenize(text: str, limit: int) -> list[str]:
+    """공백을 포함한 단어 단위 토큰으로 나눕니다."""
+    return re.findall(r"\S+\s*|\s+", text)[:limit]
+
+def injected_error() -> JSONResponse | None:
+    stats["requests"] += 1
+    if settings["error_rate"] and random.random() < settings["error_rate"]:
+        stats["errors"] += 1
+        return JSONResponse(status_code=503, content={"error": "Injected error from fake LLM server"})
+    return None
+
+async def generate_tokens(limit: int) -> AsyncGenerator[str, None]:
+    """설정된 지연을 두고 토큰을 하나씩 내보냅니다."""
+    if settings["first_token_ms"] > 0:
+        await asyncio.sleep(settings["first_token_ms"] / 1000)
+    for index, token in enumerate(tokenize(CANNED_RESPONSE, limit)):
+        if index and settings["token_ms"] > 0:
+            await asyncio.sleep(settings["token_ms"] / 1000)
+        stats["tokens"] += 1
+        yield token
+
+@app.post("/api/generate")
+async def ollama_generate(request: Request):
+    """Ollama /api/generate 호환 엔드포인트"""
+    error = injected_error()
+    if error:
+        return error
+
+    payload = await request.json()
+    model = payload.get("model", "fake")
+    limit = min(int(payload.get("options", {}).get("num_predict", settings["max_tokens"])), settings["max_tokens"])
+    started = time.perf_counter_ns()
+
+    if payload.get("stream", True):
+        async def stream() -> AsyncGenerator[str, None]:
+            count = 0
+            async for token in generate_tokens(limit):
+                count += 1
+                yield json.dumps({"model": model, "response": token, "done": False}, ensure_ascii=False) + "\n"
+            yield json.dumps({
+                "model": model,
+                "response": "",
+                "done": True,
+                "done_reason": "stop",
+                "eval_count": count,
+                "total_duration": time.perf_counter_ns() - started,
+            }) + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    tokens = [token async for token in generate_tokens(limit)]
+    return {
+        "model": model,
+        "response": "".join(tokens),
+        "done": True,
+        "done_reason": "stop",
+        "eval_count": len(tokens),
+        "total_duration": time.perf_counter_ns() - started,
+    }
+
+@app.post("/openai/v1/chat/completions")
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    """Groq / OpenAI chat completions 호환 엔드포인트"""
+    error = injected_error()
+    if error:
+        return error
+
+    payload = await request.json()
+    model = payload.get("model", "fake")
+    limit = min(int(payload.get("max_tokens") or settings["max_tokens"]), settings["max_tokens"])
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+
+    if payload.get("stream"):
+        async def stream() -> AsyncGenerator[str, None]:
+            count = 0
+            async for token in generate_tokens(limit):
+                count += 1
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+            finish_reason = "length" if count >= limit else "stop"
+            final = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}],
+            }
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    tokens = [token async for token in generate_tokens(limit)]
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": "".join(tokens)},
+            "finish_reason": "length" if len(tokens) >= limit else "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+    }
+
+@app.get("/_fake/stats")
+async def fake_stats():
+    """요청 통계와 현재 설정"""
+    return {"stats": stats, "settings": settings}
+
+@app.post("/_fake/settings")
+async def update_settings(request: Request):
+    """실행 중 지연/오류 설정 변경 (예: {"first_token_ms": 500})"""
+    updates = await request.json()
+    for key, value in updates.items():
+        if key in settings:
+            settings[key] = type(settings[key])(value)
+    return settings
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake LLM Server (Ollama / Groq)")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드 주소 (기본값: 127.0.0.1)")
+    parser.add_argument("--port", "-p", type=int, default=9100, help="포트 (기본값: 9100)")
+    parser.add_argument("--first-token-ms", type=float, default=settings["first_token_ms"], help="첫 토큰까지 지연 (ms)")
+    parser.add_argument("--token-ms", type=float, default=settings["token_ms"], help="토큰 간 지연 (ms)")
+    parser.add_argument("--error-rate", type=float, default=settings["error_rate"], help="503 오류 비율 (0~1)")
+    parser.add_argument("--max-tokens", type=int, default=settings["max_tokens"], help="최대 응답 토큰 수")
+    args = parser.parse_args()
+
+    settings.update(
+        first_token_ms=args.first_token_ms,
+        token_ms=args.token_ms,
+        error_rate=args.error_rate,
+        max_tokens=args.max_tokens,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Fake NWS API Server - 오프라인 부하 테스트용 NWS 대체 서버
+fixtures/nws의 녹화된 응답을 기반으로 /points, /gridpoints/.../forecast, /alerts를 제공하며
+지연 시간과 오류 비율을 설정할 수 있습니다.
+
+사용법:
+    python fake_nws.py --port 9000 --latency-ms 80 --error-rate 0.01
+    NWS_API_BASE=http://localhost:9000 python server_app.py
+"""
+
+import os
+import copy
+import json
+import math
+import random
+import asyncio
+import hashlib
+import argparse
+from pathlib import Path
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+import uvicorn
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "nws"
+
+# 그리드 셀 크기 (도, NWS 2.5km 격자와 비슷한 크기)
+CELL_DEGREES = 0.025
+
+# 기본 설정 (환경변수 또는 명령행 인수로 변경 가능)
+settings = {
+    "latency_ms": float(os.getenv("FAKE_NWS_LATENCY_MS", "0")),
+    "jitter_ms": float(os.getenv("FAKE_NWS_JITTER_MS", "0")),
+    "error_rate": float(os.getenv("FAKE_NWS_ERROR_RATE", "0")),
+    "max_age": int(os.getenv("FAKE_NWS_MAX_AGE", "60")),
+}
+
+stats = {"requests": 0, "errors": 0, "not_modified": 0}
+
+def load_fixture(name: str) -> dict:
+    with open(FIXTURES_DIR / name, encoding="utf-8") as f:
+        return json.load(f)
+
+POINTS_FIXTURE = load_fixture("points.json")
+FORECAST_FIXTURE = load_fixture("forecast.json")
+ALERTS_FIXTURE = load_fixture("alerts.json")
+OFFICE = POINTS_FIXTURE["properties"]["gridId"]
+
+app = FastAPI(title="Fake NWS API", version="1.0.0")
+
+async def simulate_upstream() -> Response | None:
+    """설정된 지연을 적용하고, 오류 주입 대상이면 오류 응답을 반환합니다."""
+    stats["requests"] += 1
+    delay = random.gauss(settings["latency_ms"], settings["jitter_ms"]) if settings["jitter_ms"] else settings["latency_ms"]
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+    if settings["error_rate"] and random.random() < settings["error_rate"]:
+        stats["errors"] += 1
+        return JSONResponse(
+            status_code=503,
+            content={
+                "type": "https://api.weather.gov/problems/UnexpectedProblem",
+                "title": "Unexpected Problem",
+                "status": 503,
+                "detail": "Injected error from fake NWS server",
+            },
+            media_type="application/problem+json",
+        )
+    return None
+
+def geo_json_response(request: Request, content: dict) -> Response:
+    """ETag/Cache-Control 헤더를 붙이고, If-None-Match가 일치하면 304를 반환합니다."""
+    body = json.dumps(content, ensure_ascii=False).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    headers = {"Cache-Control": f"public, max-age={settings['max_age']}", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/geo+json", headers=headers)
+
+def cell_polygon(grid_x: int, grid_y: int) -> list[list[float]]:
+    """그리드 좌표의 셀 경계를 GeoJSON 링으로 반환합니다."""
+    west = grid_x * CELL_DEGREES - 180
+    south = grid_y * CELL_DEGREES - 90
+    east = west + CELL_DEGREES
+    north = south + CELL_DEGREES
+    return [[west, south], [east, south], [east, north], [west, north], [west, south]]
+
+@app.get("/points/{latitude},{longitude}")
+async def points(latitude: float, longitude: float, request: Request):
+    error = await simulate_upstream()
+    if error:
+        return error
+
+    base = str(request.base_url).rstrip("/")
+    grid_x = math.floor((longitude + 180) / CELL_DEGREES)
+    grid_y = math.floor((latitude + 90) / CELL_DEGREES)
+    grid_url = f"{base}/gridpoints/{OFFICE}/{grid_x},{grid_y}"
+
+    data = copy.deepcopy(POINTS_FIXTURE)
+    data["id"] = f"{base}/points/{latitude},{longitude}"
+    data["geometry"]["coordinates"] = [longitude, latitude]
+    props = data["properties"]
+    props.update({
+        "@id": data["id"],
+        "gridX": grid_x,
+        "gridY": grid_y,
+        "forecast": f"{grid_url}/forecast",
+        "forecastHourly": f"{grid_url}/forecast/hourly",
+        "forecastGridData": grid_url,
+        "observationStations": f"{grid_url}/stations",
+    })
+    return geo_json_response(request, data)
+
+@app.get("/gridpoints/{office}/{grid_x},{grid_y}/forecast")
+async def forecast(office: str, grid_x: int, grid_y: int, request: Request):
+    error = await simulate_upstream()
+    if error:
+        return error
+
+    data = copy.deepcopy(FORECAST_FIXTURE)
+    data["geometry"]["coordinates"] = [cell_polygon(grid_x, grid_y)]
+    # 셀마다 조금씩 다른 기온 (결정적)
+    offset = (grid_x + grid_y) % 7 - 3
+    for period in data["properties"]["periods"]:
+        period["temperature"] += offset
+    return geo_json_response(request, data)
+
+@app.get("/alerts/active")
+async def alerts_active(request: Request):
+    error = await simulate_upstream()
+    if error:
+        return error
+    return geo_json_response(request, ALERTS_FIXTURE)
+
+@app.get("/alerts/active/area/{area}")
+async def alerts_area(area: str, request: Request):
+    error = await simulate_upstream()
+    if error:
+        return error
+
+    area = area.upper()
+    data = copy.deepcopy(ALERTS_FIXTURE)
+    data["features"] = [
+        feature for feature in data["features"]
+        if any(code[:2] == area for code in feature["properties"]["geocode"]["UGC"])
+    ]
+    return geo_json_response(request, data)
+
+@app.get("/_fake/stats")
+async def fake_stats():
+    """요청 통계와 현재 설정"""
+    return {"stats": stats, "settings": settings}
+
+@app.post("/_fake/settings")
+async def update_settings(request: Request):
+    """실행 중 지연/오류 설정 변경 (예: {"latency_ms": 200})"""
+    updates = await request.json()
+    for key, value in updates.items():
+        if key in settings:
+            settings[key] = type(settings[key])(value)
+    return settings
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake NWS API Server")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드 주소 (기본값: 127.0.0.1)")
+    parser.add_argument("--port", "-p", type=int, default=9000, help="포트 (기본값: 9000)")
+    parser.add_argument("--latency-ms", type=float, default=settings["latency_ms"], help="평균 응답 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=settings["jitter_ms"], help="지연 표준편차 (ms)")
+    parser.add_argument("--error-rate", type=float, default=settings["error_rate"], help="503 오류 비율 (0~1)")
+    parser.add_argument("--max-age", type=int, default=settings["max_age"], help="Cache-Control max-age (초)")
+    args = parser.parse_args()
+
+    settings.update(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        max_age=args.max_age,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
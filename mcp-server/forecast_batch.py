@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+다중 좌표 예보 일괄 조회 모듈
+같은 NWS 그리드 셀에 속한 좌표는 한 번만 예보를 가져오고,
+동시 실행 수를 제한하면서 완료되는 순서대로 결과를 내보냅니다.
+"""
+
+import os
+import time
+import asyncio
+from typing import Any, AsyncIterator, Optional
+from logger_config import setup_logger
+from nws_client import fetch_forecast, fetch_points
+from grid_index import grid_key
+
+# 로거 설정
+logger = setup_logger("forecast-batch")
+
+def batch_max_locations() -> int:
+    """한 번에 요청할 수 있는 최대 좌표 수 (BATCH_MAX_LOCATIONS, .env 로드 이후에 읽도록 호출 시점에 읽음)"""
+    return int(os.getenv("BATCH_MAX_LOCATIONS", "100"))
+
+def batch_concurrency() -> int:
+    """기본 동시 NWS 요청 수 (BATCH_CONCURRENCY)"""
+    return int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+def validate_batch(count: int, concurrency: Optional[int] = None) -> Optional[str]:
+    """
+    일괄 예보 요청의 좌표 수와 동시 요청 수를 검사합니다.
+    스트리밍을 시작하기 전에 호출하며, 잘못된 값이면 오류 메시지를, 올바르면 None을 반환합니다.
+    """
+    max_locations = batch_max_locations()
+    if count > max_locations:
+        return f"Too many locations (max {max_locations})."
+    if concurrency is not None and not 1 <= concurrency <= max_locations:
+        return f"concurrency must be between 1 and {max_locations}."
+    return None
+
+def format_forecast(periods: list[dict[str, Any]]) -> str:
+    """Format the next 5 forecast periods into a readable string."""
+    forecasts = []
+    for period in periods[:5]:  # Only show next 5 periods
+        forecast = f"""
+{period['name']}:
+Temperature: {period['temperature']}°{period['temperatureUnit']}
+Wind: {period['windSpeed']} {period['windDirection']}
+Forecast: {period['detailedForecast']}
+"""
+        forecasts.append(forecast)
+    return "\n---\n".join(forecasts)
+
+async def iter_forecast_batch(
+    locations: list[tuple[float, float]],
+    api_base: Optional[str] = None,
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    여러 좌표의 예보를 조회하여 완료되는 순서대로 결과를 내보냅니다.
+
+    Args:
+        locations: (위도, 경도) 목록
+        api_base: NWS API 주소 (None이면 NWS_API_BASE 환경변수 사용)
+        concurrency: 동시에 진행할 NWS 요청 수 (1 이상, None이면 BATCH_CONCURRENCY)
+
+    Yields:
+        좌표별 결과 ({"type": "result", ...}) 후 마지막에 요약 ({"type": "done", ...})
+    """
+    if concurrency is not None and concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1 (got {concurrency})")
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency if concurrency is not None else batch_concurrency())
+    # 그리드 셀별 예보 작업 (같은 셀의 좌표는 하나의 작업을 공유)
+    grid_forecasts: dict[str, asyncio.Task] = {}
+
+    async def fetch_grid_forecast(points_data: dict[str, Any]) -> dict[str, Any] | None:
+        async with semaphore:
+            return await fetch_forecast(points_data)
+
+    async def resolve(index: int, latitude: float, longitude: float) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            "type": "result",
+            "index": index,
+            "latitude": latitude,
+            "longitude": longitude,
+        }
+        try:
+            async with semaphore:
+                points_data = await fetch_points(latitude, longitude, api_base)
+
+            if not points_data or "properties" not in points_data:
+                result.update(success=False, error="Unable to fetch forecast data for this location.")
+                return result
+
+            key = grid_key(points_data)
+            result["grid"] = key
+            task = grid_forecasts.get(key)
+            if task is None:
+                task = asyncio.ensure_future(fetch_grid_forecast(points_data))
+                grid_forecasts[key] = task
+            forecast_data = await asyncio.shield(task)
+
+            if not forecast_data:
+                result.update(success=False, error="Unable to fetch detailed forecast.")
+                return result
+
+            result.update(success=True, data=format_forecast(forecast_data["properties"]["periods"]))
+        except Exception as e:
+            logger.error(f"일괄 예보 처리 중 오류 ({latitude}, {longitude}): {e}")
+            result.update(success=False, error=f"Error processing forecast request: {str(e)}")
+        return result
+
+    tasks = [
+        asyncio.ensure_future(resolve(index, latitude, longitude))
+        for index, (latitude, longitude) in enumerate(locations)
+    ]
+    succeeded = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            succeeded += result["success"]
+            yield result
+    finally:
+        # 소비자가 중간에 멈추면 남은 작업 정리
+        for task in tasks + list(grid_forecasts.values()):
+            if not task.done():
+                task.cancel()
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"일괄 예보 완료: {len(locations)}개 좌표, {len(grid_forecasts)}개 그리드 셀, "
+        f"성공 {succeeded}개, {elapsed:.2f}초"
+    )
+    yield {
+        "type": "done",
+        "total": len(locations),
+        "succeeded": succeeded,
+        "grid_cells": len(grid_forecasts),
+        "elapsed": round(elapsed, 3),
+    }
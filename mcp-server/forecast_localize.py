@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+예보 현지화 모듈
+NWS 예보 기간(periods)의 기온(°F → °C)과 풍속(mph → km/h)을 변환하고,
+정형화된 NWS 문구는 한국어 문구표로 직접 번역합니다.
+문구표로 번역하지 못한 detailedForecast 문장만 모아 LLM 번역을 요청합니다.
+"""
+
+import re
+from typing import Any, Optional
+from logger_config import setup_logger
+
+# 로거 설정
+logger = setup_logger("forecast-localize")
+
+MPH_TO_KMH = 1.609344
+
+# 기간 이름
+PERIOD_NAMES = {
+    "today": "오늘",
+    "this morning": "오늘 오전",
+    "this afternoon": "오늘 오후",
+    "late afternoon": "오늘 늦은 오후",
+    "this evening": "오늘 저녁",
+    "tonight": "오늘 밤",
+    "overnight": "밤사이",
+}
+WEEKDAYS = {
+    "monday": "월요일",
+    "tuesday": "화요일",
+    "wednesday": "수요일",
+    "thursday": "목요일",
+    "friday": "금요일",
+    "saturday": "토요일",
+    "sunday": "일요일",
+}
+
+# 풍향 (16방위)
+WIND_DIRECTIONS = {
+    "N": "북풍", "NNE": "북북동풍", "NE": "북동풍", "ENE": "동북동풍",
+    "E": "동풍", "ESE": "동남동풍", "SE": "남동풍", "SSE": "남남동풍",
+    "S": "남풍", "SSW": "남남서풍", "SW": "남서풍", "WSW": "서남서풍",
+    "W": "서풍", "WNW": "서북서풍", "NW": "북서풍", "NNW": "북북서풍",
+}
+DIRECTION_WORDS = {
+    "north": "N", "south": "S", "east": "E", "west": "W",
+    "northeast": "NE", "northwest": "NW", "southeast": "SE", "southwest": "SW",
+}
+
+# 기상 상태 문구 (소문자 기준)
+CONDITION_PHRASES = {
+    "sunny": "맑음",
+    "mostly sunny": "대체로 맑음",
+    "partly sunny": "구름 조금",
+    "clear": "맑음",
+    "mostly clear": "대체로 맑음",
+    "partly cloudy": "구름 조금",
+    "mostly cloudy": "대체로 흐림",
+    "cloudy": "흐림",
+    "overcast": "흐림",
+    "increasing clouds": "점차 흐려짐",
+    "decreasing clouds": "점차 갬",
+    "becoming sunny": "점차 맑아짐",
+    "becoming cloudy": "점차 흐려짐",
+    "fog": "안개",
+    "dense fog": "짙은 안개",
+    "haze": "연무",
+    "smoke": "연기",
+    "blowing dust": "날림 먼지",
+    "rain": "비",
+    "light rain": "약한 비",
+    "heavy rain": "강한 비",
+    "rain showers": "소나기",
+    "showers": "소나기",
+    "drizzle": "이슬비",
+    "thunderstorms": "뇌우",
+    "showers and thunderstorms": "소나기와 뇌우",
+    "rain and snow": "비 또는 눈",
+    "rain and snow showers": "비 또는 눈 소나기",
+    "snow": "눈",
+    "light snow": "약한 눈",
+    "heavy snow": "많은 눈",
+    "snow showers": "눈 소나기",
+    "blowing snow": "날림 눈",
+    "freezing rain": "어는 비",
+    "freezing drizzle": "어는 이슬비",
+    "sleet": "진눈깨비",
+    "frost": "서리",
+    "windy": "바람 강함",
+    "breezy": "바람 다소 강함",
+    "hot": "더움",
+    "cold": "추움",
+}
+
+# 기상 상태 앞뒤에 붙는 수식어: (영어, 한국어 형식)
+CONDITION_PREFIXES = [
+    ("slight chance of ", "{} 가능성 낮음"),
+    ("slight chance ", "{} 가능성 낮음"),
+    ("chance of ", "{} 가능성"),
+    ("chance ", "{} 가능성"),
+    ("areas of ", "곳곳에 {}"),
+    ("patchy ", "곳에 따라 {}"),
+    ("isolated ", "국지적 {}"),
+    ("scattered ", "산발적 {}"),
+    ("widespread ", "광범위한 {}"),
+]
+CONDITION_SUFFIXES = [
+    (" likely", "{} 가능성 높음"),
+]
+
+TIME_PATTERN = r"(?:\d{1,2}(?::\d{2})?\s*[ap]m|noon|midnight)"
+QUALIFIER_PATTERNS = [
+    (re.compile(rf"^(.+?) between ({TIME_PATTERN}) and ({TIME_PATTERN})$"), "{1}~{2} 사이 {0}"),
+    (re.compile(rf"^(.+?) before ({TIME_PATTERN})$"), "{1} 이전 {0}"),
+    (re.compile(rf"^(.+?) after ({TIME_PATTERN})$"), "{1} 이후 {0}"),
+]
+
+# detailedForecast 문장 패턴
+TEMPERATURE_SENTENCE = re.compile(r"^(.+?), with an? (high|low) (?:near|around) (-?\d+)$", re.IGNORECASE)
+TEMPERATURE_ONLY_SENTENCE = re.compile(r"^(high|low) (?:near|around) (-?\d+)$", re.IGNORECASE)
+WIND_SENTENCE = re.compile(
+    r"^(light )?([a-z ]+?) wind(?: (\d+)(?: to (\d+))? mph)?(?:, with gusts as high as (\d+) mph)?$",
+    re.IGNORECASE,
+)
+VARIABLE_WIND_SENTENCE = re.compile(r"^light and variable wind$", re.IGNORECASE)
+CALM_WIND_SENTENCE = re.compile(r"^calm wind$", re.IGNORECASE)
+PRECIPITATION_SENTENCE = re.compile(r"^chance of precipitation is (\d+)%$", re.IGNORECASE)
+SENTENCE_SPLIT = re.compile(r"(?<=\.)\s+")
+
+# 통계 (GET /api/stats)
+_stats = {"periods": 0, "sentences_local": 0, "sentences_llm": 0}
+
+def fahrenheit_to_celsius(value: float) -> int:
+    return round((value - 32) * 5 / 9)
+
+def mph_to_kmh(value: float) -> int:
+    return round(value * MPH_TO_KMH)
+
+def format_temperature(value: Optional[float], unit: str = "F") -> str:
+    """기온을 섭씨 문자열로 변환합니다 (예: 86, F → 30°C)."""
+    if value is None:
+        return "알 수 없음"
+    if unit.upper() == "F":
+        value = fahrenheit_to_celsius(value)
+    return f"{round(value)}°C"
+
+def format_wind_speed(text: str) -> str:
+    """풍속 문자열을 km/h로 변환합니다 (예: "5 to 10 mph" → "시속 8~16km")."""
+    numbers = [int(n) for n in re.findall(r"\d+", text or "")]
+    if not numbers:
+        return text or ""
+    if "km" not in text.lower():
+        numbers = [mph_to_kmh(n) for n in numbers]
+    return f"시속 {'~'.join(str(n) for n in numbers[:2])}km"
+
+def translate_period_name(name: str) -> str:
+    """기간 이름을 번역합니다 (예: "Tuesday Night" → "화요일 밤"). 모르는 이름(공휴일 등)은 그대로 둡니다."""
+    key = name.strip().lower()
+    if key in PERIOD_NAMES:
+        return PERIOD_NAMES[key]
+    if key in WEEKDAYS:
+        return WEEKDAYS[key]
+    if key.endswith(" night") and key[:-6] in WEEKDAYS:
+        return f"{WEEKDAYS[key[:-6]]} 밤"
+    return name
+
+def translate_direction(text: str) -> Optional[str]:
+    """풍향을 번역합니다 ("SW", "South southwest" 모두 지원)."""
+    abbreviation = text.strip().upper()
+    if abbreviation not in WIND_DIRECTIONS:
+        words = text.strip().lower().split()
+        if not words or any(word not in DIRECTION_WORDS for word in words):
+            return None
+        abbreviation = "".join(DIRECTION_WORDS[word] for word in words)
+    return WIND_DIRECTIONS.get(abbreviation)
+
+def translate_time(text: str) -> str:
+    """시각을 번역합니다 (예: "11am" → "오전 11시")."""
+    text = text.strip().lower()
+    if text == "noon":
+        return "정오"
+    if text == "midnight":
+        return "자정"
+    match = re.match(r"(\d{1,2})(?::(\d{2}))?\s*([ap])m", text)
+    hour, minute, meridiem = match.groups()
+    result = f"{'오전' if meridiem == 'a' else '오후'} {int(hour)}시"
+    return f"{result} {int(minute)}분" if minute and int(minute) else result
+
+def translate_condition(text: str) -> Optional[str]:
+    """
+    기상 상태 문구를 번역합니다 (shortForecast 또는 detailedForecast 문장).
+
+    Returns:
+        번역된 문구 (문구표로 번역할 수 없으면 None)
+    """
+    text = text.strip().rstrip(".").strip()
+    key = text.lower()
+    if not key:
+        return None
+
+    # "A then B" → "A, 이후 B"
+    for separator in (", then ", " then "):
+        if separator in key:
+            parts = [translate_condition(part) for part in re.split(separator, text, flags=re.IGNORECASE)]
+            return None if None in parts else ", 이후 ".join(parts)
+
+    if key in CONDITION_PHRASES:
+        return CONDITION_PHRASES[key]
+
+    for pattern, template in QUALIFIER_PATTERNS:
+        match = pattern.match(key)
+        if match:
+            condition = translate_condition(match.group(1))
+            if condition is None:
+                return None
+            times = [translate_time(t) for t in match.groups()[1:]]
+            return template.format(condition, *times)
+
+    for prefix, template in CONDITION_PREFIXES:
+        if key.startswith(prefix):
+            condition = translate_condition(text[len(prefix):])
+            return template.format(condition) if condition else None
+    for suffix, template in CONDITION_SUFFIXES:
+        if key.endswith(suffix):
+            condition = translate_condition(text[:-len(suffix)])
+            return template.format(condition) if condition else None
+
+    # "A and B" → "A 및 B"
+    if " and " in key:
+        parts = [translate_condition(part) for part in re.split(" and ", text, flags=re.IGNORECASE)]
+        return None if None in parts else " 및 ".join(parts)
+    return None
+
+def translate_sentence(sentence: str, unit: str = "F") -> Optional[str]:
+    """detailedForecast 문장 하나를 번역합니다 (번역할 수 없으면 None)."""
+    text = sentence.strip().rstrip(".").strip()
+
+    match = TEMPERATURE_SENTENCE.match(text)
+    if match:
+        condition = translate_condition(match.group(1))
+        if condition is None:
+            return None
+        label = "최고" if match.group(2).lower() == "high" else "최저"
+        return f"{condition}, {label} 기온 약 {format_temperature(int(match.group(3)), unit)}."
+
+    match = TEMPERATURE_ONLY_SENTENCE.match(text)
+    if match:
+        label = "최고" if match.group(1).lower() == "high" else "최저"
+        return f"{label} 기온 약 {format_temperature(int(match.group(2)), unit)}."
+
+    if VARIABLE_WIND_SENTENCE.match(text):
+        return "바람은 약하고 풍향은 일정하지 않음."
+    if CALM_WIND_SENTENCE.match(text):
+        return "바람 거의 없음."
+
+    match = WIND_SENTENCE.match(text)
+    if match:
+        light, direction, low, high, gusts = match.groups()
+        direction = translate_direction(direction)
+        if direction is None:
+            return None
+        parts = [f"약한 {direction}" if light else direction]
+        if low:
+            parts.append(format_wind_speed(f"{low} to {high} mph" if high else f"{low} mph"))
+        result = " ".join(parts)
+        if gusts:
+            result += f", 돌풍 최대 시속 {mph_to_kmh(int(gusts))}km"
+        return result + "."
+
+    match = PRECIPITATION_SENTENCE.match(text)
+    if match:
+        return f"강수 확률 {match.group(1)}%."
+
+    condition = translate_condition(text)
+    return f"{condition}." if condition else None
+
+class LocalizedForecast:
+    """현지화된 예보. 번역하지 못한 문장은 pending에 모아 두고 render 시 번역문으로 채웁니다."""
+
+    def __init__(self, periods: list[dict[str, Any]]):
+        self.periods: list[dict[str, Any]] = []
+        self.pending: list[str] = []
+
+        for period in periods:
+            unit = period.get("temperatureUnit", "F")
+            direction = translate_direction(period.get("windDirection", "")) or period.get("windDirection", "")
+            short = translate_condition(period.get("shortForecast", ""))
+
+            # 문장 단위 번역 (번역하지 못한 문장은 원문을 그대로 두고 pending에 추가)
+            sentences = []
+            for sentence in SENTENCE_SPLIT.split(period.get("detailedForecast", "").strip()):
+                if not sentence:
+                    continue
+                translated = translate_sentence(sentence, unit)
+                if translated is None:
+                    _stats["sentences_llm"] += 1
+                    if sentence not in self.pending:
+                        self.pending.append(sentence)
+                    sentences.append((False, sentence))
+                else:
+                    _stats["sentences_local"] += 1
+                    sentences.append((True, translated))
+
+            _stats["periods"] += 1
+            self.periods.append({
+                "name": translate_period_name(period.get("name", "")),
+                "temperature": format_temperature(period.get("temperature"), unit),
+                "wind": f"{direction} {format_wind_speed(period.get('windSpeed', ''))}".strip(),
+                "short": short,
+                "sentences": sentences,
+            })
+
+        if self.pending:
+            logger.debug(f"LLM 번역이 필요한 문장: {len(self.pending)}개")
+
+    def render(self, translations: Optional[dict[str, str]] = None) -> str:
+        """
+        한국어 예보 문자열을 만듭니다.
+
+        Args:
+            translations: pending 문장의 번역문 (없는 문장은 원문 유지)
+        """
+        translations = translations or {}
+        forecasts = []
+        for period in self.periods:
+            sentences = [text if local else translations.get(text, text) for local, text in period["sentences"]]
+            forecast = f"""
+{period['name']}:
+기온: {period['temperature']}
+바람: {period['wind']}
+예보: {' '.join(sentences) or period['short'] or ''}
+"""
+            forecasts.append(forecast)
+        return "\n---\n".join(forecasts)
+
+def localize_forecast(periods: list[dict[str, Any]], limit: int = 5) -> LocalizedForecast:
+    """예보 기간 목록(앞에서 limit개)을 현지화합니다."""
+    return LocalizedForecast(periods[:limit])
+
+def build_translation_messages(sentences: list[str]) -> list[dict[str, str]]:
+    """번역하지 못한 문장들을 번호를 붙여 LLM 번역 요청 메시지로 만듭니다."""
+    numbered = "\n".join(f"{index}. {sentence}" for index, sentence in enumerate(sentences, 1))
+    return [
+        {
+            "role": "system",
+            "content": (
+                "다음 영어 일기예보 문장들을 자연스러운 한국어로 번역해주세요. "
+                "화씨(°F)는 섭씨(°C)로, 마일(mph)은 킬로미터(km/h)로 변환하고, "
+                "같은 번호를 붙여 한 줄에 한 문장씩 번역문만 출력해주세요."
+            ),
+        },
+        {"role": "user", "content": numbered},
+    ]
+
+def parse_translations(text: str, sentences: list[str]) -> dict[str, str]:
+    """번호가 붙은 LLM 번역 결과를 {원문: 번역문}으로 변환합니다 (번호가 없는 줄은 무시)."""
+    translations = {}
+    for line in text.splitlines():
+        match = re.match(r"^\s*(\d+)[.)]\s*(.+?)\s*$", line)
+        if match and 1 <= int(match.group(1)) <= len(sentences):
+            translations[sentences[int(match.group(1)) - 1]] = match.group(2)
+    return translations
+
+def get_localizer_stats() -> dict[str, int]:
+    """현지화 통계 (로컬 번역 문장 수, LLM 번역 요청 문장 수)를 반환합니다."""
+    return dict(_stats)
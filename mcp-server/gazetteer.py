@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+미국 주/도시 지명 사전 모듈
+data/places.tsv의 영문/한글 지명을 Aho-Corasick 오토마톤 하나로 컴파일하여
+질의 문자열을 한 번만 훑어 언급된 지명을 찾고, 날씨 도구 호출(도구 이름, 인수)로 변환합니다.
+"""
+
+import os
+import re
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+from logger_config import setup_logger
+
+# 로거 설정
+logger = setup_logger("gazetteer")
+
+DEFAULT_PLACES_PATH = Path(__file__).resolve().parent / "data" / "places.tsv"
+
+# 지명이 없을 때의 기본 위치 (Los Angeles)
+DEFAULT_FORECAST = {"latitude": 34.0522, "longitude": -118.2437}
+
+# 경보 조회로 처리할 키워드
+ALERT_KEYWORDS = ["alert", "warning", "경보", "특보", "주의보"]
+
+# 두 글자 주 약어(IN, OR, ME 등)는 영어 단어와 겹치므로 아래 단서가 있을 때만 인정
+# 앞: 쉼표("Austin, TX") 또는 소문자 전치사("weather in TX"), 뒤: 날씨/경보 키워드("TX weather", "CA 경보")
+STATE_CODE_PREFIXES = {"in", "for", "of"}
+STATE_CODE_KEYWORDS = ("weather", "forecast", "alert", "warning", "날씨", "예보", "기온", "경보", "특보", "주의보")
+
+_SPACE_RE = re.compile(r"\s+")
+
+def _has_state_code_cue(text: str, start: int, end: int) -> bool:
+    """text[start:end]의 두 글자 주 약어 앞뒤에 주 약어로 볼 단서가 있는지 확인합니다."""
+    before = text[:start].rstrip()
+    after = text[end:].strip()
+    if not before and not after:
+        # 질의 전체가 약어 하나인 경우
+        return True
+    if before.endswith(","):
+        return True
+    previous_word = before.split(" ")[-1]
+    if previous_word in STATE_CODE_PREFIXES:
+        return True
+    if previous_word.lower().startswith(STATE_CODE_KEYWORDS):
+        # "forecast OR alerts"처럼 키워드 사이에 낀 약어는 접속사로 봄
+        return False
+    next_word = after.split(" ")[0].lower()
+    return next_word.startswith(STATE_CODE_KEYWORDS)
+
+def _is_latin(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+def _is_hangul(ch: str) -> bool:
+    return "가" <= ch <= "힣" or "ㄱ" <= ch <= "ㆎ"
+
+class Place:
+    """지명 사전의 주 또는 도시 하나 (지오코더가 만든 좌표 지점은 kind="point")"""
+
+    __slots__ = ("kind", "state", "latitude", "longitude", "population", "name", "aliases")
+
+    def __init__(
+        self,
+        kind: str,
+        state: str,
+        latitude: float,
+        longitude: float,
+        population: int,
+        name: str,
+        aliases: list[str],
+    ):
+        self.kind = kind
+        self.state = state
+        self.latitude = latitude
+        self.longitude = longitude
+        self.population = population
+        self.name = name
+        self.aliases = aliases
+
+    @property
+    def is_state(self) -> bool:
+        return self.kind == "state"
+
+    def __repr__(self) -> str:
+        return f"Place({self.kind}, {self.name}, {self.state})"
+
+class AhoCorasick:
+    """여러 패턴을 한 번의 순회로 찾는 Aho-Corasick 오토마톤"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        self.lengths: list[int] = []
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(len(self.lengths))
+        self.lengths.append(len(pattern))
+
+    def _build(self) -> None:
+        # 너비 우선으로 실패 링크를 만들고, 실패 링크 쪽 출력을 합쳐 둠
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, int]]:
+        """text에서 찾은 (시작, 끝, 패턴 번호)를 끝 위치 순서로 반환합니다."""
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for pattern_id in self._out[state]:
+                yield end - self.lengths[pattern_id], end, pattern_id
+
+class Gazetteer:
+    """지명 목록을 컴파일한 지명 사전"""
+
+    def __init__(self, places: list[Place]):
+        self.places = places
+        self.states = {place.state: place for place in places if place.is_state}
+        # 주만 언급된 예보 질의에 쓸 주별 대표 도시 (인구가 가장 많은 도시)
+        self.largest_cities: dict[str, Place] = {}
+        for place in places:
+            if place.kind != "city":
+                continue
+            largest = self.largest_cities.get(place.state)
+            if largest is None or place.population > largest.population:
+                self.largest_cities[place.state] = place
+
+        # 같은 표기(예: portland)를 쓰는 지명은 패턴 하나로 묶음
+        by_pattern: dict[str, list[int]] = {}
+        case_sensitive: dict[str, set[str]] = {}
+        for index, place in enumerate(places):
+            for alias in [place.name, *place.aliases]:
+                pattern = _SPACE_RE.sub(" ", alias.strip()).lower()
+                if not pattern:
+                    continue
+                indexes = by_pattern.setdefault(pattern, [])
+                if index not in indexes:
+                    indexes.append(index)
+                # 대문자 약어(CA, NYC 등)는 원문도 대문자일 때만 인정
+                if alias.isascii() and alias.isalpha() and alias.isupper():
+                    case_sensitive.setdefault(pattern, set()).add(alias)
+
+        self._patterns = list(by_pattern)
+        self._candidates = [by_pattern[pattern] for pattern in self._patterns]
+        self._case_sensitive = [case_sensitive.get(pattern) for pattern in self._patterns]
+        self._automaton = AhoCorasick(self._patterns)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "Gazetteer":
+        """TSV 파일에서 지명 사전을 읽어 컴파일합니다."""
+        path = Path(path or os.getenv("GAZETTEER_PATH") or DEFAULT_PLACES_PATH)
+        places = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if not line or line.startswith("#"):
+                    continue
+                fields = line.split("\t")
+                kind, state, latitude, longitude, population, name = fields[:6]
+                aliases = [alias for alias in fields[6].split("|") if alias] if len(fields) > 6 else []
+                places.append(Place(kind, state, float(latitude), float(longitude), int(population), name, aliases))
+
+        gazetteer = cls(places)
+        logger.info(f"지명 사전 로드 완료: {len(places)}개 지명, {len(gazetteer._patterns)}개 표기 ({path})")
+        return gazetteer
+
+    def find(self, text: str) -> list[tuple[int, int, list[Place]]]:
+        """
+        text에 언급된 지명을 찾습니다.
+        단어 경계에서 시작하는 표기만 인정하며, 겹치는 표기는 가장 앞서고 긴 것을 고릅니다.
+        한글 지명 뒤에는 조사가 붙을 수 있고, 영문 지명 뒤에는 영문자/숫자가 올 수 없습니다.
+        두 글자 주 약어는 쉼표/전치사 뒤이거나 날씨/경보 키워드 앞일 때만 인정합니다.
+
+        Returns:
+            (시작, 끝, 후보 지명 목록)의 목록 (후보는 인구 많은 순)
+        """
+        normalized = _SPACE_RE.sub(" ", text)
+        lowered = normalized.lower()
+        if len(lowered) != len(normalized):
+            # 소문자 변환으로 길이가 바뀌는 문자가 있으면 위치가 어긋나므로 원문 그대로 사용
+            lowered = normalized
+
+        matches = []
+        for start, end, pattern_id in self._automaton.iter_matches(lowered):
+            pattern = self._patterns[pattern_id]
+            before = lowered[start - 1] if start > 0 else " "
+            after = lowered[end] if end < len(lowered) else " "
+            if _is_latin(pattern[0]) and _is_latin(before):
+                continue
+            if _is_hangul(pattern[0]) and (_is_hangul(before) or _is_latin(before)):
+                continue
+            if _is_latin(pattern[-1]) and _is_latin(after):
+                continue
+            exact = self._case_sensitive[pattern_id]
+            if exact is not None and normalized[start:end] not in exact:
+                continue
+            if exact is not None and len(pattern) == 2 and not _has_state_code_cue(normalized, start, end):
+                continue
+            matches.append((start, end, pattern_id))
+
+        # 가장 앞서고 긴 표기부터 선택하고 겹치는 표기는 버림
+        matches.sort(key=lambda m: (m[0], -m[1]))
+        selected = []
+        last_end = 0
+        for start, end, pattern_id in matches:
+            if start < last_end:
+                continue
+            candidates = sorted(
+                (self.places[index] for index in self._candidates[pattern_id]),
+                key=lambda place: place.population,
+                reverse=True,
+            )
+            selected.append((start, end, candidates))
+            last_end = end
+        return selected
+
+    def resolve(self, text: str) -> tuple[Optional[Place], Optional[Place]]:
+        """
+        text에서 처음 언급된 도시와 주를 반환합니다.
+        이름이 같은 도시가 여럿이면 함께 언급된 주의 도시를, 없으면 인구가 많은 도시를 고릅니다.
+
+        Returns:
+            (도시, 주) - 언급이 없으면 각각 None
+        """
+        found = self.find(text)
+        mentioned_states = [
+            candidates[0].state for _, _, candidates in found if candidates[0].is_state
+        ]
+
+        city = None
+        state = None
+        for _, _, candidates in found:
+            if candidates[0].is_state:
+                if state is None:
+                    state = candidates[0]
+                continue
+            if city is None:
+                city = next(
+                    (place for place in candidates if place.state in mentioned_states),
+                    candidates[0],
+                )
+        return city, state
+
+    def route(
+        self,
+        query: str,
+        fallback: Optional[Callable[[str], Optional[Place]]] = None,
+    ) -> tuple[str, dict[str, Any]]:
+        """
+        질의를 날씨 도구 호출로 변환합니다.
+        경보 질의는 언급된 주(또는 도시가 속한 주)의 get_alerts,
+        도시가 언급되면 그 좌표의 get_forecast, 주만 언급되면 그 주 대표 도시(인구가 가장 많은 도시)의 get_forecast,
+        지명이 없으면 기본 위치(Los Angeles)의 get_forecast를 반환합니다.
+
+        Args:
+            query: 사용자 질의
+            fallback: 지명을 찾지 못했을 때 위치를 추정하는 함수 (예: Geocoder.locate)
+
+        Returns:
+            (도구 이름, 도구 인수)
+        """
+        city, state = self.resolve(query)
+        if city is None and state is None and fallback is not None:
+            place = fallback(query)
+            if place is not None and place.is_state:
+                state = place
+            else:
+                city = place
+        query_lower = query.lower()
+        state_code = state.state if state is not None else city.state if city is not None else None
+
+        if state_code in self.states and any(keyword in query_lower for keyword in ALERT_KEYWORDS):
+            return "get_alerts", {"state": state_code}
+        if city is None and state is not None:
+            # 경보 키워드 없이 주만 언급되면 예보 질의로 보고 대표 도시(없으면 주 중심 좌표)를 사용
+            city = self.largest_cities.get(state.state, state)
+        if city is not None:
+            return "get_forecast", {"latitude": city.latitude, "longitude": city.longitude}
+        return "get_forecast", dict(DEFAULT_FORECAST)
+
+# 프로세스 전역 지명 사전
+_gazetteer: Optional[Gazetteer] = None
+
+def get_gazetteer() -> Gazetteer:
+    """프로세스 전역 지명 사전을 반환합니다 (처음 호출 시 로드)."""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer.load()
+    return _gazetteer
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+오프라인 지오코더 모듈
+지명 사전(data/places.tsv)의 좌표를 packed array로 보관하고,
+오타가 있는 지명의 유사 검색(trigram)과 좌표에서 가장 가까운 도시 검색(KD-tree)을 네트워크 호출 없이 처리합니다.
+"""
+
+import re
+import math
+from array import array
+from difflib import SequenceMatcher
+from typing import Any, Optional
+from logger_config import setup_logger
+from gazetteer import Place, get_gazetteer
+
+# 로거 설정
+logger = setup_logger("geocoder")
+
+EARTH_RADIUS_KM = 6371.0
+
+# 유사 검색으로 인정할 최소 일치도 (0~1)
+DEFAULT_MIN_SCORE = 0.8
+
+# 유사 검색에서 지명 후보로 보지 않을 단어
+STOPWORDS = {
+    "weather", "forecast", "temperature", "alert", "alerts", "warning", "warnings",
+    "what", "whats", "the", "for", "and", "how", "today", "tomorrow", "tonight", "this", "week",
+    "weekend", "will", "rain", "snow", "like", "show", "tell", "give", "please", "near", "city",
+    "날씨", "예보", "기온", "경보", "특보", "주의보", "알려줘", "알려주세요", "어때", "어때요",
+    "오늘", "내일", "모레", "이번", "주말", "지금", "현재", "비", "눈", "좀",
+}
+
+# 한글 단어 끝의 조사 (긴 것부터 제거)
+PARTICLES = ("에서는", "에서", "으로", "까지", "부터", "의", "은", "는", "이", "가", "에", "을", "를", "로", "도")
+
+# 질의에 적힌 좌표 (위도/경도 표기, lat/lon 표기, 소수점 좌표 쌍)
+COORDINATE_PATTERNS = [
+    re.compile(r"위도\s*:?\s*(-?\d+(?:\.\d+)?).*?경도\s*:?\s*(-?\d+(?:\.\d+)?)"),
+    re.compile(r"lat(?:itude)?\s*[:=]?\s*(-?\d+(?:\.\d+)?).*?lon(?:gitude)?\s*[:=]?\s*(-?\d+(?:\.\d+)?)", re.I),
+    re.compile(r"(-?\d{1,2}\.\d+)\s*,\s*(-?\d{1,3}\.\d+)"),
+]
+
+_WORD_RE = re.compile(r"[a-z0-9]+|[가-힣]+")
+
+def normalize_name(text: str) -> str:
+    """지명 비교용으로 소문자로 바꾸고 문장 부호와 중복 공백을 제거합니다."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _unit_vector(latitude: float, longitude: float) -> tuple[float, float, float]:
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """두 좌표 사이의 대원 거리(km)를 반환합니다."""
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+class GeocodeMatch:
+    """지오코딩 결과 하나 (지명, 일치도 또는 거리)"""
+
+    __slots__ = ("place", "score", "distance_km")
+
+    def __init__(self, place: Place, score: float = 1.0, distance_km: Optional[float] = None):
+        self.place = place
+        self.score = score
+        self.distance_km = distance_km
+
+    def to_dict(self) -> dict[str, Any]:
+        result = {
+            "name": self.place.name,
+            "kind": self.place.kind,
+            "state": self.place.state,
+            "latitude": self.place.latitude,
+            "longitude": self.place.longitude,
+        }
+        if self.distance_km is not None:
+            result["distance_km"] = round(self.distance_km, 1)
+        else:
+            result["score"] = round(self.score, 3)
+        return result
+
+    def __str__(self) -> str:
+        place = self.place
+        label = place.name if place.is_state else f"{place.name}, {place.state}"
+        detail = f"{self.distance_km:.1f} km" if self.distance_km is not None else f"score {self.score:.2f}"
+        return f"{label} ({place.latitude:.4f}, {place.longitude:.4f}) - {detail}"
+
+class Geocoder:
+    """지명 사전의 좌표를 packed array와 KD-tree로 색인한 오프라인 지오코더"""
+
+    def __init__(self, places: list[Place]):
+        self.places = places
+
+        # 좌표는 객체 대신 연속된 배열로 보관
+        self.latitudes = array("d", (place.latitude for place in places))
+        self.longitudes = array("d", (place.longitude for place in places))
+
+        # 이름 색인: 정규화한 표기 -> 지명 번호, trigram -> 표기 번호
+        self._names: list[str] = []
+        self._name_places: list[array] = []
+        name_ids: dict[str, int] = {}
+        for index, place in enumerate(places):
+            for alias in [place.name, *place.aliases]:
+                name = normalize_name(alias)
+                if not name:
+                    continue
+                name_id = name_ids.get(name)
+                if name_id is None:
+                    name_id = name_ids[name] = len(self._names)
+                    self._names.append(name)
+                    self._name_places.append(array("i"))
+                if index not in self._name_places[name_id]:
+                    self._name_places[name_id].append(index)
+        self._name_ids = name_ids
+        self._trigram_index: dict[str, array] = {}
+        self._trigram_counts = array("i")
+        for name_id, name in enumerate(self._names):
+            grams = _trigrams(name)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._trigram_index.setdefault(gram, array("i")).append(name_id)
+
+        # 도시 좌표를 단위 벡터로 바꿔 KD-tree 구성 (직선 거리 순서 = 대원 거리 순서)
+        cities = [index for index, place in enumerate(places) if not place.is_state]
+        self._xyz = [array("d"), array("d"), array("d")]
+        for index in range(len(places)):
+            for axis, value in enumerate(_unit_vector(self.latitudes[index], self.longitudes[index])):
+                self._xyz[axis].append(value)
+        self._tree = array("i", cities)
+        self._build_tree(0, len(self._tree), 0)
+
+    def _build_tree(self, lo: int, hi: int, depth: int) -> None:
+        # 구간을 축 기준으로 정렬해 가운데 원소를 노드로 삼는 암시적 KD-tree
+        if hi - lo <= 1:
+            return
+        coords = self._xyz[depth % 3]
+        self._tree[lo:hi] = array("i", sorted(self._tree[lo:hi], key=coords.__getitem__))
+        mid = (lo + hi) // 2
+        self._build_tree(lo, mid, depth + 1)
+        self._build_tree(mid + 1, hi, depth + 1)
+
+    def nearest(self, latitude: float, longitude: float, limit: int = 1) -> list[GeocodeMatch]:
+        """좌표에서 가까운 도시를 가까운 순서로 반환합니다 (limit이 0 이하면 빈 목록)."""
+        if limit <= 0:
+            return []
+        target = _unit_vector(latitude, longitude)
+        xs, ys, zs = self._xyz
+        best: list[tuple[float, int]] = []
+
+        def search(lo: int, hi: int, depth: int) -> None:
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            index = self._tree[mid]
+            dist = (xs[index] - target[0]) ** 2 + (ys[index] - target[1]) ** 2 + (zs[index] - target[2]) ** 2
+            if len(best) < limit or dist < best[-1][0]:
+                best.append((dist, index))
+                best.sort()
+                del best[limit:]
+
+            axis = depth % 3
+            diff = target[axis] - self._xyz[axis][index]
+            near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+            search(near[0], near[1], depth + 1)
+            if len(best) < limit or diff * diff < best[-1][0]:
+                search(far[0], far[1], depth + 1)
+
+        search(0, len(self._tree), 0)
+        return [
+            GeocodeMatch(
+                self.places[index],
+                distance_km=haversine_km(latitude, longitude, self.latitudes[index], self.longitudes[index]),
+            )
+            for _, index in best
+        ]
+
+    def lookup(self, name: str, limit: int = 5, min_score: float = DEFAULT_MIN_SCORE) -> list[GeocodeMatch]:
+        """
+        지명을 찾습니다. 표기가 정확히 일치하지 않으면 trigram 후보 중 유사한 표기를 고릅니다.
+        "Portland, ME"처럼 쉼표 뒤에 주를 적으면 그 주의 지명만 반환합니다.
+
+        Returns:
+            일치도와 인구 순으로 정렬한 결과 (없으면 빈 목록)
+        """
+        if limit <= 0:
+            return []
+        state = None
+        if "," in name:
+            head, tail = name.rsplit(",", 1)
+            state = self._state_code(tail)
+            if state is not None:
+                name = head
+
+        query = normalize_name(name)
+        if not query:
+            return []
+
+        scores: dict[int, float] = {}
+        name_id = self._name_ids.get(query)
+        if name_id is not None:
+            scores[name_id] = 1.0
+        else:
+            # trigram 겹침(Dice 계수)이 큰 표기만 문자열 유사도로 비교
+            grams = _trigrams(query)
+            counts: dict[int, int] = {}
+            for gram in grams:
+                for candidate in self._trigram_index.get(gram, ()):
+                    counts[candidate] = counts.get(candidate, 0) + 1
+            dice = {
+                candidate: 2 * shared / (len(grams) + self._trigram_counts[candidate])
+                for candidate, shared in counts.items()
+            }
+            for candidate in sorted(dice, key=dice.__getitem__, reverse=True)[:5]:
+                if dice[candidate] < min_score / 2:
+                    break
+                score = SequenceMatcher(None, query, self._names[candidate]).ratio()
+                if score >= min_score:
+                    scores[candidate] = score
+
+        matches: dict[int, GeocodeMatch] = {}
+        for name_id, score in scores.items():
+            for index in self._name_places[name_id]:
+                place = self.places[index]
+                if state is not None and place.state != state:
+                    continue
+                if index not in matches or matches[index].score < score:
+                    matches[index] = GeocodeMatch(place, score)
+
+        return sorted(matches.values(), key=lambda m: (m.score, m.place.population), reverse=True)[:limit]
+
+    def _state_code(self, text: str) -> Optional[str]:
+        text = text.strip()
+        if len(text) == 2 and text.upper() in get_gazetteer().states:
+            return text.upper()
+        name_id = self._name_ids.get(normalize_name(text))
+        if name_id is None:
+            return None
+        for index in self._name_places[name_id]:
+            if self.places[index].is_state:
+                return self.places[index].state
+        return None
+
+    def locate(self, query: str) -> Optional[Place]:
+        """
+        지명 사전에서 찾지 못한 질의의 위치를 추정합니다.
+        질의에 적힌 좌표를 먼저 사용하고, 없으면 단어 조합을 유사 검색합니다.
+
+        Returns:
+            주/도시 지명 또는 좌표 지점 (kind="point"), 찾지 못하면 None
+        """
+        for pattern in COORDINATE_PATTERNS:
+            match = pattern.search(query)
+            if match is None:
+                continue
+            latitude, longitude = float(match.group(1)), float(match.group(2))
+            if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+                nearest = self.nearest(latitude, longitude)
+                state = nearest[0].place.state if nearest else ""
+                return Place("point", state, latitude, longitude, 0, f"{latitude},{longitude}", [])
+
+        words = []
+        for word in _WORD_RE.findall(query.lower()):
+            if "가" <= word[0] <= "힣":
+                for particle in PARTICLES:
+                    if word.endswith(particle) and len(word) > len(particle) + 1:
+                        word = word[:-len(particle)]
+                        break
+            words.append(word)
+
+        best: Optional[GeocodeMatch] = None
+        for size in (3, 2, 1):
+            for start in range(len(words) - size + 1):
+                chunk = words[start:start + size]
+                if any(word in STOPWORDS for word in chunk):
+                    continue
+                text = " ".join(chunk)
+                if len(text) < 4 and text.isascii():
+                    continue
+                for match in self.lookup(text, limit=1):
+                    if best is None or match.score > best.score:
+                        best = match
+        if best is not None:
+            logger.debug(f"유사 지명 검색: {query} -> {best}")
+            return best.place
+        return None
+
+# 프로세스 전역 지오코더
+_geocoder: Optional[Geocoder] = None
+
+def get_geocoder() -> Geocoder:
+    """프로세스 전역 지오코더를 반환합니다 (처음 호출 시 지명 사전으로 색인 생성)."""
+    global _geocoder
+    if _geocoder is None:
+        _geocoder = Geocoder(get_gazetteer().places)
+        logger.info(f"지오코더 색인 완료: {len(_geocoder.places)}개 지명, {len(_geocoder._tree)}개 도시 좌표")
+    return _geocoder
+
+def route_query(query: str) -> tuple[str, dict[str, Any]]:
+    """
+    질의를 (도구 이름, 도구 인수)로 변환합니다.
+    지명 사전에서 지명을 찾지 못하면 질의의 좌표나 유사한 지명으로 위치를 정합니다.
+    """
+    return get_gazetteer().route(query, fallback=get_geocoder().locate)
+
+def lookup_place(place: str, limit: int = 5) -> list[GeocodeMatch]:
+    """지명(오타 허용)을 좌표로 변환합니다."""
+    return get_geocoder().lookup(place, limit)
+
+def find_nearest_place(latitude: float, longitude: float, limit: int = 1) -> list[GeocodeMatch]:
+    """좌표에서 가장 가까운 도시를 찾습니다."""
+    return get_geocoder().nearest(latitude, longitude, limit)
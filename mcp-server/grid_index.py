@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+NWS 그리드 셀 공간 인덱스 모듈
+예보 응답에 포함된 그리드 셀 경계(Polygon)를 격자 버킷에 등록해 두고,
+새 좌표가 이미 알려진 셀 안에 있으면 /points 호출 없이 셀 정보를 반환합니다.
+셀 수는 GRID_INDEX_MAX_CELLS로 제한하며, 넘치면 가장 오래 사용하지 않은 셀부터 제거합니다 (LRU).
+"""
+
+import os
+import math
+from collections import OrderedDict
+from typing import Any, Optional
+from logger_config import setup_logger
+
+# 로거 설정
+logger = setup_logger("grid-index")
+
+def point_in_ring(longitude: float, latitude: float, ring: list[tuple[float, float]]) -> bool:
+    """좌표가 다각형 링 안에 있는지 검사합니다 (ray casting)."""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if (yi > latitude) != (yj > latitude):
+            x_cross = (xj - xi) * (latitude - yi) / (yj - yi) + xi
+            if longitude < x_cross:
+                inside = not inside
+        j = i
+    return inside
+
+def grid_key(points_data: dict[str, Any]) -> str:
+    """/points 응답에서 그리드 셀 키(예: LOX/154,44)를 만듭니다."""
+    props = points_data["properties"]
+    return f"{props.get('gridId')}/{props.get('gridX')},{props.get('gridY')}"
+
+class GridCell:
+    """NWS 그리드 셀 하나 (그리드 키, 대표 /points 응답, 경계)"""
+
+    __slots__ = ("key", "points_data", "ring", "min_lon", "min_lat", "max_lon", "max_lat")
+
+    def __init__(self, key: str, points_data: dict[str, Any], ring: list[tuple[float, float]]):
+        self.key = key
+        self.points_data = points_data
+        self.ring = ring
+        self.min_lon = min(lon for lon, _ in ring)
+        self.max_lon = max(lon for lon, _ in ring)
+        self.min_lat = min(lat for _, lat in ring)
+        self.max_lat = max(lat for _, lat in ring)
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        if not (self.min_lat <= latitude <= self.max_lat and self.min_lon <= longitude <= self.max_lon):
+            return False
+        return point_in_ring(longitude, latitude, self.ring)
+
+class GridIndex:
+    """격자 버킷으로 나눈 그리드 셀 인덱스 (셀 수 기준 LRU)"""
+
+    def __init__(self, bucket_degrees: Optional[float] = None, max_cells: Optional[int] = None):
+        # NWS 그리드 셀(약 2.5km)보다 큰 버킷을 사용해 셀당 등록되는 버킷 수를 줄임
+        self.bucket_degrees = bucket_degrees or float(os.getenv("GRID_INDEX_BUCKET_DEGREES", "0.05"))
+        self.max_cells = max(
+            max_cells if max_cells is not None else int(os.getenv("GRID_INDEX_MAX_CELLS", "10000")), 1
+        )
+        self._cells: OrderedDict[str, GridCell] = OrderedDict()
+        self._buckets: dict[tuple[int, int], list[GridCell]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _bucket_range(self, cell: GridCell) -> list[tuple[int, int]]:
+        """셀 경계 상자가 걸치는 버킷 목록"""
+        min_lat_bucket, min_lon_bucket = self._bucket(cell.min_lat, cell.min_lon)
+        max_lat_bucket, max_lon_bucket = self._bucket(cell.max_lat, cell.max_lon)
+        return [
+            (lat_bucket, lon_bucket)
+            for lat_bucket in range(min_lat_bucket, max_lat_bucket + 1)
+            for lon_bucket in range(min_lon_bucket, max_lon_bucket + 1)
+        ]
+
+    def _bucket(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return math.floor(latitude / self.bucket_degrees), math.floor(longitude / self.bucket_degrees)
+
+    def add(self, key: str, points_data: dict[str, Any], geometry: Optional[dict[str, Any]]) -> bool:
+        """
+        예보 응답의 geometry(Polygon)로 그리드 셀을 등록합니다.
+
+        Returns:
+            등록 여부 (이미 있거나 경계 정보가 없으면 False)
+        """
+        if key in self._cells or not geometry or geometry.get("type") != "Polygon":
+            return False
+        try:
+            ring = [(float(lon), float(lat)) for lon, lat, *_ in geometry["coordinates"][0]]
+        except (KeyError, IndexError, TypeError, ValueError):
+            return False
+        if len(ring) < 3:
+            return False
+
+        cell = GridCell(key, points_data, ring)
+        self._cells[key] = cell
+        for bucket in self._bucket_range(cell):
+            self._buckets.setdefault(bucket, []).append(cell)
+        logger.debug("그리드 셀 등록: %s", key)
+        self._evict()
+        return True
+
+    def _evict(self) -> None:
+        while len(self._cells) > self.max_cells:
+            key, cell = self._cells.popitem(last=False)
+            for bucket in self._bucket_range(cell):
+                cells = self._buckets.get(bucket)
+                if cells is None:
+                    continue
+                cells.remove(cell)
+                if not cells:
+                    del self._buckets[bucket]
+            self.evictions += 1
+            logger.debug("그리드 셀 제거 (LRU): %s", key)
+
+    def lookup(self, latitude: float, longitude: float) -> Optional[GridCell]:
+        """좌표를 포함하는 그리드 셀을 반환합니다 (없으면 None)."""
+        for cell in self._buckets.get(self._bucket(latitude, longitude), ()):
+            if cell.contains(latitude, longitude):
+                self.hits += 1
+                self._cells.move_to_end(cell.key)
+                return cell
+        self.misses += 1
+        return None
+
+    def stats(self) -> dict[str, int]:
+        """인덱스 통계를 반환합니다."""
+        return {
+            "cells": len(self._cells),
+            "max_cells": self.max_cells,
+            "buckets": len(self._buckets),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+# 프로세스 전역 인덱스
+_grid_index: Optional[GridIndex] = None
+
+def get_grid_index() -> GridIndex:
+    """프로세스 전역 그리드 셀 인덱스를 반환합니다."""
+    global _grid_index
+    if _grid_index is None:
+        _grid_index = GridIndex()
+    return _grid_index
@@ -2,14 +2,28 @@
 """
 로깅 설정 모듈
 환경변수를 통해 로그 레벨과 출력 방식을 설정할 수 있습니다.
+LOG_QUEUE=true(기본값)이면 로거는 큐에 기록만 하고, 콘솔 출력/파일 기록/로테이션은 백그라운드 스레드가 처리합니다.
+LOG_FORMAT=json이면 한 줄에 JSON 객체 하나로 기록하고, LOG_SAMPLING/LOG_RATE_LIMIT으로 반복 로그를 줄일 수 있습니다.
 """
 
 import os
+import copy
+import json
+import time
+import queue
+import atexit
+import random
 import logging
 import logging.handlers
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, Optional
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 환경변수에서 로깅 설정 읽기
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 LOG_OUTPUT = os.getenv("LOG_OUTPUT", "stdout").lower()  # stdout, file, both
@@ -17,39 +31,155 @@ LOG_FILE_PATH = os.getenv("LOG_FILE_PATH", "logs/mcp-server.log")
 LOG_MAX_SIZE = int(os.getenv("LOG_MAX_SIZE", "10"))  # MB
 LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
 LOG_FORMAT = os.getenv("LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+LOG_QUEUE = os.getenv("LOG_QUEUE", "true").lower() == "true"  # 백그라운드 스레드에서 기록
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")  # 로거별 DEBUG/INFO 기록 비율 (예: mcp-bridge=0.1,*=1)
+# 빈 값(LOG_RATE_BURST=)도 설정되지 않은 것으로 취급
+LOG_RATE_LIMIT = float(os.getenv("LOG_RATE_LIMIT") or 0)  # 같은 메시지의 초당 최대 기록 수 (0이면 제한 없음)
+LOG_RATE_BURST = float(os.getenv("LOG_RATE_BURST") or 0) or max(LOG_RATE_LIMIT * 2, 1)  # 순간 허용량
+
+# 메시지별 속도 제한 상태를 보관할 최대 메시지 수 (로거별)
+MAX_RATE_LIMIT_KEYS = 1000
+
+# 출력 대상별 (큐 핸들러, 백그라운드 기록기) - 같은 대상을 쓰는 로거는 기록기 하나를 공유
+_listeners: dict[tuple[str, str, Optional[str]], tuple[logging.Handler, logging.handlers.QueueListener]] = {}
+
+class LazyJSON:
+    """로그를 실제로 출력할 때만 JSON으로 직렬화하는 래퍼 (logger.debug("payload: %s", lazy_json(payload)))"""
+
+    __slots__ = ("value", "indent")
+
+    def __init__(self, value: Any, indent: Optional[int] = 2):
+        self.value = value
+        self.indent = indent
+
+    def __str__(self) -> str:
+        return json.dumps(self.value, ensure_ascii=False, indent=self.indent, default=str)
+
+def lazy_json(value: Any, indent: Optional[int] = 2) -> LazyJSON:
+    """DEBUG 로그에 넣을 큰 payload를 로그 레벨이 꺼져 있으면 직렬화하지 않도록 감쌉니다."""
+    return LazyJSON(value, indent)
+
+class TextFormatter(logging.Formatter):
+    """LOG_FORMAT 텍스트 포맷터 (속도 제한으로 생략된 건수가 있으면 메시지 뒤에 붙임)"""
 
-def setup_logger(name: str, log_file: Optional[str] = None) -> logging.Logger:
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        text = super().formatMessage(record)
+        suppressed = getattr(record, "suppressed", None)
+        if suppressed:
+            text += f" (같은 메시지 {suppressed}건 생략됨)"
+        return text
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나로 기록하는 포맷터 (orjson이 있으면 사용)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        # 샘플링 비율과 속도 제한으로 생략된 건수 (LogThrottle이 기록)
+        for key in ("sample_rate", "suppressed"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if orjson is not None:
+            return orjson.dumps(entry, default=str).decode()
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def parse_sampling(value: str) -> dict[str, float]:
+    """"mcp-bridge=0.1,weather-server=0.5,*=1" 형식의 로거별 기록 비율을 읽습니다."""
+    ratios = {}
+    for item in value.split(","):
+        name, _, ratio = item.partition("=")
+        if name.strip() and ratio.strip():
+            ratios[name.strip()] = min(max(float(ratio), 0.0), 1.0)
+    return ratios
+
+class _Bucket:
+    """메시지 하나의 토큰 버킷"""
+
+    __slots__ = ("tokens", "updated", "suppressed")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+        self.suppressed = 0
+
+class LogThrottle(logging.Filter):
     """
-    로거를 설정하고 반환합니다.
-    
-    Args:
-        name: 로거 이름
-        log_file: 로그 파일 경로 (None이면 환경변수 사용)
-    
-    Returns:
-        설정된 로거
+    로거에 붙여 핸들러(큐)에 넘기기 전에 반복 로그를 줄이는 필터
+    - 샘플링: DEBUG/INFO 로그를 sample_rate 비율만 기록 (WARNING 이상은 모두 기록)
+    - 속도 제한: 로그 호출 위치(로거, 파일, 줄)마다 토큰 버킷으로 초당 rate건까지만 기록하고,
+      다시 기록될 때 그동안 생략한 건수를 record.suppressed에 남김 (포맷터가 출력)
+      f-string으로 만든 메시지도 호출 위치가 같으면 같은 메시지로 취급함
     """
-    logger = logging.getLogger(name)
-    
-    # 이미 핸들러가 설정되어 있으면 중복 설정 방지
-    if logger.handlers:
-        return logger
-    
-    # 로그 레벨 설정
-    level = getattr(logging, LOG_LEVEL, logging.INFO)
-    logger.setLevel(level)
-    
-    # 로그 포맷터 설정
-    formatter = logging.Formatter(LOG_FORMAT)
+
+    def __init__(self, sample_rate: float = 1.0, rate: float = 0.0, burst: float = 1.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.sampled_out = 0
+        self._buckets: dict[tuple[str, str, int], _Bucket] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.sample_rate < 1.0 and record.levelno < logging.WARNING:
+            if random.random() >= self.sample_rate:
+                self.sampled_out += 1
+                return False
+            record.sample_rate = self.sample_rate
+
+        if self.rate <= 0:
+            return True
+
+        now = time.monotonic()
+        key = (record.name, record.pathname, record.lineno)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_RATE_LIMIT_KEYS:
+                # 가장 오래전에 생긴 메시지 상태부터 버림
+                del self._buckets[next(iter(self._buckets))]
+            bucket = self._buckets[key] = _Bucket(self.burst, now)
+        else:
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+
+        if bucket.tokens < 1.0:
+            bucket.suppressed += 1
+            return False
+        bucket.tokens -= 1.0
+        if bucket.suppressed:
+            # 메시지는 그대로 두고 속성으로만 전달 (다른 핸들러가 보는 레코드를 바꾸지 않음)
+            record.suppressed = bucket.suppressed
+            bucket.suppressed = 0
+        return True
+
+def _make_throttle(name: str) -> Optional[LogThrottle]:
+    """LOG_SAMPLING/LOG_RATE_LIMIT 설정으로 로거 name의 필터를 만듭니다 (설정이 없으면 None)."""
+    ratios = parse_sampling(LOG_SAMPLING)
+    sample_rate = ratios.get(name, ratios.get("*", 1.0))
+    if sample_rate >= 1.0 and LOG_RATE_LIMIT <= 0:
+        return None
+    return LogThrottle(sample_rate, LOG_RATE_LIMIT, LOG_RATE_BURST)
+
+def _build_handlers(level: int, output: str, log_file: Optional[str]) -> list[logging.Handler]:
+    """출력 방식에 맞는 실제 출력 핸들러(콘솔, 로테이팅 파일)를 만듭니다."""
+    handlers: list[logging.Handler] = []
+    formatter = JsonFormatter() if LOG_FORMAT.lower() == "json" else TextFormatter(LOG_FORMAT)
     
-    # 출력 방식에 따른 핸들러 설정
-    if LOG_OUTPUT in ["stdout", "both"]:
+    if output in ["stdout", "both"]:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(level)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
-    if LOG_OUTPUT in ["file", "both"]:
+    if output in ["file", "both"]:
         # 로그 파일 경로 설정
         if log_file is None:
             log_file = LOG_FILE_PATH
@@ -67,7 +197,93 @@ def setup_logger(name: str, log_file: Optional[str] = None) -> logging.Logger:
         )
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    return handlers
+
+class _JsonQueueHandler(logging.handlers.QueueHandler):
+    """예외 traceback을 메시지에 합치지 않고 exc_text로 넘기는 큐 핸들러 (JSON 형식용)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        record.stack_info = None
+        return record
+
+def _queue_handler(level: int, output: str, log_file: Optional[str]) -> logging.Handler:
+    """출력 대상별로 하나씩 백그라운드 기록기를 시작하고 그 큐에 넣는 핸들러를 반환합니다."""
+    key = (logging.getLevelName(level), output, log_file)
+    if key not in _listeners:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            log_queue, *_build_handlers(level, output, log_file), respect_handler_level=True
+        )
+        listener.start()
+        if LOG_FORMAT.lower() == "json":
+            handler = _JsonQueueHandler(log_queue)
+        else:
+            handler = logging.handlers.QueueHandler(log_queue)
+        handler.setLevel(level)
+        _listeners[key] = (handler, listener)
+    return _listeners[key][0]
+
+def stop_log_listeners() -> None:
+    """큐에 남은 로그를 모두 기록하고 백그라운드 기록기를 종료합니다 (프로세스 종료 시 자동 호출)."""
+    for _, listener in _listeners.values():
+        if listener._thread is not None:
+            listener.stop()
+
+atexit.register(stop_log_listeners)
+
+def setup_logger(
+    name: str,
+    log_file: Optional[str] = None,
+    level: Optional[str] = None,
+    output: Optional[str] = None,
+    use_queue: Optional[bool] = None,
+) -> logging.Logger:
+    """
+    로거를 설정하고 반환합니다.
+    
+    Args:
+        name: 로거 이름
+        log_file: 로그 파일 경로 (None이면 환경변수 사용)
+        level: 로그 레벨 (None이면 LOG_LEVEL)
+        output: 출력 방식 stdout/file/both (None이면 LOG_OUTPUT)
+        use_queue: 백그라운드 스레드에서 기록할지 여부 (None이면 LOG_QUEUE)
+    
+    Returns:
+        설정된 로거
+    """
+    logger = logging.getLogger(name)
+    
+    # 이미 핸들러가 설정되어 있으면 중복 설정 방지
+    if logger.handlers:
+        return logger
+    
+    # 로그 레벨 설정
+    level = getattr(logging, (level or LOG_LEVEL).upper(), logging.INFO)
+    logger.setLevel(level)
+    
+    output = (output or LOG_OUTPUT).lower()
+    if output in ["file", "both"] and log_file is None:
+        log_file = LOG_FILE_PATH
+    
+    # 샘플링/속도 제한은 큐에 넣기 전에 적용 (버린 로그는 포맷팅/기록 비용 없음)
+    throttle = _make_throttle(name)
+    if throttle is not None:
+        logger.addFilter(throttle)
+    
+    # 출력 방식에 따른 핸들러 설정 (큐 모드면 큐 핸들러 하나만 연결)
+    if LOG_QUEUE if use_queue is None else use_queue:
+        logger.addHandler(_queue_handler(level, output, log_file))
+    else:
+        for handler in _build_handlers(level, output, log_file):
+            logger.addHandler(handler)
     
     return logger
 
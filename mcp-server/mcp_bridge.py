@@ -3,14 +3,19 @@
 MCP Bridge Server - HTTP 서버와 Cursor 사이의 중계 서버
 """
 
+import os
 import sys
 import json
+import time
 import httpx
 import asyncio
 import argparse
-from typing import Any
-from mcp.server.fastmcp import FastMCP
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+from mcp.server.fastmcp import Context, FastMCP
 from logger_config import setup_logger
+from bridge_client import bridge_lifespan, get_bridge_client
+from tracing import configure_tracing, trace_headers, trace_span
 
 # Set encoding for proper character handling
 sys.stdout.reconfigure(encoding='utf-8')
@@ -19,68 +24,195 @@ sys.stderr.reconfigure(encoding='utf-8')
 # 로거 설정
 logger = setup_logger("mcp-bridge")
 
+# 추적 구간의 서비스 이름 (TRACE_EXPORT=file/otlp일 때 내보냄)
+configure_tracing("mcp-bridge")
+
 # 명령행 인수 파싱
 parser = argparse.ArgumentParser(description='MCP Bridge Server')
 parser.add_argument('--url', '-u', 
                    default='http://localhost:8000',
                    help='HTTP 서버 URL (기본값: http://localhost:8000)')
+parser.add_argument('--uds',
+                   default=None,
+                   help='HTTP 서버의 Unix 도메인 소켓 경로 (같은 호스트일 때, 기본값: BRIDGE_UDS 환경변수)')
 args = parser.parse_args()
 
 # HTTP 서버 URL 설정
 HTTP_SERVER_URL = args.url
 
+# get_forecast/get_alerts 결과를 기본으로 한국어로 번역할지 여부 (도구 인수 translate로 호출마다 지정 가능)
+# 기존 /api/query 경유와 같이 한국어 응답이 기본이며, false면 NWS 원문(영어)을 그대로 반환
+BRIDGE_TRANSLATE = os.getenv("BRIDGE_TRANSLATE", "true").lower() == "true"
+
+# 부분 응답(delta)을 MCP 진행 알림으로 보내는 최소 간격 (초, 0이면 토큰마다)
+BRIDGE_PROGRESS_INTERVAL = float(os.getenv("BRIDGE_PROGRESS_INTERVAL", "0.5"))
+
 logger.info(f"MCP Bridge Server 시작 - HTTP 서버 URL: {HTTP_SERVER_URL}")
 
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """브리지 수명 동안 HTTP 서버와의 커넥션 풀을 유지합니다 (종료 시 연결 재사용 통계 기록)."""
+    async with bridge_lifespan(HTTP_SERVER_URL, args.uds):
+        yield
+
 # Initialize FastMCP server
-mcp = FastMCP("weather-mcp-bridge")
+mcp = FastMCP("weather-mcp-bridge", lifespan=server_lifespan)
 
 # 서버 메타데이터 설정
 
-async def call_http_server(query: str) -> str:
-    """HTTP 서버에 요청을 보내고 응답을 받습니다."""
-    logger.debug(f"HTTP 서버 호출 시작: {query}")
+def format_timings(timings: dict[str, Any]) -> str:
+    """서버가 보낸 구간별 소요 시간을 로그용 문자열로 만듭니다 (예: "nws.http=12.3, total=900.1 (trace ...)")."""
+    parts = [f"{name}={value}" for name, value in timings.items() if name != "trace_id"]
+    return f"{', '.join(parts)} (trace {timings.get('trace_id')})"
+
+class ProgressReporter:
+    """
+    /api/query의 SSE 이벤트를 MCP 진행 알림(notifications/progress)으로 전달합니다.
+    클라이언트가 요청에 progressToken을 보낸 경우에만 전송되며, 부분 응답은 interval마다 한 번씩 모아 보냅니다.
+    """
+
+    # 프로세스에서 처음 실패한 전송만 WARNING으로 남김 (이후는 DEBUG)
+    _failure_logged = False
+
+    def __init__(self, ctx: Optional[Context], interval: float = BRIDGE_PROGRESS_INTERVAL):
+        self.ctx = ctx
+        self.interval = interval
+        self.progress = 0
+        self._last_partial = 0.0
+        self._sent_length = 0
+
+    async def status(self, message: str) -> None:
+        """상태 이벤트 (예: "날씨 정보를 가져오고 있습니다...")"""
+        await self._send(message)
+
+    async def partial(self, text: str, final: bool = False) -> None:
+        """지금까지 받은 부분 응답 (final이면 간격과 관계없이 전송, 이미 보낸 내용이면 생략)"""
+        now = time.monotonic()
+        if len(text) == self._sent_length or (not final and now - self._last_partial < self.interval):
+            return
+        self._last_partial = now
+        self._sent_length = len(text)
+        await self._send(text)
+
+    async def _send(self, message: str) -> None:
+        if self.ctx is None:
+            return
+        self.progress += 1
+        try:
+            await self.ctx.report_progress(self.progress, message=message)
+        except Exception as e:
+            # 진행 알림 실패로 도구 호출이 실패하지 않도록 함
+            if not ProgressReporter._failure_logged:
+                ProgressReporter._failure_logged = True
+                logger.warning(f"MCP 진행 알림 전송 실패 - 이후 실패는 DEBUG로 기록 (mcp>=1.9.0 필요): {e}")
+            else:
+                logger.debug("진행 알림 전송 실패: %s", e)
+
+async def call_http_server(query: str, ctx: Optional[Context] = None) -> str:
+    """
+    HTTP 서버에 요청을 보내고 응답을 받습니다.
+    ctx가 있으면 상태/부분 응답 이벤트를 MCP 진행 알림으로 전달하고,
+    MCP 클라이언트가 요청을 취소하면 스트림 연결을 닫아 서버의 NWS/LLM 호출도 취소되게 합니다.
+    """
+    logger.debug("HTTP 서버 호출 시작: %s", query)
+    progress = ProgressReporter(ctx)
     
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            logger.debug(f"HTTP 요청 전송: {HTTP_SERVER_URL}/api/query")
+        # 요청마다 새 trace를 시작하고 traceparent 헤더로 HTTP 서버에 전달
+        with trace_span("mcp_bridge.query", kind="client", query=query) as span:
+            # 프로세스 전역 커넥션 풀의 keep-alive 연결을 재사용
+            client = get_bridge_client()
+            logger.debug("HTTP 요청 전송: %s/api/query", HTTP_SERVER_URL)
             
-            response = await client.post(
-                f"{HTTP_SERVER_URL}/api/query",
+            async with client.stream(
+                "POST",
+                "/api/query",
                 json={"query": query},
-                headers={"Content-Type": "application/json"}
-            )
-            
-            logger.debug(f"HTTP 응답 상태: {response.status_code}")
-            response.raise_for_status()
-            
-            # 스트리밍 응답 처리
-            result_parts = []
-            async for line in response.aiter_lines():
-                logger.debug(f"스트림 라인: {line}")
+                headers=trace_headers({"Content-Type": "application/json"})
+            ) as response:
+                logger.debug("HTTP 응답 상태: %s", response.status_code)
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
                 
-                if line.startswith("data: "):
-                    try:
-                        data = json.loads(line[6:])  # "data: " 제거
-                        logger.debug(f"파싱된 데이터: {data}")
-                        
-                        if data["type"] == "status":
-                            logger.info(f"상태: {data['message']}")
-                        elif data["type"] == "result":
-                            result_parts.append(data["content"])
-                            logger.debug(f"결과 추가: {data['content'][:50]}...")
-                        elif data["type"] == "error":
-                            error_msg = f"오류: {data['message']}"
-                            logger.error(f"오류 발생: {error_msg}")
-                            return error_msg
+                # 스트리밍 응답 처리 (delta 토큰을 모으고, result가 오면 그 내용을 우선 사용)
+                delta_parts = []
+                result_parts = []
+                async for line in response.aiter_lines():
+                    logger.debug("스트림 라인: %s", line)
+                    
+                    if line.startswith("data: "):
+                        try:
+                            data = json.loads(line[6:])  # "data: " 제거
+                            logger.debug("파싱된 데이터: %s", data)
                             
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"JSON 파싱 오류: {e}")
-                        continue
+                            if data.get("timings"):
+                                # 서버가 마지막 이벤트에 붙인 구간별 소요 시간
+                                span.set_attribute("server.timings", json.dumps(data["timings"]))
+                                logger.info(f"서버 처리 시간 (ms): {format_timings(data['timings'])}")
+                                
+                            if data["type"] == "status":
+                                logger.info(f"상태: {data['message']}")
+                                await progress.status(data["message"])
+                            elif data["type"] == "delta":
+                                delta_parts.append(data["content"])
+                                await progress.partial("".join(delta_parts))
+                            elif data["type"] == "result":
+                                result_parts.append(data["content"])
+                                logger.debug("결과 추가: %s...", data['content'][:50])
+                            elif data["type"] == "error":
+                                error_msg = f"오류: {data['message']}"
+                                logger.error(f"오류 발생: {error_msg}")
+                                return error_msg
+                                
+                        except json.JSONDecodeError as e:
+                            logger.warning(f"JSON 파싱 오류: {e}")
+                            continue
             
-            final_result = "\n".join(result_parts) if result_parts else "응답을 받을 수 없습니다."
-            logger.debug(f"최종 결과: {final_result[:100]}...")
+            if delta_parts:
+                # 간격 제한으로 보내지 못한 마지막 부분 응답
+                await progress.partial("".join(delta_parts), final=True)
+            if result_parts:
+                final_result = "\n".join(result_parts)
+            elif delta_parts:
+                # result 이벤트 전에 스트림이 끝난 경우 받은 토큰까지 반환
+                final_result = "".join(delta_parts).strip()
+            else:
+                final_result = "응답을 받을 수 없습니다."
+            logger.debug("최종 결과: %s...", final_result[:100])
             return final_result
                         
+    except asyncio.CancelledError:
+        # 스트림 연결이 닫히면 서버가 연결 종료를 감지하고 진행 중인 NWS/LLM 호출을 취소함
+        logger.info(f"MCP 클라이언트가 요청을 취소함 - HTTP 스트림 종료 (진행 알림 {progress.progress}건 전송)")
+        raise
+    except httpx.HTTPStatusError as e:
+        error_msg = f"HTTP 상태 오류: {e.response.status_code} - {e.response.text}"
+        logger.error(error_msg)
+        return error_msg
+    except httpx.RequestError as e:
+        error_msg = f"HTTP 요청 오류: {e}"
+        logger.error(error_msg)
+        return error_msg
+    except Exception as e:
+        error_msg = f"HTTP 서버 호출 오류: {str(e)}"
+        logger.error(error_msg)
+        return error_msg
+
+async def call_structured_endpoint(path: str, payload: dict[str, Any]) -> str:
+    """
+    구조화 엔드포인트(/api/get_forecast, /api/get_alerts)를 직접 호출합니다.
+    /api/query처럼 자연어 질의를 다시 해석하거나 LLM을 거치지 않으므로 도구 인수(좌표, 주 코드)가 그대로 쓰입니다.
+    """
+    logger.debug("구조화 엔드포인트 호출: %s %s", path, payload)
+    try:
+        with trace_span(f"mcp_bridge{path.replace('/', '.')}", kind="client", **payload):
+            data = await get_bridge_client().post_json(path, payload, headers=trace_headers())
+        if not data.get("success"):
+            error_msg = f"오류: {data.get('error') or '응답을 받을 수 없습니다.'}"
+            logger.error(f"오류 발생: {error_msg}")
+            return error_msg
+        return data["data"]
     except httpx.HTTPStatusError as e:
         error_msg = f"HTTP 상태 오류: {e.response.status_code} - {e.response.text}"
         logger.error(error_msg)
@@ -95,42 +227,67 @@ async def call_http_server(query: str) -> str:
         return error_msg
 
 @mcp.tool()
-async def get_alerts(state: str) -> str:
+async def get_alerts(state: str, translate: Optional[bool] = None) -> str:
     """Get weather alerts for a US state.
 
     Args:
         state: Two-letter US state code (e.g. CA, NY)
+        translate: Translate the alerts into Korean (slower, uses the LLM; defaults to BRIDGE_TRANSLATE)
     """
     logger.info(f"get_alerts 호출됨: state={state}")
-    query = f"{state} 주의 날씨 경보를 알려줘"
-    result = await call_http_server(query)
-    logger.debug(f"get_alerts 결과: {result[:100]}...")
+    translate = BRIDGE_TRANSLATE if translate is None else translate
+    result = await call_structured_endpoint("/api/get_alerts", {"state": state, "translate": translate})
+    logger.debug("get_alerts 결과: %s...", result[:100])
     return result
 
 @mcp.tool()
-async def get_forecast(latitude: float, longitude: float) -> str:
+async def get_forecast(latitude: float, longitude: float, translate: Optional[bool] = None) -> str:
     """Get weather forecast for a location.
 
     Args:
         latitude: Latitude of the location
         longitude: Longitude of the location
+        translate: Translate the forecast into Korean with metric units (defaults to BRIDGE_TRANSLATE)
     """
     logger.info(f"get_forecast 호출됨: lat={latitude}, lon={longitude}")
-    query = f"위도 {latitude}, 경도 {longitude} 위치의 날씨 예보를 알려줘"
-    result = await call_http_server(query)
-    logger.debug(f"get_forecast 결과: {result[:100]}...")
+    translate = BRIDGE_TRANSLATE if translate is None else translate
+    result = await call_structured_endpoint(
+        "/api/get_forecast", {"latitude": latitude, "longitude": longitude, "translate": translate}
+    )
+    logger.debug("get_forecast 결과: %s...", result[:100])
     return result
 
 @mcp.tool()
-async def process_weather_query(query: str) -> str:
+async def route_weather_query(query: str) -> str:
+    """Choose the weather tool and arguments for a natural language query (offline, no LLM).
+
+    Args:
+        query: Natural language weather query (Korean or English)
+    """
+    logger.debug("route_weather_query 호출됨: %s", query)
+    try:
+        data = await get_bridge_client().post_json("/api/route", {"query": query}, headers=trace_headers())
+        return json.dumps(data, ensure_ascii=False)
+    except httpx.HTTPStatusError as e:
+        error_msg = f"HTTP 상태 오류: {e.response.status_code} - {e.response.text}"
+        logger.error(error_msg)
+        return error_msg
+    except httpx.RequestError as e:
+        error_msg = f"HTTP 요청 오류: {e}"
+        logger.error(error_msg)
+        return error_msg
+
+@mcp.tool()
+async def process_weather_query(query: str, ctx: Context) -> str:
     """Process a natural language weather query with AI assistance.
+    Status updates and partial answers are sent as progress notifications while the answer streams.
 
     Args:
         query: Natural language weather query (Korean or English)
     """
     logger.info(f"process_weather_query 호출됨: {query}")
-    result = await call_http_server(query)
-    logger.debug(f"process_weather_query 결과: {result[:100]}...")
+    result = await call_http_server(query, ctx)
+    logger.debug("process_weather_query 결과: %s...", result[:100])
     return result
 
 if __name__ == "__main__":
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Prometheus 메트릭 모듈
+요청 수/지연 시간 히스토그램/진행 중 요청 게이지를 Prometheus 텍스트 형식으로 내보냅니다.
+레이블 값별 시계열은 처음 한 번만 만들고 이후에는 숫자만 증가시키므로,
+요청 처리 경로에서는 미리 만들어 둔 시계열(예: POINTS_SECONDS)의 observe/inc만 호출합니다.
+캐시 적중률처럼 이미 다른 모듈이 세고 있는 값은 수집 시점에 콜백으로 읽습니다.
+"""
+
+import math
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, Optional
+
+# 지연 시간 히스토그램 기본 구간 (초, NWS 캐시 적중부터 LLM 전체 응답까지)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class _Value:
+    """카운터/게이지 시계열 하나"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+class _HistogramValue:
+    """히스토그램 시계열 하나 (구간별 개수는 누적하지 않고 저장, 출력 시 누적)"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def observe_since(self, started: float) -> None:
+        """time.perf_counter() 값 started부터 지금까지의 시간(초)을 기록합니다."""
+        self.observe(time.perf_counter() - started)
+
+class _Metric:
+    """레이블 값별 시계열을 가지는 메트릭"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], Any] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+        register(self)
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        """
+        레이블 값에 해당하는 시계열을 반환합니다 (없으면 생성).
+        자주 쓰는 시계열은 모듈 로드 시 한 번 받아 두고 재사용합니다.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: 레이블 {self.labelnames}에 맞지 않는 값 {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _unlabelled(self) -> Any:
+        return self._children[()]
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple[str, ...], child: Any) -> list[str]:
+        return [f"{self.name}{_label_text(self.labelnames, values)} {_format_value(child.value)}"]
+
+class Counter(_Metric):
+    """증가만 하는 카운터"""
+
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled().inc(amount)
+
+class Gauge(_Metric):
+    """증가/감소하는 게이지"""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._unlabelled().dec(amount)
+
+class Histogram(_Metric):
+    """구간별 개수와 합계를 가지는 히스토그램"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        self.bounds = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+    def _render_child(self, values: tuple[str, ...], child: _HistogramValue) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*child.bounds, math.inf), child.counts):
+            cumulative += count
+            labels = _label_text(self.labelnames, values, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _label_text(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+class CallbackMetric(_Metric):
+    """
+    수집 시점에 콜백으로 값을 읽는 메트릭
+    이미 다른 모듈이 세고 있는 값(캐시 적중 수, 대기열 길이 등)을 요청 처리 경로에 손대지 않고 내보낼 때 사용합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: Iterable[str],
+        collect: Callable[[], Iterable[tuple[tuple[str, ...], float]]],
+    ):
+        self.kind = kind
+        self._collect = collect
+        super().__init__(name, documentation, labelnames)
+        self._children.clear()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, value in self._collect():
+            lines.append(f"{self.name}{_label_text(self.labelnames, values)} {_format_value(value)}")
+        return lines
+
+# 프로세스 전역 메트릭 목록 (생성 순서대로 출력)
+REGISTRY: list[_Metric] = []
+
+def register(metric: _Metric) -> None:
+    """
+    메트릭을 등록합니다. 같은 이름이 이미 있으면 교체합니다
+    (server_app처럼 __main__과 모듈 이름으로 두 번 로드되는 모듈이 등록해도 한 번만 출력).
+    """
+    for index, registered in enumerate(REGISTRY):
+        if registered.name == metric.name:
+            REGISTRY[index] = metric
+            return
+    REGISTRY.append(metric)
+
+def render_metrics() -> str:
+    """등록된 모든 메트릭을 Prometheus 텍스트 형식으로 반환합니다."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+# HTTP 요청 메트릭 (MetricsMiddleware가 기록)
+HTTP_REQUESTS = Counter(
+    "weather_http_requests_total",
+    "HTTP requests by route, method and status code.",
+    ("route", "method", "status"),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "weather_http_request_duration_seconds",
+    "HTTP request latency by route (streaming responses until the last byte).",
+    ("route",),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "weather_http_requests_in_flight",
+    "HTTP requests currently being processed by route.",
+    ("route",),
+)
+
+# 질의 처리 단계별 지연 시간
+STAGE_SECONDS = Histogram(
+    "weather_stage_duration_seconds",
+    "Latency of query processing stages.",
+    ("stage",),
+)
+ROUTING_SECONDS = STAGE_SECONDS.labels("routing")
+POINTS_SECONDS = STAGE_SECONDS.labels("points")
+FORECAST_SECONDS = STAGE_SECONDS.labels("forecast")
+ALERTS_SECONDS = STAGE_SECONDS.labels("alerts")
+LLM_SECONDS = STAGE_SECONDS.labels("llm")
+SSE_FIRST_BYTE_SECONDS = STAGE_SECONDS.labels("sse_first_byte")
+
+class MetricsMiddleware:
+    """
+    라우트별 요청 수/지연 시간/진행 중 요청 수를 기록하는 ASGI 미들웨어
+    스트리밍 응답과 연결 종료 감지(receive)를 그대로 통과시키도록 BaseHTTPMiddleware 대신 ASGI로 구현합니다.
+    등록된 경로가 아닌 요청은 route="other"로 묶어 시계열 수가 늘어나지 않게 합니다.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+        self._routes: Optional[dict[str, tuple[_Value, _HistogramValue]]] = None
+
+    def _route_series(self, scope: dict[str, Any]) -> tuple[str, _Value, _HistogramValue]:
+        if self._routes is None:
+            # 라우트 목록은 앱 생성이 끝난 뒤 첫 요청에서 읽음
+            paths = [getattr(route, "path", None) for route in scope["app"].routes]
+            self._routes = {
+                path: (HTTP_IN_FLIGHT.labels(path), HTTP_REQUEST_SECONDS.labels(path))
+                for path in [*paths, "other"] if path
+            }
+        path = scope["path"]
+        series = self._routes.get(path)
+        if series is None:
+            path = "other"
+            series = self._routes[path]
+        return path, *series
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route, in_flight, latency = self._route_series(scope)
+        status = 500
+
+        async def send_with_status(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            latency.observe_since(started)
+            HTTP_REQUESTS.labels(route, scope["method"], str(status)).inc()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+NWS API 공용 HTTP 클라이언트 모듈
+프로세스 전체에서 하나의 커넥션 풀(keep-alive, HTTP/2)을 공유합니다.
+"""
+
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+import httpx
+from logger_config import setup_logger
+from response_cache import ResponseCache
+from singleflight import SingleFlight
+from grid_index import get_grid_index, grid_key
+from points_cache import get_points_cache, open_points_cache, close_points_cache
+from admission import AdmissionRejected, upstream_slot
+from metrics import FORECAST_SECONDS, POINTS_SECONDS
+from tracing import trace_headers, trace_span
+
+# 로거 설정
+logger = setup_logger("nws-client")
+
+DEFAULT_API_BASE = "https://api.weather.gov"
+DEFAULT_USER_AGENT = "weather-app/1.0"
+
+class NWSClient:
+    """keep-alive 커넥션 풀을 유지하는 NWS API 클라이언트"""
+
+    def __init__(
+        self,
+        user_agent: Optional[str] = None,
+        http2: Optional[bool] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        pool_timeout: Optional[float] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        # 인수가 없으면 환경변수 사용 (.env 로드 이후에 생성되므로 여기서 읽음)
+        self.user_agent = user_agent or os.getenv("NWS_USER_AGENT", DEFAULT_USER_AGENT)
+        self.http2 = http2 if http2 is not None else os.getenv("NWS_HTTP2", "true").lower() == "true"
+        self.limits = httpx.Limits(
+            max_connections=max_connections or int(os.getenv("NWS_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=max_keepalive_connections or int(os.getenv("NWS_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=keepalive_expiry or float(os.getenv("NWS_KEEPALIVE_EXPIRY", "30")),
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout or float(os.getenv("NWS_CONNECT_TIMEOUT", "5")),
+            read=read_timeout or float(os.getenv("NWS_READ_TIMEOUT", "30")),
+            write=read_timeout or float(os.getenv("NWS_READ_TIMEOUT", "30")),
+            pool=pool_timeout or float(os.getenv("NWS_POOL_TIMEOUT", "10")),
+        )
+        # HTTP 캐시 헤더를 따르는 응답 캐시 (NWS_CACHE_ENABLED=false이면 비활성화)
+        if cache is None and os.getenv("NWS_CACHE_ENABLED", "true").lower() == "true":
+            cache = ResponseCache()
+        self.cache = cache
+        # 같은 URL에 대한 동시 요청 병합
+        self.flights = SingleFlight()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        """커넥션 풀을 생성합니다."""
+        if self._client is not None:
+            return
+
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("h2 패키지가 없어 HTTP/1.1로 동작합니다. (pip install 'httpx[http2]')")
+                http2 = False
+
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            limits=self.limits,
+            timeout=self.timeout,
+            headers={
+                "User-Agent": self.user_agent,
+                "Accept": "application/geo+json",
+            },
+        )
+        logger.info(
+            f"NWS 클라이언트 시작 - HTTP/2: {http2}, "
+            f"최대 연결: {self.limits.max_connections}, keep-alive: {self.limits.max_keepalive_connections}"
+        )
+
+    async def aclose(self) -> None:
+        """커넥션 풀을 닫습니다."""
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+        logger.info("NWS 클라이언트 종료")
+
+    async def get_json(self, url: str) -> dict[str, Any] | None:
+        """Make a GET request to the NWS API and return the parsed JSON body"""
+        if self._client is None:
+            await self.start()
+
+        if self.cache is not None:
+            entry = self.cache.get(url)
+            if entry is not None and entry.is_fresh(time.time()):
+                self.cache.hits += 1
+                logger.debug("응답 캐시 적중: %s", url)
+                return entry.data
+
+        # 동시에 들어온 같은 URL 요청은 하나의 NWS 호출 결과를 공유
+        return await self.flights.do(url, lambda: self._fetch(url))
+
+    async def _fetch(self, url: str) -> dict[str, Any] | None:
+        entry = self.cache.get(url) if self.cache is not None else None
+
+        logger.debug("NWS API 호출: %s", url)
+        try:
+            # 동시 NWS 호출 수 제한 (슬롯을 기한 안에 얻지 못하면 AdmissionRejected)
+            async with upstream_slot("nws"):
+                with trace_span("nws.http", kind="client", url=url) as span:
+                    headers = trace_headers(entry.conditional_headers() if entry is not None else None)
+                    response = await self._client.get(url, headers=headers)
+                    span.set_attribute("http.status_code", response.status_code)
+            logger.debug("NWS API 응답 상태: %s (%s)", response.status_code, response.http_version)
+
+            if response.status_code == 304 and entry is not None:
+                # 변경 없음: 본문을 다시 받거나 파싱하지 않고 캐시 항목 재사용
+                self.cache.refresh(url, response.headers)
+                logger.debug("응답 캐시 재검증 완료: %s", url)
+                return entry.data
+
+            response.raise_for_status()
+            result = response.json()
+            if self.cache is not None:
+                self.cache.misses += 1
+                self.cache.store(url, result, len(response.content), response.headers)
+            return result
+        except AdmissionRejected:
+            # 과부하 거절은 호출자가 503/Retry-After로 응답하도록 그대로 전달
+            raise
+        except Exception as e:
+            logger.error(f"NWS API 오류: {e}")
+            return None
+
+    def fresh_for(self, url: str) -> Optional[float]:
+        """캐시된 응답의 남은 유효 기간(초)을 반환합니다 (캐시에 없으면 None)."""
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is None:
+            return None
+        return max(entry.fresh_until - time.time(), 0.0)
+
+    def stats(self) -> dict[str, Any]:
+        """응답 캐시 통계를 반환합니다."""
+        return self.cache.stats() if self.cache is not None else {}
+
+    def flight_stats(self) -> dict[str, Any]:
+        """동시 요청 병합 통계를 반환합니다."""
+        return self.flights.stats()
+
+# 프로세스 전역 클라이언트
+_nws_client: Optional[NWSClient] = None
+
+def get_nws_client() -> NWSClient:
+    """
+    프로세스 전역 NWS 클라이언트를 반환합니다.
+    아직 생성되지 않았다면 기본 설정으로 생성합니다 (첫 요청 시 풀이 열림).
+    """
+    global _nws_client
+    if _nws_client is None:
+        _nws_client = NWSClient()
+    return _nws_client
+
+async def fetch_points(latitude: float, longitude: float, api_base: Optional[str] = None) -> dict[str, Any] | None:
+    """
+    /points/{lat},{lon} 응답을 반환합니다.
+    반올림 좌표 기준으로 영구 캐시를 먼저 조회하고, 없을 때만 NWS를 호출합니다.
+
+    Args:
+        latitude: 위도
+        longitude: 경도
+        api_base: NWS API 주소 (None이면 NWS_API_BASE 환경변수 사용)
+    """
+    started = time.perf_counter()
+    api_base = api_base or os.getenv("NWS_API_BASE", DEFAULT_API_BASE)
+    cache = get_points_cache()
+    lat, lon = cache.round_coords(latitude, longitude)
+    key = cache.make_key(api_base, lat, lon)
+
+    with trace_span("nws.points", latitude=lat, longitude=lon) as span:
+        try:
+            points_data = cache.get(key)
+            if points_data is not None:
+                logger.debug("points 캐시 적중: %s,%s", lat, lon)
+                span.set_attribute("source", "points_cache")
+                return points_data
+
+            # 이미 알려진 그리드 셀 안의 좌표면 네트워크 호출 없이 셀 정보 사용
+            cell = get_grid_index().lookup(latitude, longitude)
+            if cell is not None:
+                logger.debug("그리드 인덱스 적중: %s,%s -> %s", lat, lon, cell.key)
+                span.set_attribute("source", "grid_index")
+                return cell.points_data
+
+            points_data = await get_nws_client().get_json(f"{api_base}/points/{lat},{lon}")
+            if points_data and "properties" in points_data:
+                await cache.put(key, points_data)
+            return points_data
+        finally:
+            POINTS_SECONDS.observe_since(started)
+
+async def fetch_forecast(points_data: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    /points 응답의 forecast URL로 예보를 가져옵니다.
+    응답에 포함된 그리드 셀 경계는 그리드 인덱스에 등록되어 이후 주변 좌표 조회에 사용됩니다.
+
+    Args:
+        points_data: fetch_points가 반환한 /points 응답
+    """
+    started = time.perf_counter()
+    with trace_span("nws.forecast"):
+        try:
+            forecast_data = await get_nws_client().get_json(points_data["properties"]["forecast"])
+        finally:
+            FORECAST_SECONDS.observe_since(started)
+    if forecast_data:
+        get_grid_index().add(grid_key(points_data), points_data, forecast_data.get("geometry"))
+    return forecast_data
+
+async def start_nws_client(user_agent: Optional[str] = None) -> NWSClient:
+    """프로세스 전역 NWS 클라이언트를 생성하고 커넥션 풀을 엽니다."""
+    global _nws_client
+    if _nws_client is None:
+        _nws_client = NWSClient(user_agent=user_agent)
+    await _nws_client.start()
+    return _nws_client
+
+async def close_nws_client() -> None:
+    """프로세스 전역 NWS 클라이언트를 닫습니다."""
+    global _nws_client
+    if _nws_client is not None:
+        await _nws_client.aclose()
+        _nws_client = None
+
+@asynccontextmanager
+async def nws_lifespan(user_agent: Optional[str] = None):
+    """
+    서버 시작/종료 시 NWS 클라이언트와 points 캐시를 열고 닫는 컨텍스트 매니저
+
+    Args:
+        user_agent: 서버별 기본 User-Agent (NWS_USER_AGENT 환경변수가 있으면 환경변수 우선)
+    """
+    # 각 서버가 넘기는 User-Agent는 기본값이므로 운영자가 설정한 NWS_USER_AGENT가 있으면 그 값을 사용
+    user_agent = os.getenv("NWS_USER_AGENT") or user_agent
+    open_points_cache()
+    await start_nws_client(user_agent)
+    try:
+        yield get_nws_client()
+    finally:
+        await close_nws_client()
+        close_points_cache()
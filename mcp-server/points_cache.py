@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+NWS /points 응답 영구 캐시 모듈
+위경도 → 예보 사무소/그리드 매핑은 거의 바뀌지 않으므로 SQLite에 저장해 두고
+서버 시작 시 메모리로 읽어 들여 조회 시 네트워크 왕복을 생략합니다.
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Optional
+from logger_config import setup_logger
+
+# 로거 설정
+logger = setup_logger("points-cache")
+
+class PointsCache:
+    """반올림된 좌표를 키로 /points 응답을 저장하는 SQLite 기반 캐시"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        precision: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        # 인수가 없으면 환경변수 사용
+        self.path = path or os.getenv("POINTS_CACHE_PATH", "cache/points.sqlite3")
+        self.precision = precision if precision is not None else int(os.getenv("POINTS_CACHE_PRECISION", "4"))
+        # 기본 30일 (초 단위)
+        self.ttl = ttl if ttl is not None else float(os.getenv("POINTS_CACHE_TTL_DAYS", "30")) * 86400
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def round_coords(self, latitude: float, longitude: float) -> tuple[float, float]:
+        """캐시 키와 NWS 요청에 사용할 반올림 좌표를 반환합니다."""
+        return round(latitude, self.precision), round(longitude, self.precision)
+
+    @staticmethod
+    def make_key(api_base: str, latitude: float, longitude: float) -> str:
+        """API 주소와 반올림 좌표로 캐시 키를 만듭니다."""
+        return f"{api_base}|{latitude},{longitude}"
+
+    def load(self) -> int:
+        """SQLite 파일을 열고 유효한 항목을 메모리로 읽어 들입니다."""
+        if self._conn is not None:
+            return len(self._entries)
+
+        db_path = Path(self.path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS points ("
+            "key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, data TEXT NOT NULL)"
+        )
+        expire_before = time.time() - self.ttl
+        self._conn.execute("DELETE FROM points WHERE fetched_at < ?", (expire_before,))
+        self._conn.commit()
+
+        for key, fetched_at, data in self._conn.execute("SELECT key, fetched_at, data FROM points"):
+            try:
+                self._entries[key] = (fetched_at, json.loads(data))
+            except json.JSONDecodeError:
+                logger.warning(f"손상된 points 캐시 항목 무시: {key}")
+
+        logger.info(f"points 캐시 로드 완료: {len(self._entries)}개 항목 ({self.path})")
+        return len(self._entries)
+
+    def close(self) -> None:
+        """SQLite 연결을 닫습니다."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """캐시된 /points 응답을 반환합니다 (없거나 만료되면 None)."""
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry[0] > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    async def put(self, key: str, data: dict[str, Any]) -> None:
+        """/points 응답을 메모리와 SQLite에 저장합니다."""
+        fetched_at = time.time()
+        self._entries[key] = (fetched_at, data)
+        if self._conn is not None:
+            # 디스크 쓰기는 이벤트 루프를 막지 않도록 스레드에서 실행
+            await asyncio.to_thread(self._write, key, fetched_at, json.dumps(data))
+
+    def _write(self, key: str, fetched_at: float, data: str) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO points (key, fetched_at, data) VALUES (?, ?, ?)",
+                (key, fetched_at, data),
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict[str, int]:
+        """캐시 통계를 반환합니다."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+# 프로세스 전역 캐시
+_points_cache: Optional[PointsCache] = None
+
+def get_points_cache() -> PointsCache:
+    """프로세스 전역 points 캐시를 반환합니다 (없으면 메모리 전용으로 생성)."""
+    global _points_cache
+    if _points_cache is None:
+        _points_cache = PointsCache()
+    return _points_cache
+
+def open_points_cache() -> PointsCache:
+    """프로세스 전역 points 캐시를 생성하고 디스크에서 로드합니다."""
+    cache = get_points_cache()
+    try:
+        cache.load()
+    except sqlite3.Error as e:
+        # 디스크 캐시를 열 수 없어도 메모리 캐시로 계속 동작
+        logger.error(f"points 캐시 파일을 열 수 없음: {e}")
+    return cache
+
+def close_points_cache() -> None:
+    """프로세스 전역 points 캐시를 닫습니다."""
+    global _points_cache
+    if _points_cache is not None:
+        _points_cache.close()
+        _points_cache = None
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+질의 처리 단계별 소요 시간 측정 모듈
+process_weather_query의 의도 분류/NWS 조회/LLM 호출 시간을 기록하고,
+날씨 질의에서 생략한 LLM 호출이 절약한 시간을 평균 LLM 왕복 시간으로 추정합니다.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+# 프로세스 전체 LLM 호출 통계 (생략한 호출의 절약 시간 추정용)
+_llm_stats = {"calls": 0, "total_ms": 0.0, "skipped": 0}
+
+class QueryTimer:
+    """질의 하나의 단계별 소요 시간 (ms)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.active: dict[str, float] = {}
+        self.skipped_llm_calls = 0
+
+    @contextmanager
+    def stage(self, name: str, llm: bool = False) -> Iterator[None]:
+        """
+        블록 실행 시간을 name 단계로 기록합니다.
+
+        Args:
+            name: 단계 이름 (예: "nws", "llm")
+            llm: LLM 호출 단계이면 True (평균 LLM 왕복 시간에 반영)
+        """
+        started = time.perf_counter()
+        self.active[name] = started
+        completed = False
+        try:
+            yield
+            completed = True
+        finally:
+            del self.active[name]
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            # 중간에 취소된 호출은 평균 LLM 왕복 시간에서 제외
+            if llm and completed:
+                record_llm_call(elapsed)
+
+    def skip_llm_call(self) -> None:
+        """생략한 LLM 호출을 기록합니다."""
+        self.skipped_llm_calls += 1
+        _llm_stats["skipped"] += 1
+
+    def remaining_llm_ms(self, name: str = "llm") -> float:
+        """
+        지금 중단하면 아낄 수 있는 LLM 시간(ms)을 평균 LLM 왕복 시간으로 추정합니다.
+        name 단계가 진행 중이면 남은 시간, 시작 전이면 평균 전체, 이미 끝났으면 0입니다.
+        """
+        if name in self.active:
+            elapsed = (time.perf_counter() - self.active[name]) * 1000
+            return max(average_llm_ms() - elapsed, 0.0)
+        if name in self.stages:
+            return 0.0
+        return average_llm_ms()
+
+    def summary(self) -> str:
+        """단계별 소요 시간과 생략한 LLM 호출의 추정 절약 시간을 문자열로 반환합니다."""
+        parts = [f"{name}: {elapsed:.0f}ms" for name, elapsed in self.stages.items()]
+        parts.append(f"총: {(time.perf_counter() - self.started) * 1000:.0f}ms")
+        if self.skipped_llm_calls:
+            average = average_llm_ms()
+            saved = f"약 {average * self.skipped_llm_calls:.0f}ms 절약" if average else "절약 시간 측정 전"
+            parts.append(f"생략한 LLM 호출: {self.skipped_llm_calls}회 ({saved})")
+        return ", ".join(parts)
+
+def record_llm_call(elapsed_ms: float) -> None:
+    """끝까지 완료된 LLM 호출의 왕복 시간을 기록합니다."""
+    _llm_stats["calls"] += 1
+    _llm_stats["total_ms"] += elapsed_ms
+
+def average_llm_ms() -> float:
+    """지금까지 측정한 평균 LLM 왕복 시간 (ms, 측정 전이면 0)"""
+    return _llm_stats["total_ms"] / _llm_stats["calls"] if _llm_stats["calls"] else 0.0
+
+def llm_call_stats() -> dict[str, Any]:
+    """LLM 호출/생략 통계를 반환합니다."""
+    return {
+        "calls": _llm_stats["calls"],
+        "skipped": _llm_stats["skipped"],
+        "avg_ms": round(average_llm_ms(), 1),
+        "saved_ms_estimate": round(average_llm_ms() * _llm_stats["skipped"], 1),
+    }
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+NWS 응답 메모리 캐시 모듈
+Cache-Control / Expires 유효 기간을 따르고, 만료된 항목은 ETag / Last-Modified로
+조건부 재검증하여 304 응답이면 JSON을 다시 받지 않고 재사용합니다.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping, Optional
+from logger_config import setup_logger
+
+# 로거 설정
+logger = setup_logger("response-cache")
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    """HTTP 날짜 헤더를 epoch 초로 변환합니다 (잘못된 값이면 None)."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+def _parse_cache_control(value: Optional[str]) -> dict[str, Optional[str]]:
+    """Cache-Control 헤더를 {지시어: 값} 딕셔너리로 변환합니다."""
+    directives: dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+def freshness_lifetime(headers: Mapping[str, str], now: float) -> Optional[float]:
+    """
+    응답 헤더로부터 남은 유효 기간(초)을 계산합니다.
+
+    Returns:
+        유효 기간 (초). no-store이면 None, 명시적 유효 기간이 없으면 0
+    """
+    directives = _parse_cache_control(headers.get("cache-control"))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name):
+            try:
+                lifetime = float(directives[name])
+            except ValueError:
+                continue
+            # 공유 캐시를 거친 경우 Age만큼 이미 소모됨
+            try:
+                age = float(headers.get("age", "0"))
+            except ValueError:
+                age = 0.0
+            return max(lifetime - age, 0.0)
+
+    expires = _parse_http_date(headers.get("expires"))
+    if expires is not None:
+        date = _parse_http_date(headers.get("date")) or now
+        return max(expires - date, 0.0)
+
+    return 0.0
+
+class CacheEntry:
+    """캐시된 응답 하나 (파싱된 JSON과 재검증용 헤더)"""
+
+    __slots__ = ("data", "size", "etag", "last_modified", "fresh_until")
+
+    def __init__(self, data: Any, size: int, etag: Optional[str], last_modified: Optional[str], fresh_until: float):
+        self.data = data
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fresh_until = fresh_until
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    def conditional_headers(self) -> dict[str, str]:
+        """재검증 요청에 붙일 조건부 헤더를 반환합니다."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """응답 본문 크기(바이트) 기준으로 용량을 제한하는 LRU 캐시"""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        # 인수가 없으면 환경변수 사용 (MB 단위)
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            float(os.getenv("NWS_CACHE_MAX_MB", "32")) * 1024 * 1024
+        )
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """URL에 해당하는 항목을 반환하고 LRU 순서를 갱신합니다."""
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+
+    def store(self, url: str, data: Any, size: int, headers: Mapping[str, str]) -> None:
+        """응답을 저장합니다. no-store이거나 재사용할 근거가 없으면 저장하지 않습니다."""
+        now = time.time()
+        lifetime = freshness_lifetime(headers, now)
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+
+        if lifetime is None or (lifetime == 0 and not etag and not last_modified):
+            self.discard(url)
+            return
+        if size > self.max_bytes:
+            logger.debug(f"캐시 용량보다 큰 응답은 저장하지 않음: {url} ({size} bytes)")
+            self.discard(url)
+            return
+
+        self.discard(url)
+        self._entries[url] = CacheEntry(data, size, etag, last_modified, now + lifetime)
+        self.current_bytes += size
+        self._evict()
+
+    def refresh(self, url: str, headers: Mapping[str, str]) -> Optional[CacheEntry]:
+        """304 응답의 헤더로 기존 항목의 유효 기간과 검증자를 갱신합니다."""
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        now = time.time()
+        lifetime = freshness_lifetime(headers, now)
+        entry.fresh_until = now + (lifetime or 0.0)
+        entry.etag = headers.get("etag", entry.etag)
+        entry.last_modified = headers.get("last-modified", entry.last_modified)
+        self.revalidations += 1
+        return entry
+
+    def discard(self, url: str) -> None:
+        """항목을 제거합니다."""
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self.current_bytes > self.max_bytes and self._entries:
+            url, entry = self._entries.popitem(last=False)
+            self.current_bytes -= entry.size
+            self.evictions += 1
+            logger.debug(f"캐시 항목 제거 (LRU): {url}")
+
+    def stats(self) -> dict[str, int]:
+        """캐시 통계를 반환합니다."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+        }
@@ -1,30 +1,51 @@
 import sys
 import os
-from typing import Any, AsyncGenerator
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 import uvicorn
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 import json
-import httpx
 from dotenv import load_dotenv
 import groq
-from logger_config import setup_logger
 
-# .env 파일 로드
+# .env 파일 로드 (아래 모듈들이 import 시점에 읽는 환경변수에도 적용되도록 먼저 로드)
 load_dotenv()
 
+from logger_config import lazy_json, setup_logger
+from nws_client import get_nws_client, fetch_forecast, fetch_points, nws_lifespan
+from forecast_batch import batch_max_locations, format_forecast, iter_forecast_batch, validate_batch
+from forecast_localize import build_translation_messages, get_localizer_stats, localize_forecast, parse_translations
+from alerts_index import alerts_lifespan, fetch_state_alerts, get_alerts_ingester
+from points_cache import get_points_cache
+from translation_cache import close_translation_cache, get_translation_cache, open_translation_cache
+from grid_index import get_grid_index
+from geocoder import find_nearest_place, get_geocoder, lookup_place, route_query
+from query_timing import QueryTimer, record_llm_call
+from stream_guard import get_stream_stats, guard_stream
+from admission import AdmissionRejected, get_admission_controller, upstream_slot
+from tracing import configure_tracing, start_span, trace_headers, trace_span, use_span
+from metrics import CONTENT_TYPE, LLM_SECONDS, ROUTING_SECONDS, CallbackMetric, MetricsMiddleware, render_metrics
+
 # 로거 설정
 logger = setup_logger("weather-server")
 
+# 추적 구간의 서비스 이름 (TRACE_EXPORT=file/otlp일 때 내보냄)
+configure_tracing("weather-server")
+
 # LLM Provider 설정
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq").lower()
 
 # GROQ 설정
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "your_groq_api_key_here")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama3-8b-8192")
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL") or None  # 로컬 대체 서버 사용 시 (예: http://localhost:9100)
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "60"))  # 호출당 최대 시간 (초)
 
 # Ollama 설정
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
@@ -32,11 +53,15 @@ OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3:8b")
 
 # Weather API 설정
 NWS_API_BASE = os.getenv("NWS_API_BASE", "https://api.weather.gov")
+USER_AGENT = "WeatherApp/1.0"
 
-# GROQ 클라이언트 초기화
+# 예보 단위 변환/번역을 로컬에서 처리할지 여부 (false면 예전처럼 LLM이 전체 번역)
+FORECAST_LOCALIZE_ENABLED = os.getenv("FORECAST_LOCALIZE_ENABLED", "true").lower() == "true"
+
+# GROQ 클라이언트 초기화 (비동기 클라이언트: LLM 호출 중에도 이벤트 루프가 다른 요청을 처리)
 groq_client = None
 if LLM_PROVIDER == "groq" and GROQ_API_KEY != "your_groq_api_key_here":
-    groq_client = groq.Groq(api_key=GROQ_API_KEY)
+    groq_client = groq.AsyncGroq(api_key=GROQ_API_KEY, base_url=GROQ_BASE_URL, timeout=GROQ_TIMEOUT)
 
 # Set encoding for proper character handling
 sys.stdout.reconfigure(encoding='utf-8')
@@ -44,11 +69,29 @@ sys.stderr.reconfigure(encoding='utf-8')
 
 logger.info("Weather API Server 시작 중...")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작/종료 시 공용 리소스를 생성하고 정리합니다."""
+    # 지명 사전과 지오코더 색인은 첫 질의 전에 미리 생성
+    get_geocoder()
+    open_translation_cache()
+    try:
+        async with nws_lifespan(USER_AGENT), alerts_lifespan(NWS_API_BASE):
+            yield
+    finally:
+        # 시작 실패나 취소로 빠져나와도 캐시와 LLM 클라이언트는 항상 정리
+        try:
+            close_translation_cache()
+        finally:
+            if groq_client is not None:
+                await groq_client.close()
+
 # Initialize FastAPI server
 app = FastAPI(
     title="Weather API Server",
     description="A weather API server with LLM integration",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -60,6 +103,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 라우트별 요청 수/지연 시간/진행 중 요청 수 (/metrics)
+app.add_middleware(MetricsMiddleware)
+
 # Constants
 # NWS_API_BASE = "https://api.weather.gov"
 # USER_AGENT = "weather-app/1.0"
@@ -73,84 +119,108 @@ class QueryRequest(BaseModel):
 class ForecastRequest(BaseModel):
     latitude: float
     longitude: float
+    translate: bool = False  # 한국어 번역/단위 변환 (문구표로 못 옮긴 문장만 LLM 호출)
+
+class BatchLocation(BaseModel):
+    # 일괄 예보는 번역하지 않으므로 좌표만 받음 (translate 등 다른 필드는 422)
+    model_config = ConfigDict(extra="forbid")
+
+    latitude: float
+    longitude: float
+
+class BatchForecastRequest(BaseModel):
+    locations: list[BatchLocation]
+    concurrency: int | None = Field(None, ge=1, le=batch_max_locations())
 
 class AlertsRequest(BaseModel):
     state: str
+    translate: bool = False  # 한국어 번역 (LLM 호출, 번역 결과 캐시 사용)
+
+class GeocodeRequest(BaseModel):
+    place: str
+    limit: int = 5
+
+class NearestPlaceRequest(BaseModel):
+    latitude: float
+    longitude: float
+    limit: int = 1
+
+class RouteRequest(BaseModel):
+    query: str
 
 class WeatherResponse(BaseModel):
     success: bool
     data: str
     error: str = None
 
-async def make_nws_request(url: str) -> dict[str, Any] | None:
-    """Make a request to the National Weather Service API"""
-    logger.debug(f"NWS API 호출: {url}")
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers={"User-Agent": "WeatherApp/1.0"})
-            logger.debug(f"NWS API 응답 상태: {response.status_code}")
-            response.raise_for_status()
-            result = response.json()
-            logger.debug("NWS API 응답 성공")
-            return result
-    except Exception as e:
-        logger.error(f"NWS API 오류: {e}")
-        return None
-
-async def call_groq(messages: list, is_translation: bool = False) -> dict:
-    """Call GROQ API using groq.Groq() client"""
-    logger.debug(f"GROQ API 호출 시작 - 모델: {GROQ_MODEL}")
-    logger.debug(f"메시지 개수: {len(messages)}")
-    logger.debug(f"번역 요청 여부: {is_translation}")
+async def stream_groq(messages: list, is_translation: bool = False) -> AsyncIterator[str]:
+    """Stream GROQ API tokens using groq.AsyncGroq() client"""
+    logger.debug("GROQ API 스트리밍 시작 - 모델: %s", GROQ_MODEL)
+    logger.debug("메시지 개수: %s", len(messages))
+    logger.debug("번역 요청 여부: %s", is_translation)
     
     if groq_client is None:
         logger.error("GROQ 클라이언트가 초기화되지 않았습니다. GROQ_API_KEY를 확인해주세요.")
         raise Exception("GROQ 클라이언트가 초기화되지 않았습니다. GROQ_API_KEY를 확인해주세요.")
     
-    logger.debug(f"GROQ 메시지: {json.dumps(messages, ensure_ascii=False, indent=2)}")
+    logger.debug("GROQ 메시지: %s", lazy_json(messages))
     
     try:
         # 번역 요청인 경우 더 많은 토큰 허용
         max_tokens = 1024 if is_translation else 128
         
-        # client.py와 동일한 방식으로 GROQ API 호출
-        response = groq_client.chat.completions.create(
-            model=GROQ_MODEL,
-            messages=messages,
-            temperature=0.0,
-            max_tokens=max_tokens,
-            top_p=0.9,
-            stop=["\n\n"] if not is_translation else None  # 번역 시에는 stop 토큰 제거
-        )
-        
-        logger.debug(f"GROQ API 응답 성공 (max_tokens: {max_tokens})")
-        logger.debug(f"GROQ API 응답: {response}")
+        # 동시 호출 수를 제한하고 (GROQ_MAX_CONCURRENCY, 대기열은 입장 제어), 호출 전체(대기 제외)에 타임아웃 적용
+        async with upstream_slot("groq"):
+            deadline = asyncio.get_running_loop().time() + GROQ_TIMEOUT
+            stream = await asyncio.wait_for(
+                groq_client.chat.completions.create(
+                    model=GROQ_MODEL,
+                    messages=messages,
+                    temperature=0.0,
+                    max_tokens=max_tokens,
+                    top_p=0.9,
+                    stop=["\n\n"] if not is_translation else None,  # 번역 시에는 stop 토큰 제거
+                    stream=True,
+                    extra_headers=trace_headers()
+                ),
+                timeout=GROQ_TIMEOUT
+            )
+            chunks = stream.__aiter__()
+            finish_reason = None
+            try:
+                while True:
+                    remaining = deadline - asyncio.get_running_loop().time()
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout=max(remaining, 0))
+                    except StopAsyncIteration:
+                        break
+                    if not chunk.choices:
+                        continue
+                    choice = chunk.choices[0]
+                    finish_reason = choice.finish_reason or finish_reason
+                    if choice.delta and choice.delta.content:
+                        yield choice.delta.content
+            finally:
+                await stream.close()
         
-        # 응답에서 content 추출
-        if response.choices and len(response.choices) > 0:
-            content = response.choices[0].message.content
-            finish_reason = response.choices[0].finish_reason
-            logger.debug(f"GROQ API 응답 내용: {content}")
-            logger.debug(f"GROQ API finish_reason: {finish_reason}")
-            
-            if finish_reason == 'length':
-                logger.warning("경고: 응답이 토큰 제한으로 잘렸습니다.")
-            
-            return {
-                "response": content.strip() if content else ""
-            }
-        else:
-            logger.error("GROQ API 응답에 content가 없습니다.")
-            raise Exception("GROQ API 응답에 content가 없습니다.")
+        logger.debug("GROQ API 스트리밍 완료 (max_tokens: %s, finish_reason: %s)", max_tokens, finish_reason)
+        if finish_reason == 'length':
+            logger.warning("경고: 응답이 토큰 제한으로 잘렸습니다.")
             
+    except asyncio.TimeoutError:
+        logger.error(f"GROQ API 타임아웃 ({GROQ_TIMEOUT}초)")
+        raise Exception(f"GROQ API error: timed out after {GROQ_TIMEOUT}s")
+    except AdmissionRejected:
+        # 대기열/슬롯 거절은 일반 오류로 바꾸지 않고 그대로 올려 503(Retry-After)로 응답
+        raise
     except Exception as e:
         logger.error(f"GROQ API 오류: {str(e)}")
         raise Exception(f"GROQ API error: {str(e)}")
 
-async def call_ollama(messages: list) -> dict:
-    """Call Ollama API"""
-    logger.debug(f"Ollama API 호출 시작 - 모델: {OLLAMA_MODEL}")
-    logger.debug(f"메시지 개수: {len(messages)}")
+async def stream_ollama(messages: list) -> AsyncIterator[str]:
+    """Stream Ollama API tokens"""
+    logger.debug("Ollama API 스트리밍 시작 - 모델: %s", OLLAMA_MODEL)
+    logger.debug("메시지 개수: %s", len(messages))
     
     # 메시지를 프롬프트로 변환
     prompt = ""
@@ -166,56 +236,107 @@ async def call_ollama(messages: list) -> dict:
     if len(prompt) > 4000:
         prompt = prompt[:4000] + "\n\n[Content truncated due to length]"
     
-    logger.debug(f"Ollama 프롬프트 길이: {len(prompt)}")
-    logger.debug(f"Ollama 프롬프트: {prompt[:200]}...")
+    logger.debug("Ollama 프롬프트 길이: %s", len(prompt))
+    logger.debug("Ollama 프롬프트: %s...", prompt[:200])
     
     payload = {
         "model": OLLAMA_MODEL,
         "prompt": prompt,
-        "stream": False,
+        "stream": True,
         "options": {
             "temperature": 0.1,
             "num_predict": 1024
         }
     }
     
-    logger.debug(f"Ollama API URL: {OLLAMA_URL}/api/generate")
-    logger.debug(f"Ollama API Payload: {json.dumps(payload, ensure_ascii=False, indent=2)}")
+    logger.debug("Ollama API URL: %s/api/generate", OLLAMA_URL)
+    logger.debug("Ollama API Payload: %s", lazy_json(payload))
     
-    async with httpx.AsyncClient(timeout=120.0) as client:
+    # 동시 호출 수를 제한 (ADMISSION_OLLAMA_CONCURRENCY, 넘치면 대기열에서 대기)
+    async with upstream_slot("ollama"), httpx.AsyncClient(timeout=120.0) as client:
         try:
-            headers = {
+            headers = trace_headers({
                 "Content-Type": "application/json"
-            }
-            response = await client.post(
+            })
+            async with client.stream(
+                "POST",
                 f"{OLLAMA_URL}/api/generate",
                 json=payload,
                 headers=headers
-            )
-            logger.debug(f"Ollama API 응답 상태: {response.status_code}")
-            
-            response.raise_for_status()
-            result = response.json()
-            #logger.debug(f"Ollama API 응답: {json.dumps(result, ensure_ascii=False, indent=2)}")
-            
-            if "response" in result:
-                logger.debug(f"Ollama API 응답 내용: {result['response'][:200]}...")
-            
-            return result
+            ) as response:
+                logger.debug("Ollama API 응답 상태: %s", response.status_code)
+                response.raise_for_status()
+                
+                # NDJSON: 한 줄에 토큰 하나, 마지막 줄은 done=true
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        raise Exception(chunk["error"])
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        logger.debug("Ollama API 스트리밍 완료 (토큰: %s)", chunk.get('eval_count'))
+                        break
         except Exception as e:
             logger.error(f"Ollama API 오류: {str(e)}")
             raise Exception(f"Ollama API error: {str(e)}")
 
-async def call_llm(messages: list, is_translation: bool = False) -> dict:
-    """Call the configured LLM provider"""
-    logger.debug(f"LLM 호출 시작 - Provider: {LLM_PROVIDER}, 번역: {is_translation}")
+async def stream_llm(messages: list, is_translation: bool = False) -> AsyncIterator[str]:
+    """Stream tokens from the configured LLM provider"""
+    logger.debug("LLM 호출 시작 - Provider: %s, 번역: %s", LLM_PROVIDER, is_translation)
     if LLM_PROVIDER == "groq":
-        return await call_groq(messages, is_translation)
+        tokens = stream_groq(messages, is_translation)
     elif LLM_PROVIDER == "ollama":
-        return await call_ollama(messages)
+        tokens = stream_ollama(messages)
     else:
         logger.error(f"지원하지 않는 LLM Provider: {LLM_PROVIDER}")
         raise Exception(f"지원하지 않는 LLM Provider: {LLM_PROVIDER}")
+    
+    # 응답 앞쪽 공백은 버림 (전체 응답을 strip() 하던 기존 동작과 동일)
+    call_started = time.perf_counter()
+    started = False
+    with trace_span(f"llm.{LLM_PROVIDER}", kind="client", translation=is_translation):
+        async for token in tokens:
+            if not started:
+                token = token.lstrip()
+                if not token:
+                    continue
+                started = True
+            yield token
+    # 끝까지 받은 호출만 평균 LLM 왕복 시간에 반영 (연결 종료 시 절약 시간 추정용)
+    record_llm_call((time.perf_counter() - call_started) * 1000)
+    LLM_SECONDS.observe_since(call_started)
+
+async def stream_translation(messages: list, ttl: float | None = None) -> AsyncIterator[str]:
+    """
+    번역 결과 캐시를 거쳐 LLM 번역 토큰을 내보냅니다.
+    같은 (제공자, 모델, 프롬프트, 내용)은 캐시된 결과를 한 번에 내보내고,
+    동시에 들어온 같은 번역은 하나의 LLM 호출을 기다립니다.
+
+    Args:
+        messages: [system, user] 번역 요청 메시지
+        ttl: 결과 유효 기간 (초, 원본 예보의 남은 유효 기간. None이면 기본값)
+    """
+    cache = get_translation_cache()
+    if cache is None:
+        async for token in stream_llm(messages, is_translation=True):
+            yield token
+        return
+
+    model = GROQ_MODEL if LLM_PROVIDER == "groq" else OLLAMA_MODEL
+    key = cache.make_key(LLM_PROVIDER, model, messages[0]["content"], messages[-1]["content"])
+    async for token in cache.stream(key, lambda: stream_llm(messages, is_translation=True), ttl):
+        yield token
+
+def overloaded_error(e: AdmissionRejected) -> HTTPException:
+    """입장 제어 거절을 503 Service Unavailable + Retry-After 응답으로 변환합니다."""
+    return HTTPException(
+        status_code=503,
+        detail=f"서버가 혼잡합니다 ({e}). {e.retry_after}초 후 다시 시도해주세요.",
+        headers={"Retry-After": str(e.retry_after)}
+    )
 
 def format_alert(feature: dict) -> str:
     """Format an alert feature into a readable string."""
@@ -228,6 +349,64 @@ Description: {props.get('description', 'No description available')}
 Instructions: {props.get('instruction', 'No specific instructions provided')}
 """
 
+# 날씨 정보(예보/경보) 번역 프롬프트 (번역 결과 캐시 키에 포함되므로 바꾸면 기존 캐시가 무효화됨)
+WEATHER_TRANSLATION_PROMPT = """
+당신은 도움이 되는 어시스턴트입니다.
+다음 날씨 정보를 한국어로 번역하고, 단위를 한국에서 사용하는 단위로 변경해주세요:
+
+1. 화씨(°F) → 섭씨(°C)로 변환
+2. 마일(mph) → 킬로미터(km/h)로 변환
+3. 모든 텍스트를 자연스러운 한국어로 번역
+4. 날씨 상태를 한국어로 표현 (예: sunny → 맑음, cloudy → 흐림)
+
+답변은 반드시 한국어로만 작성해주세요.
+"""
+
+def build_weather_translation_messages(weather_data: str) -> list[dict[str, str]]:
+    """날씨 정보 전체를 LLM으로 번역할 [system, user] 메시지"""
+    return [
+        {
+            "role": "system",
+            "content": WEATHER_TRANSLATION_PROMPT
+        },
+        {
+            "role": "user",
+            "content": f"다음 날씨 정보를 한국어로 번역하고 단위를 변환해주세요:\n\n{weather_data}"
+        }
+    ]
+
+async def translate_weather_data(weather_data: str, ttl: float | None = None) -> str:
+    """
+    구조화 엔드포인트(/api/get_forecast, /api/get_alerts)의 translate=true 응답을 한국어로 번역합니다.
+    LLM 호출에 실패하면 원문을 그대로 반환합니다.
+    """
+    try:
+        messages = build_weather_translation_messages(weather_data)
+        translated = "".join([token async for token in stream_translation(messages, ttl)]).strip()
+    except Exception as e:
+        logger.warning(f"날씨 정보 번역 실패 - 원문 반환: {e}")
+        return weather_data
+    return translated or weather_data
+
+async def translate_forecast(periods: list[dict], ttl: float | None = None) -> str:
+    """
+    예보를 한국어로 현지화합니다 (FORECAST_LOCALIZE_ENABLED이면 문구표로 못 옮긴 문장만 LLM 번역).
+    LLM 호출에 실패한 문장은 원문을 유지합니다.
+    """
+    if not FORECAST_LOCALIZE_ENABLED:
+        return await translate_weather_data(format_forecast(periods), ttl)
+
+    localized = localize_forecast(periods)
+    translations = {}
+    if localized.pending:
+        try:
+            messages = build_translation_messages(localized.pending)
+            translated = "".join([token async for token in stream_translation(messages, ttl)])
+            translations = parse_translations(translated, localized.pending)
+        except Exception as e:
+            logger.warning(f"예보 문장 번역 실패 - 원문 유지: {e}")
+    return localized.render(translations).strip()
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -244,11 +423,107 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "llm_provider": LLM_PROVIDER}
 
+@app.get("/api/stats")
+async def get_stats():
+    """NWS 캐시 통계 (hit/miss/revalidate) 및 동시 요청 병합 통계"""
+    return {
+        "nws_response_cache": get_nws_client().stats(),
+        "nws_singleflight": get_nws_client().flight_stats(),
+        "points_cache": get_points_cache().stats(),
+        "grid_index": get_grid_index().stats(),
+        "forecast_localizer": get_localizer_stats(),
+        "translation_cache": get_translation_cache().stats() if get_translation_cache() else None,
+        "query_streams": get_stream_stats(),
+        "admission": get_admission_controller().stats(),
+        "alerts_ingester": get_alerts_ingester().stats() if get_alerts_ingester() else None
+    }
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """적중률을 내보낼 캐시별 통계 (번역 캐시는 메모리+디스크 적중)"""
+    translation = get_translation_cache().stats() if get_translation_cache() else {}
+    return {
+        "nws_response": get_nws_client().stats(),
+        "points": get_points_cache().stats(),
+        "grid_index": get_grid_index().stats(),
+        "translation": {
+            "hits": translation.get("hits", 0) + translation.get("disk_hits", 0),
+            "misses": translation.get("misses", 0),
+        },
+    }
+
+def cache_hit_ratios() -> list[tuple[tuple[str], float]]:
+    ratios = []
+    for name, stats in cache_stats().items():
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        ratios.append(((name,), stats.get("hits", 0) / lookups if lookups else 0.0))
+    return ratios
+
+# 다른 모듈이 이미 세고 있는 값은 /metrics 수집 시점에 읽음 (요청 처리 경로에는 추가 비용 없음)
+CallbackMetric(
+    "weather_cache_hits_total", "Cache hits by cache.", "counter", ("cache",),
+    lambda: [((name,), stats.get("hits", 0)) for name, stats in cache_stats().items()],
+)
+CallbackMetric(
+    "weather_cache_misses_total", "Cache misses by cache.", "counter", ("cache",),
+    lambda: [((name,), stats.get("misses", 0)) for name, stats in cache_stats().items()],
+)
+CallbackMetric(
+    "weather_cache_hit_ratio", "Cache hit ratio since start by cache.", "gauge", ("cache",),
+    cache_hit_ratios,
+)
+CallbackMetric(
+    "weather_nws_singleflight_total", "NWS fetches executed or coalesced into an in-flight fetch.", "counter", ("result",),
+    lambda: [
+        (("executed",), get_nws_client().flight_stats()["executions"]),
+        (("coalesced",), get_nws_client().flight_stats()["coalesced"]),
+    ],
+)
+CallbackMetric(
+    "weather_upstream_calls_in_flight", "Upstream calls currently holding a slot.", "gauge", ("upstream",),
+    lambda: [((name,), stats["active"]) for name, stats in get_admission_controller().stats().items()],
+)
+CallbackMetric(
+    "weather_upstream_queue_length", "Upstream calls waiting for a slot.", "gauge", ("upstream",),
+    lambda: [((name,), stats["queued"]) for name, stats in get_admission_controller().stats().items()],
+)
+CallbackMetric(
+    "weather_admission_rejected_total", "Queries or calls rejected by admission control.", "counter", ("upstream",),
+    lambda: [
+        ((name,), stats["rejected"] + stats["wait_timeouts"])
+        for name, stats in get_admission_controller().stats().items()
+    ],
+)
+CallbackMetric(
+    "weather_query_streams_total", "Finished /api/query streams by outcome.", "counter", ("outcome",),
+    lambda: [((outcome,), get_stream_stats()[outcome]) for outcome in ("completed", "cancelled")],
+)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 텍스트 형식 메트릭 (요청 수, 라우트/단계별 지연 시간 히스토그램, 캐시 적중률, 진행 중 요청 수)"""
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
+
 @app.post("/api/query")
-async def process_query(request: QueryRequest):
+async def process_query(request: QueryRequest, http_request: Request):
     """Process a query using configured LLM and weather tools"""
     logger.info(f"쿼리 처리 시작: {request.query}")
-    logger.debug(f"LLM Provider: {LLM_PROVIDER}")
+    logger.debug("LLM Provider: %s", LLM_PROVIDER)
+    timer = QueryTimer()
+    # 브리지가 보낸 traceparent를 이어받는 질의 구간 (NWS/LLM 호출 구간의 부모)
+    query_span = start_span("POST /api/query", headers=http_request.headers, kind="server", query=request.query)
+    
+    # 날씨 관련 키워드 감지 (사용할 업스트림 결정)
+    weather_keywords = ["weather", "forecast", "temperature", "날씨", "예보", "기온"]
+    query_lower = request.query.lower()
+    is_weather_query = any(keyword in query_lower for keyword in weather_keywords)
+    
+    # 사용할 업스트림(NWS, LLM)의 대기열이 가득 찼거나 대기 시간이 기한을 넘으면 스트림을 시작하지 않고 거절
+    try:
+        ticket = get_admission_controller().admit(["nws", LLM_PROVIDER] if is_weather_query else [LLM_PROVIDER])
+    except AdmissionRejected as e:
+        logger.warning(f"쿼리 거절 - {e} (Retry-After: {e.retry_after}초)")
+        query_span.end(e)
+        raise overloaded_error(e)
     
     async def generate_response() -> AsyncGenerator[str, None]:
         try:
@@ -256,68 +531,43 @@ async def process_query(request: QueryRequest):
             yield f"data: {json.dumps({'type': 'status', 'message': f'쿼리를 처리하고 있습니다... (LLM: {LLM_PROVIDER})'})}\n\n"
             
             # 2. 날씨 관련 키워드 감지
-            weather_keywords = ["weather", "forecast", "temperature", "날씨", "예보", "기온"]
-            query_lower = request.query.lower()
-            
-            logger.debug(f"날씨 키워드 검사: {weather_keywords}")
-            logger.debug(f"쿼리 (소문자): {query_lower}")
+            logger.debug("날씨 키워드 검사: %s", weather_keywords)
+            logger.debug("쿼리 (소문자): %s", query_lower)
             
             weather_data = None
-            if any(keyword in query_lower for keyword in weather_keywords):
+            localized = None  # 로컬에서 현지화한 예보 (있으면 LLM 전체 번역을 생략)
+            source_ttl = None  # 번역 결과 캐시 유효 기간 (원본 예보의 남은 유효 기간)
+            if is_weather_query:
                 logger.debug("날씨 관련 쿼리 감지됨")
                 yield f"data: {json.dumps({'type': 'status', 'message': '날씨 정보를 가져오고 있습니다...'})}\n\n"
                 
-                # 위치에 따른 도구 선택
-                tool_name = None
-                tool_args = {}
+                # 질의에 언급된 지명으로 도구 선택 (지명이 없으면 LA 예보)
+                routing_started = time.perf_counter()
+                with trace_span("routing"):
+                    tool_name, tool_args = route_query(request.query)
+                ROUTING_SECONDS.observe_since(routing_started)
                 
-                if any(location in query_lower for location in ["los angeles", "la", "캘리포니아", "california"]):
-                    tool_name = "get_forecast"
-                    tool_args = {"latitude": 34.0522, "longitude": -118.2437}
-                elif any(location in query_lower for location in ["new york", "뉴욕", "ny"]):
-                    tool_name = "get_forecast"
-                    tool_args = {"latitude": 40.7128, "longitude": -74.0060}
-                elif any(location in query_lower for location in ["texas", "텍사스", "tx"]):
-                    tool_name = "get_alerts"
-                    tool_args = {"state": "TX"}
-                elif any(location in query_lower for location in ["california", "캘리포니아", "ca"]):
-                    tool_name = "get_alerts"
-                    tool_args = {"state": "CA"}
-                else:
-                    # 기본적으로 LA 날씨 제공
-                    tool_name = "get_forecast"
-                    tool_args = {"latitude": 34.0522, "longitude": -118.2437}
-                
-                logger.debug(f"선택된 도구: {tool_name}")
-                logger.debug(f"도구 인수: {tool_args}")
+                logger.debug("선택된 도구: %s", tool_name)
+                logger.debug("도구 인수: %s", tool_args)
                 
                 # 3. 날씨 API 호출
                 if tool_name == "get_forecast":
                     logger.debug("예보 API 호출 시작")
-                    points_url = f"{NWS_API_BASE}/points/{tool_args['latitude']},{tool_args['longitude']}"
-                    points_data = await make_nws_request(points_url)
+                    points_data = await fetch_points(tool_args['latitude'], tool_args['longitude'], NWS_API_BASE)
                     
                     if points_data:
                         logger.debug("Points API 응답 성공")
-                        forecast_url = points_data["properties"]["forecast"]
-                        logger.debug(f"Forecast URL: {forecast_url}")
-                        forecast_data = await make_nws_request(forecast_url)
+                        logger.debug("Forecast URL: %s", points_data['properties']['forecast'])
+                        forecast_data = await fetch_forecast(points_data)
+                        source_ttl = get_nws_client().fresh_for(points_data['properties']['forecast'])
                         
-                        if forecast_data:
+                        if forecast_data and FORECAST_LOCALIZE_ENABLED:
+                            logger.debug("Forecast API 응답 성공 - 로컬 단위 변환/번역")
+                            localized = localize_forecast(forecast_data["properties"]["periods"])
+                        elif forecast_data:
                             logger.debug("Forecast API 응답 성공")
-                            periods = forecast_data["properties"]["periods"]
-                            forecasts = []
-                            for period in periods[:5]:
-                                forecast = f"""
-{period['name']}:
-Temperature: {period['temperature']}°{period['temperatureUnit']}
-Wind: {period['windSpeed']} {period['windDirection']}
-Forecast: {period['detailedForecast']}
-"""
-                                forecasts.append(forecast)
-                            
-                            weather_data = "\n---\n".join(forecasts)
-                            logger.debug(f"날씨 데이터 생성 완료 (길이: {len(weather_data)})")
+                            weather_data = format_forecast(forecast_data["properties"]["periods"])
+                            logger.debug("날씨 데이터 생성 완료 (길이: %s)", len(weather_data))
                         else:
                             weather_data = "날씨 데이터를 가져올 수 없습니다."
                             logger.error("Forecast API 실패")
@@ -327,14 +577,13 @@ Forecast: {period['detailedForecast']}
                         
                 elif tool_name == "get_alerts":
                     logger.debug("경보 API 호출 시작")
-                    url = f"{NWS_API_BASE}/alerts/active/area/{tool_args['state']}"
-                    data = await make_nws_request(url)
+                    data = await fetch_state_alerts(tool_args['state'], NWS_API_BASE)
                     
                     if data and "features" in data:
                         if data["features"]:
                             alerts = [format_alert(feature) for feature in data["features"]]
                             weather_data = "\n---\n".join(alerts)
-                            logger.debug(f"경보 데이터 생성 완료 (경보 수: {len(data['features'])})")
+                            logger.debug("경보 데이터 생성 완료 (경보 수: %s)", len(data['features']))
                         else:
                             weather_data = "이 지역에 활성화된 경보가 없습니다."
                             logger.debug("활성 경보 없음")
@@ -342,36 +591,32 @@ Forecast: {period['detailedForecast']}
                         weather_data = "경보 데이터를 가져올 수 없습니다."
                         logger.error("경보 API 실패")
             
+            # 4-a. 로컬에서 현지화한 예보: 문구표로 번역하지 못한 문장만 LLM으로 번역
+            if localized is not None:
+                translations = {}
+                if localized.pending:
+                    yield f"data: {json.dumps({'type': 'status', 'message': f'{LLM_PROVIDER.upper()} 모델로 {len(localized.pending)}개 문장을 번역하고 있습니다...'})}\n\n"
+                    messages = build_translation_messages(localized.pending)
+                    with timer.stage("llm"):
+                        translated = "".join([token async for token in stream_translation(messages, source_ttl)])
+                    translations = parse_translations(translated, localized.pending)
+                    logger.debug("LLM 문장 번역 완료: %s/%s", len(translations), len(localized.pending))
+                
+                response_text = localized.render(translations).strip()
+                yield f"data: {json.dumps({'type': 'delta', 'content': response_text})}\n\n"
+                yield f"data: {json.dumps({'type': 'result', 'content': response_text, 'timings': query_span.summary()})}\n\n"
+                return
+            
             # 4. LLM을 한 번만 호출하여 날씨 정보와 번역을 함께 처리
             yield f"data: {json.dumps({'type': 'status', 'message': f'{LLM_PROVIDER.upper()} 모델을 호출하고 있습니다...'})}\n\n"
             
             if weather_data:
                 # 날씨 정보가 있는 경우: 날씨 정보와 번역을 함께 처리
-                system_message = f"""
-당신은 도움이 되는 어시스턴트입니다.
-다음 날씨 정보를 한국어로 번역하고, 단위를 한국에서 사용하는 단위로 변경해주세요:
-
-1. 화씨(°F) → 섭씨(°C)로 변환
-2. 마일(mph) → 킬로미터(km/h)로 변환
-3. 모든 텍스트를 자연스러운 한국어로 번역
-4. 날씨 상태를 한국어로 표현 (예: sunny → 맑음, cloudy → 흐림)
-
-답변은 반드시 한국어로만 작성해주세요.
-"""
-                
-                messages = [
-                    {
-                        "role": "system",
-                        "content": system_message
-                    },
-                    {
-                        "role": "user",
-                        "content": f"다음 날씨 정보를 한국어로 번역하고 단위를 변환해주세요:\n\n{weather_data}"
-                    }
-                ]
+                system_message = WEATHER_TRANSLATION_PROMPT
+                messages = build_weather_translation_messages(weather_data)
                 
                 logger.debug("날씨 정보와 번역을 함께 처리")
-                logger.debug(f"번역할 데이터 길이: {len(weather_data)}")
+                logger.debug("번역할 데이터 길이: %s", len(weather_data))
                 
             else:
                 # 날씨 정보가 없는 경우: 일반 쿼리 처리
@@ -395,29 +640,55 @@ When asked about weather, I will automatically call the appropriate weather tool
                 
                 logger.debug("일반 쿼리 처리")
 
-            logger.debug(f"시스템 메시지: {system_message}")
-            logger.debug(f"사용자 메시지: {request.query if not weather_data else '날씨 정보 번역 요청'}")
+            logger.debug("시스템 메시지: %s", system_message)
+            logger.debug("사용자 메시지: %s", request.query if not weather_data else '날씨 정보 번역 요청')
 
-            # LLM 호출 (번역이 필요한 경우 is_translation=True)
-            response = await call_llm(messages, is_translation=bool(weather_data))
+            # LLM 호출 (번역은 번역 결과 캐시를 거침)
+            # 토큰이 도착하는 대로 delta 이벤트로 전달
+            if weather_data:
+                tokens = stream_translation(messages, source_ttl)
+            else:
+                tokens = stream_llm(messages)
+            response_parts = []
+            with timer.stage("llm"):
+                async for token in tokens:
+                    response_parts.append(token)
+                    yield f"data: {json.dumps({'type': 'delta', 'content': token})}\n\n"
             
-            if "response" not in response:
-                logger.error(f"LLM 응답에 'response' 키가 없음: {response}")
-                yield f"data: {json.dumps({'type': 'error', 'message': 'LLM 응답을 받을 수 없습니다.'})}\n\n"
+            response_text = "".join(response_parts).rstrip()
+            if not response_text:
+                logger.error("LLM 응답이 비어 있음")
+                yield f"data: {json.dumps({'type': 'error', 'message': 'LLM 응답을 받을 수 없습니다.', 'timings': query_span.summary()})}\n\n"
                 return
-
-            response_text = response["response"]
-            logger.debug(f"LLM 응답: {response_text}")
+            logger.debug("LLM 응답: %s", response_text)
             
-            # 5. 최종 결과 반환
-            yield f"data: {json.dumps({'type': 'result', 'content': response_text})}\n\n"
+            # 5. 최종 결과 반환 (delta를 처리하지 않는 클라이언트를 위해 전체 응답 포함)
+            yield f"data: {json.dumps({'type': 'result', 'content': response_text, 'timings': query_span.summary()})}\n\n"
                 
+        except AdmissionRejected as e:
+            # 스트림이 이미 시작되어 HTTP 상태를 바꿀 수 없으므로 503과 Retry-After를 error 이벤트로 전달 (거절된 호출은 업스트림에 보내지 않음)
+            logger.warning(f"쿼리 처리 중 업스트림 거절 - {e} (Retry-After: {e.retry_after}초)")
+            yield f"data: {json.dumps({'type': 'error', 'message': overloaded_error(e).detail, 'status': 503, 'retry_after': e.retry_after, 'timings': query_span.summary()})}\n\n"
         except Exception as e:
             logger.error(f"쿼리 처리 중 오류: {e}")
-            yield f"data: {json.dumps({'type': 'error', 'message': f'오류가 발생했습니다: {str(e)}'})}\n\n"
+            yield f"data: {json.dumps({'type': 'error', 'message': f'오류가 발생했습니다: {str(e)}', 'timings': query_span.summary()})}\n\n"
+        finally:
+            ticket.release()
+    
+    async def traced_response() -> AsyncGenerator[str, None]:
+        # 응답 생성 전체를 질의 구간 안에서 실행
+        with use_span(query_span):
+            async for event in generate_response():
+                yield event
     
+    def close_query() -> None:
+        # 응답 생성이 시작되기 전에 연결이 끊긴 경우에도 티켓과 구간을 정리
+        ticket.release()
+        query_span.end()
+    
+    # 클라이언트 연결이 끊기면 진행 중인 NWS/LLM 호출을 취소하고, 유휴 시 heartbeat 전송
     return StreamingResponse(
-        generate_response(),
+        guard_stream(traced_response(), http_request.receive, timer, on_close=close_query),
         media_type="text/plain",
         headers={
             "Cache-Control": "no-cache",
@@ -436,8 +707,7 @@ async def get_forecast(request: ForecastRequest):
     logger.info(f"날씨 예보 요청: lat={request.latitude}, lon={request.longitude}")
     try:
         # First get the forecast grid endpoint
-        points_url = f"{NWS_API_BASE}/points/{request.latitude},{request.longitude}"
-        points_data = await make_nws_request(points_url)
+        points_data = await fetch_points(request.latitude, request.longitude, NWS_API_BASE)
 
         if not points_data:
             logger.error(f"위치에 대한 예보 데이터를 가져올 수 없음: {request.latitude}, {request.longitude}")
@@ -447,9 +717,8 @@ async def get_forecast(request: ForecastRequest):
                 error="Unable to fetch forecast data for this location."
             )
 
-        # Get the forecast URL from the points response
-        forecast_url = points_data["properties"]["forecast"]
-        forecast_data = await make_nws_request(forecast_url)
+        # Get the forecast from the points response
+        forecast_data = await fetch_forecast(points_data)
 
         if not forecast_data:
             logger.error("상세 예보를 가져올 수 없음")
@@ -461,17 +730,12 @@ async def get_forecast(request: ForecastRequest):
 
         # Format the periods into a readable forecast
         periods = forecast_data["properties"]["periods"]
-        forecasts = []
-        for period in periods[:5]:  # Only show next 5 periods
-            forecast = f"""
-{period['name']}:
-Temperature: {period['temperature']}°{period['temperatureUnit']}
-Wind: {period['windSpeed']} {period['windDirection']}
-Forecast: {period['detailedForecast']}
-"""
-            forecasts.append(forecast)
-
-        result = "\n---\n".join(forecasts)
+        if request.translate:
+            # 번역 결과는 원본 예보의 남은 유효 기간 동안 캐시
+            ttl = get_nws_client().fresh_for(points_data["properties"]["forecast"])
+            result = await translate_forecast(periods, ttl)
+        else:
+            result = format_forecast(periods)
         logger.info("날씨 예보 생성 완료")
         
         return WeatherResponse(
@@ -479,6 +743,9 @@ Forecast: {period['detailedForecast']}
             data=result
         )
         
+    except AdmissionRejected as e:
+        logger.warning(f"예보 요청 거절 - {e} (Retry-After: {e.retry_after}초)")
+        raise overloaded_error(e)
     except Exception as e:
         logger.error(f"예보 요청 처리 중 오류: {str(e)}")
         return WeatherResponse(
@@ -487,6 +754,32 @@ Forecast: {period['detailedForecast']}
             error=f"Error processing forecast request: {str(e)}"
         )
 
+@app.post("/api/get_forecast_batch")
+async def get_forecast_batch(request: BatchForecastRequest):
+    """Get weather forecasts for many locations, streamed as NDJSON.
+
+    Args:
+        request: BatchForecastRequest with a list of locations
+    """
+    logger.info(f"일괄 예보 요청: {len(request.locations)}개 좌표")
+    if not request.locations:
+        raise HTTPException(status_code=400, detail="locations must not be empty.")
+    # 스트리밍을 시작한 뒤에는 오류 상태를 보낼 수 없으므로 먼저 검사
+    error = validate_batch(len(request.locations), request.concurrency)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    async def generate_results() -> AsyncGenerator[str, None]:
+        locations = [(location.latitude, location.longitude) for location in request.locations]
+        async for result in iter_forecast_batch(locations, NWS_API_BASE, request.concurrency):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(
+        generate_results(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache"}
+    )
+
 @app.post("/api/get_alerts", response_model=WeatherResponse)
 async def get_alerts(request: AlertsRequest):
     """Get weather alerts for a US state.
@@ -496,8 +789,7 @@ async def get_alerts(request: AlertsRequest):
     """
     logger.info(f"날씨 경보 요청: state={request.state}")
     try:
-        url = f"{NWS_API_BASE}/alerts/active/area/{request.state}"
-        data = await make_nws_request(url)
+        data = await fetch_state_alerts(request.state, NWS_API_BASE)
 
         if not data or "features" not in data:
             logger.error(f"경보를 가져올 수 없거나 경보가 없음: {request.state}")
@@ -511,11 +803,13 @@ async def get_alerts(request: AlertsRequest):
             logger.info(f"활성 경보 없음: {request.state}")
             return WeatherResponse(
                 success=True,
-                data="No active alerts for this state."
+                data="이 지역에 활성화된 경보가 없습니다." if request.translate else "No active alerts for this state."
             )
 
         alerts = [format_alert(feature) for feature in data["features"]]
         result = "\n---\n".join(alerts)
+        if request.translate:
+            result = await translate_weather_data(result)
         logger.info(f"경보 생성 완료: {len(data['features'])}개 경보")
         
         return WeatherResponse(
@@ -523,6 +817,9 @@ async def get_alerts(request: AlertsRequest):
             data=result
         )
         
+    except AdmissionRejected as e:
+        logger.warning(f"경보 요청 거절 - {e} (Retry-After: {e.retry_after}초)")
+        raise overloaded_error(e)
     except Exception as e:
         logger.error(f"경보 요청 처리 중 오류: {str(e)}")
         return WeatherResponse(
@@ -531,6 +828,38 @@ async def get_alerts(request: AlertsRequest):
             error=f"Error processing alerts request: {str(e)}"
         )
 
+@app.post("/api/geocode")
+async def geocode(request: GeocodeRequest):
+    """Find coordinates for a US city or state name (offline, typos allowed).
+
+    Args:
+        request: GeocodeRequest with place name
+    """
+    matches = lookup_place(request.place, request.limit)
+    logger.debug("지오코딩 요청: %s -> %s개 결과", request.place, len(matches))
+    return {"matches": [match.to_dict() for match in matches]}
+
+@app.post("/api/nearest_place")
+async def nearest_place(request: NearestPlaceRequest):
+    """Find the known US cities nearest to a location.
+
+    Args:
+        request: NearestPlaceRequest with latitude and longitude
+    """
+    matches = find_nearest_place(request.latitude, request.longitude, request.limit)
+    return {"matches": [match.to_dict() for match in matches]}
+
+@app.post("/api/route")
+async def route(request: RouteRequest):
+    """Choose the weather tool and arguments for a natural language query (offline, no LLM).
+
+    Args:
+        request: RouteRequest with the query
+    """
+    tool_name, tool_args = route_query(request.query)
+    logger.debug("질의 라우팅: %s -> %s %s", request.query, tool_name, tool_args)
+    return {"tool": tool_name, "arguments": tool_args}
+
 @app.get("/api/tools")
 async def list_tools():
     """List available tools"""
@@ -543,21 +872,82 @@ async def list_tools():
                     "type": "object",
                     "properties": {
                         "latitude": {"type": "number", "description": "Latitude of the location"},
-                        "longitude": {"type": "number", "description": "Longitude of the location"}
+                        "longitude": {"type": "number", "description": "Longitude of the location"},
+                        "translate": {"type": "boolean", "default": False, "description": "Translate the forecast into Korean with metric units"}
                     },
                     "required": ["latitude", "longitude"]
                 }
             },
+            {
+                "name": "get_forecast_batch",
+                "description": "Get weather forecasts for many locations (NDJSON stream)",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "locations": {
+                            "type": "array",
+                            "description": "List of locations",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "latitude": {"type": "number", "description": "Latitude of the location"},
+                                    "longitude": {"type": "number", "description": "Longitude of the location"}
+                                },
+                                "required": ["latitude", "longitude"]
+                            }
+                        },
+                        "concurrency": {"type": "integer", "minimum": 1, "maximum": batch_max_locations(), "description": "Maximum concurrent NWS requests"}
+                    },
+                    "required": ["locations"]
+                }
+            },
             {
                 "name": "get_alerts",
                 "description": "Get weather alerts for a US state",
                 "parameters": {
                     "type": "object",
                     "properties": {
-                        "state": {"type": "string", "description": "Two-letter US state code (e.g. CA, NY)"}
+                        "state": {"type": "string", "description": "Two-letter US state code (e.g. CA, NY)"},
+                        "translate": {"type": "boolean", "default": False, "description": "Translate the alerts into Korean"}
                     },
                     "required": ["state"]
                 }
+            },
+            {
+                "name": "geocode",
+                "description": "Find coordinates for a US city or state name (offline, typos allowed)",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "place": {"type": "string", "description": "Place name in English or Korean"},
+                        "limit": {"type": "integer", "description": "Maximum number of results"}
+                    },
+                    "required": ["place"]
+                }
+            },
+            {
+                "name": "nearest_place",
+                "description": "Find the known US cities nearest to a location",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "latitude": {"type": "number", "description": "Latitude of the location"},
+                        "longitude": {"type": "number", "description": "Longitude of the location"},
+                        "limit": {"type": "integer", "description": "Maximum number of results"}
+                    },
+                    "required": ["latitude", "longitude"]
+                }
+            },
+            {
+                "name": "route_weather_query",
+                "description": "Choose the weather tool and arguments for a natural language query (offline, no LLM)",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "Natural language weather query (Korean or English)"}
+                    },
+                    "required": ["query"]
+                }
             }
         ]
     }
@@ -568,6 +958,10 @@ if __name__ == "__main__":
         "server_app:app",
         host="0.0.0.0",
         port=8000,
+        # 같은 호스트의 브리지가 TCP 대신 Unix 소켓으로 연결하도록 (지정하면 TCP 포트는 열지 않음)
+        uds=os.getenv("SERVER_UDS") or None,
+        # 브리지의 keep-alive 연결이 도구 호출 사이에 끊기지 않도록 유휴 연결 유지 시간을 늘림
+        timeout_keep_alive=int(os.getenv("SERVER_KEEPALIVE_TIMEOUT", "75")),
         reload=True,
         log_level="debug"
     ) 
\ No newline at end of file
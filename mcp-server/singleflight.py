@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Single-flight 요청 병합 모듈
+같은 키로 동시에 들어온 요청은 진행 중인 하나의 작업 결과를 함께 기다립니다.
+"""
+
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable
+
+# 누적 병합 횟수를 보관할 최대 키 수 (초과 시 상위 키만 유지)
+MAX_TRACKED_KEYS = 1000
+
+class _Call:
+    """진행 중인 작업과 그 결과를 기다리는 호출자 수"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """키별로 진행 중인 작업을 하나로 합치는 asyncio 헬퍼"""
+
+    def __init__(self):
+        self._calls: dict[str, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.coalesced_by_key: Counter = Counter()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key에 대해 진행 중인 작업이 있으면 그 결과를 기다리고, 없으면 fn을 실행합니다.
+
+        작업은 별도 태스크로 실행되므로 한 호출자가 취소되어도 다른 호출자에게 영향이 없으며,
+        마지막 호출자까지 취소되면 작업도 취소됩니다.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task, key=key, call=call: self._finish(key, call))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+            self.coalesced_by_key[key] += 1
+            if len(self.coalesced_by_key) > MAX_TRACKED_KEYS:
+                self.coalesced_by_key = Counter(dict(self.coalesced_by_key.most_common(MAX_TRACKED_KEYS // 2)))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            # 결과를 기다리는 호출자가 더 없으면 작업도 취소
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _finish(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self, top: int = 10) -> dict[str, Any]:
+        """병합 통계와 키별 대기자 수를 반환합니다."""
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": {key: call.waiters for key, call in self._calls.items()},
+            "top_coalesced": dict(self.coalesced_by_key.most_common(top)),
+        }
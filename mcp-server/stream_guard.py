@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+SSE 질의 스트림 연결 관리 모듈
+응답 이벤트를 별도 태스크에서 만들고, 클라이언트 연결이 끊기면 진행 중인 NWS/LLM 호출을 취소합니다.
+이벤트가 한동안 없으면 SSE 주석(heartbeat)을 보내 프록시가 연결을 끊지 않도록 하고,
+끊긴 연결도 다음 전송에서 바로 드러나게 합니다.
+"""
+
+import os
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+from logger_config import setup_logger
+from query_timing import QueryTimer
+from metrics import SSE_FIRST_BYTE_SECONDS
+
+# 로거 설정
+logger = setup_logger("stream-guard")
+
+HEARTBEAT_COMMENT = ": keep-alive\n\n"
+
+# 프로세스 전체 스트림 통계
+_stream_stats = {
+    "completed": 0,
+    "cancelled": 0,
+    "heartbeats": 0,
+    "saved_llm_seconds": 0.0,
+}
+
+_DONE = object()
+
+def heartbeat_interval() -> float:
+    """heartbeat 간격 (초, SSE_HEARTBEAT_INTERVAL, 0 이하이면 보내지 않음)"""
+    return float(os.getenv("SSE_HEARTBEAT_INTERVAL", "15"))
+
+async def guard_stream(
+    events: AsyncIterator[str],
+    receive: Callable[[], Awaitable[dict[str, Any]]],
+    timer: Optional[QueryTimer] = None,
+    on_close: Optional[Callable[[], None]] = None,
+) -> AsyncIterator[str]:
+    """
+    events를 별도 태스크에서 실행하며 그대로 내보내고, 클라이언트 연결이 끊기면 태스크를 취소합니다.
+
+    Args:
+        events: SSE 이벤트 문자열을 내보내는 비동기 이터레이터
+        receive: ASGI receive (http.disconnect 감지용)
+        timer: 질의 단계 타이머 (취소 시 아낀 LLM 시간 추정용)
+        on_close: 스트림이 끝나거나 중단될 때 호출할 함수 (예: 입장 제어 티켓 반환)
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        try:
+            async for event in events:
+                queue.put_nowait(event)
+        finally:
+            queue.put_nowait(_DONE)
+
+    producer = asyncio.create_task(produce())
+    cancelled = False
+
+    def cancel(reason: str) -> None:
+        nonlocal cancelled
+        if producer.done() or cancelled:
+            return
+        cancelled = True
+        producer.cancel()
+        saved = timer.remaining_llm_ms() / 1000 if timer is not None else 0.0
+        _stream_stats["cancelled"] += 1
+        _stream_stats["saved_llm_seconds"] += saved
+        logger.info(f"{reason} - 진행 중인 NWS/LLM 호출 취소 (추정 절약 LLM 시간: {saved:.1f}초)")
+
+    async def watch_disconnect() -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                # 응답 전송이 멈춰 있어도 바로 취소되도록 여기서 직접 취소
+                cancel("클라이언트 연결 종료")
+                return
+
+    watcher = asyncio.create_task(watch_disconnect())
+    interval = heartbeat_interval()
+    first = True
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=interval if interval > 0 else None)
+            except asyncio.TimeoutError:
+                _stream_stats["heartbeats"] += 1
+                yield HEARTBEAT_COMMENT
+                continue
+            if event is _DONE:
+                break
+            if first and timer is not None:
+                # 질의 접수부터 첫 이벤트 전송까지의 시간
+                SSE_FIRST_BYTE_SECONDS.observe_since(timer.started)
+            first = False
+            yield event
+        if not cancelled:
+            # 이벤트 생성 중 발생한 예외는 여기서 다시 발생
+            await producer
+            _stream_stats["completed"] += 1
+    finally:
+        watcher.cancel()
+        # 응답 전송이 중단된 경우 (클라이언트 종료, 서버 종료 등)
+        cancel("응답 스트림 중단")
+        if on_close is not None:
+            on_close()
+
+def get_stream_stats() -> dict[str, Any]:
+    """질의 스트림 완료/취소/heartbeat 통계를 반환합니다."""
+    return {
+        "completed": _stream_stats["completed"],
+        "cancelled": _stream_stats["cancelled"],
+        "heartbeats": _stream_stats["heartbeats"],
+        "saved_llm_seconds": round(_stream_stats["saved_llm_seconds"], 1),
+    }
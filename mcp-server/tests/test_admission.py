@@ -0,0 +1,58 @@
+"""
+입장 제어 테스트
+LLM 호출 슬롯을 얻지 못한 질의가 SSE error 이벤트로 503과 Retry-After를 전달하는지 확인합니다.
+"""
+
+import json
+import unittest
+from unittest import mock
+
+import httpx
+
+import server_app
+from admission import UpstreamLimiter, get_admission_controller
+
+def parse_events(body: str) -> list[dict]:
+    """SSE 본문에서 data 이벤트만 꺼냅니다 (heartbeat 주석 제외)."""
+    return [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+
+class GroqAdmissionTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # 동시 호출 1개, 대기열 1개, 슬롯 대기 기한 0.1초인 GROQ 제한기로 교체
+        controller = get_admission_controller()
+        self.limiter = UpstreamLimiter("groq", 1, 1, 0.1)
+        patcher = mock.patch.dict(controller.limiters, {"groq": self.limiter})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name, value in (("LLM_PROVIDER", "groq"), ("groq_client", object())):
+            patcher = mock.patch.object(server_app, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_saturated_groq_slot_returns_503_event(self):
+        transport = httpx.ASGITransport(app=server_app.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # 다른 호출이 슬롯을 점유한 상태에서 질의하면 입장은 되지만 슬롯 대기 기한을 넘김
+            async with self.limiter.slot():
+                response = await client.post("/api/query", json={"query": "hello"})
+
+        self.assertEqual(response.status_code, 200)
+        events = parse_events(response.text)
+        error = events[-1]
+        self.assertEqual(error["type"], "error")
+        self.assertEqual(error["status"], 503)
+        self.assertEqual(error["retry_after"], 1)
+        self.assertEqual(self.limiter.wait_timeouts, 1)
+
+    async def test_full_groq_queue_rejects_before_stream(self):
+        self.limiter.max_queue = 0
+        transport = httpx.ASGITransport(app=server_app.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            async with self.limiter.slot():
+                response = await client.post("/api/query", json={"query": "hello"})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+그리드 셀 공간 인덱스 테스트
+셀 수 제한(GRID_INDEX_MAX_CELLS)을 넘으면 가장 오래 사용하지 않은 셀부터 제거되는지 확인합니다.
+"""
+
+import unittest
+
+from grid_index import GridIndex
+
+def square(longitude: float, latitude: float, size: float = 0.02) -> dict:
+    """왼쪽 아래 꼭짓점과 한 변 길이로 만든 정사각형 Polygon geometry"""
+    ring = [
+        [longitude, latitude],
+        [longitude + size, latitude],
+        [longitude + size, latitude + size],
+        [longitude, latitude + size],
+        [longitude, latitude],
+    ]
+    return {"type": "Polygon", "coordinates": [ring]}
+
+class GridIndexLRUTest(unittest.TestCase):
+    def test_evicts_least_recently_used_cell(self):
+        index = GridIndex(max_cells=2)
+        index.add("A/1,1", {}, square(-100.0, 40.0))
+        index.add("A/2,1", {}, square(-99.9, 40.0))
+        # 먼저 등록한 셀을 조회해 최근 사용으로 만든 뒤 새 셀 등록
+        self.assertEqual(index.lookup(40.01, -99.99).key, "A/1,1")
+        index.add("A/3,1", {}, square(-99.8, 40.0))
+
+        self.assertIsNone(index.lookup(40.01, -99.89))
+        self.assertEqual(index.lookup(40.01, -99.99).key, "A/1,1")
+        self.assertEqual(index.lookup(40.01, -99.79).key, "A/3,1")
+        stats = index.stats()
+        self.assertEqual((stats["cells"], stats["evictions"]), (2, 1))
+
+    def test_evicted_cell_leaves_no_empty_buckets(self):
+        index = GridIndex(max_cells=1)
+        index.add("A/1,1", {}, square(-100.0, 40.0))
+        index.add("B/1,1", {}, square(-80.0, 30.0))
+        self.assertEqual(index.stats()["buckets"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+"""
+질의 라우팅 테스트
+지명 사전(data/places.tsv)으로 질의를 날씨 도구 호출로 변환하는 규칙을 확인합니다.
+"""
+
+import unittest
+
+from gazetteer import DEFAULT_FORECAST
+from geocoder import route_query
+
+LOS_ANGELES = {"latitude": 34.0522, "longitude": -118.2437}
+
+class StateOnlyRoutingTest(unittest.TestCase):
+    def test_state_forecast_uses_representative_city(self):
+        for query in ("california weather", "캘리포니아 날씨", "CA 날씨"):
+            with self.subTest(query=query):
+                self.assertEqual(route_query(query), ("get_forecast", LOS_ANGELES))
+
+    def test_state_alerts(self):
+        for query in ("california alerts", "캘리포니아 경보", "alerts for CA"):
+            with self.subTest(query=query):
+                self.assertEqual(route_query(query), ("get_alerts", {"state": "CA"}))
+
+    def test_city_alerts_use_city_state(self):
+        self.assertEqual(route_query("Austin weather warning"), ("get_alerts", {"state": "TX"}))
+
+class StateCodeCueTest(unittest.TestCase):
+    def test_uppercase_words_are_not_state_codes(self):
+        for query in ("IN THE MORNING weather forecast", "forecast OR alerts"):
+            with self.subTest(query=query):
+                self.assertEqual(route_query(query), ("get_forecast", DEFAULT_FORECAST))
+
+    def test_state_code_after_comma(self):
+        tool_name, tool_args = route_query("Portland, ME weather")
+        self.assertEqual(tool_name, "get_forecast")
+        self.assertAlmostEqual(tool_args["longitude"], -70.2568)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+분산 추적 모듈
+W3C traceparent 헤더로 브리지 → HTTP 서버 → NWS/LLM 호출을 하나의 trace로 묶고,
+구간(span)을 OTLP/JSON 형식으로 파일 또는 OTLP 수집기(HTTP)에 내보냅니다.
+
+요청 하나의 구간 시간은 프로세스 안의 최상위 구간(local root)에 이름별로 합산되어
+/api/query의 마지막 SSE 이벤트에 timings로 붙습니다.
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import secrets
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Optional
+from logger_config import setup_logger
+
+# 로거 설정
+logger = setup_logger("tracing")
+
+# 내보내기 배치 크기와 주기
+EXPORT_BATCH_SIZE = 512
+EXPORT_INTERVAL = 1.0
+
+class Span:
+    """추적 구간 하나"""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "name", "kind", "attributes",
+        "start_ns", "end_ns", "error", "root", "timings", "_started",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        root: Optional["Span"],
+        kind: str = "internal",
+        attributes: Optional[dict[str, Any]] = None,
+    ):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+        # 이 프로세스 안의 최상위 구간 (구간 시간 합산용, 자기 자신이면 None)
+        self.root = root
+        self.timings: dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        """구간을 끝내고 최상위 구간에 시간을 합산한 뒤 내보냅니다 (여러 번 호출해도 한 번만 반영)."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        elapsed = (time.perf_counter() - self._started) * 1000
+        if self.root is not None:
+            self.root.timings[self.name] = self.root.timings.get(self.name, 0.0) + elapsed
+        else:
+            self.timings["total"] = elapsed
+        exporter = get_exporter()
+        if exporter is not None:
+            exporter.submit(self)
+
+    def summary(self) -> dict[str, Any]:
+        """구간 이름별 소요 시간 (ms)과 trace ID"""
+        timings = {name: round(elapsed, 1) for name, elapsed in self.timings.items()}
+        if "total" not in timings:
+            timings["total"] = round((time.perf_counter() - self._started) * 1000, 1)
+        return {"trace_id": self.trace_id, **timings}
+
+    def to_otlp(self) -> dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _OTLP_KINDS.get(self.kind, 1),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+_OTLP_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+# 현재 실행 중인 구간
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple[str, str]]:
+    """traceparent 헤더에서 (trace ID, 부모 구간 ID)를 읽습니다 (형식이 맞지 않으면 None)."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, parent_id = parts[1].lower(), parts[2].lower()
+    try:
+        int(trace_id, 16)
+        int(parent_id, 16)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id
+
+def start_span(
+    name: str,
+    headers: Optional[Mapping[str, str]] = None,
+    kind: str = "internal",
+    **attributes: Any,
+) -> Span:
+    """
+    현재 구간의 자식 구간을 시작합니다 (현재 구간으로 설정하지는 않음).
+    headers에 traceparent가 있으면 그 trace를 이어받는 이 프로세스의 최상위 구간이 됩니다.
+    """
+    remote = parse_traceparent(headers.get("traceparent")) if headers is not None else None
+    parent = None if remote is not None else _current_span.get()
+    if parent is not None:
+        return Span(name, parent.trace_id, parent.span_id, parent.root or parent, kind, attributes)
+    trace_id, parent_id = remote if remote is not None else (secrets.token_hex(16), None)
+    return Span(name, trace_id, parent_id, None, kind, attributes)
+
+@contextmanager
+def use_span(span: Span, end: bool = True) -> Iterator[Span]:
+    """
+    블록 안에서 span을 현재 구간으로 설정합니다.
+    비동기 제너레이터 안에서도 쓸 수 있도록 토큰 대신 이전 값을 직접 되돌립니다.
+    """
+    previous = _current_span.get()
+    _current_span.set(span)
+    error = None
+    try:
+        yield span
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_span.set(previous)
+        if end:
+            span.end(error)
+
+def trace_span(name: str, kind: str = "internal", **attributes: Any):
+    """with trace_span("nws.fetch", url=url) as span: ... (현재 구간의 자식 구간을 열고 닫음)"""
+    return use_span(start_span(name, kind=kind, **attributes))
+
+def trace_headers(headers: Optional[dict[str, str]] = None) -> dict[str, str]:
+    """현재 구간의 traceparent를 넣은 HTTP 헤더를 반환합니다 (구간이 없으면 headers 그대로)."""
+    headers = dict(headers) if headers else {}
+    span = _current_span.get()
+    if span is not None:
+        headers["traceparent"] = span.traceparent
+    return headers
+
+class SpanExporter:
+    """
+    끝난 구간을 백그라운드 스레드에서 모아 OTLP/JSON으로 내보내는 내보내기 도구
+    TRACE_EXPORT=file이면 한 줄에 배치 하나씩 TRACE_FILE_PATH에 추가하고 (OTel Collector file exporter와 같은 형식),
+    TRACE_EXPORT=otlp이면 TRACE_OTLP_ENDPOINT로 POST합니다.
+    """
+
+    def __init__(self, mode: str, service_name: str, path: Optional[str] = None, endpoint: Optional[str] = None):
+        self.mode = mode
+        self.service_name = service_name
+        self.path = Path(path or os.getenv("TRACE_FILE_PATH", "logs/traces.jsonl"))
+        self.endpoint = endpoint or os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+        self.exported = 0
+        self.failed = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def submit(self, span: Span) -> None:
+        self._queue.put(span)
+
+    def shutdown(self) -> None:
+        """남은 구간을 내보내고 스레드를 종료합니다."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while True:
+            # 첫 구간이 오면 EXPORT_INTERVAL 동안(최대 EXPORT_BATCH_SIZE개) 모아서 한 번에 내보냄
+            span = self._queue.get()
+            if span is None:
+                return
+            batch = [span]
+            deadline = time.monotonic() + EXPORT_INTERVAL
+            while len(batch) < EXPORT_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    span = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if span is None:
+                    break
+                batch.append(span)
+            self._export(batch)
+            if span is None:
+                return
+
+    def _payload(self, spans: list[Span]) -> dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "weather-tracing"},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }]
+        }
+
+    def _export(self, spans: list[Span]) -> None:
+        payload = self._payload(spans)
+        try:
+            if self.mode == "otlp":
+                import httpx
+                httpx.post(self.endpoint, json=payload, timeout=5.0).raise_for_status()
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+            self.exported += len(spans)
+        except Exception as e:
+            self.failed += len(spans)
+            logger.warning(f"추적 구간 내보내기 실패 ({len(spans)}개): {e}")
+
+# 프로세스 전역 내보내기 도구 (TRACE_EXPORT=none이면 None)
+_exporter: Optional[SpanExporter] = None
+_exporter_checked = False
+_service_name = "weather-server"
+
+def configure_tracing(service_name: str) -> None:
+    """이 프로세스의 서비스 이름을 정합니다 (내보내는 구간의 service.name)."""
+    global _service_name
+    _service_name = service_name
+    if _exporter is not None:
+        _exporter.service_name = service_name
+
+def get_exporter() -> Optional[SpanExporter]:
+    """프로세스 전역 내보내기 도구를 반환합니다 (처음 호출 시 TRACE_EXPORT 환경변수로 생성)."""
+    global _exporter, _exporter_checked
+    if not _exporter_checked:
+        _exporter_checked = True
+        mode = os.getenv("TRACE_EXPORT", "none").lower()
+        if mode in ("file", "otlp"):
+            _exporter = SpanExporter(mode, _service_name)
+            logger.info(f"추적 구간 내보내기 시작 - {mode}: {_exporter.path if mode == 'file' else _exporter.endpoint}")
+    return _exporter
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+LLM 번역 결과 캐시 모듈
+(LLM 제공자, 모델, 시스템 프롬프트, 번역할 내용)의 해시를 키로 번역 결과를 저장합니다.
+메모리 LRU와 SQLite 디스크 계층을 두어 서버를 재시작해도 유지되며,
+같은 번역이 동시에 요청되면 하나의 LLM 호출 결과를 함께 기다립니다.
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncIterator, Callable, Optional
+from logger_config import setup_logger
+
+# 로거 설정
+logger = setup_logger("translation-cache")
+
+class _Abandoned(Exception):
+    """번역을 진행하던 요청이 중간에 취소됨 (대기 중인 요청이 대신 진행)"""
+
+class TranslationCache:
+    """내용 해시를 키로 LLM 번역 결과를 저장하는 메모리 + SQLite 캐시"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+    ):
+        # 인수가 없으면 환경변수 사용
+        self.path = path or os.getenv("TRANSLATION_CACHE_PATH", "cache/translations.sqlite3")
+        self.max_entries = max_entries or int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "1000"))
+        self.default_ttl = default_ttl if default_ttl is not None else float(os.getenv("TRANSLATION_CACHE_TTL", "3600"))
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(provider: str, model: str, system_prompt: str, content: str) -> str:
+        """번역 요청 내용으로 캐시 키(SHA-256)를 만듭니다."""
+        payload = json.dumps([provider, model, system_prompt, content], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self) -> int:
+        """SQLite 파일을 열고 만료되지 않은 최근 항목을 메모리로 읽어 들입니다."""
+        if self._conn is not None:
+            return len(self._entries)
+
+        db_path = Path(self.path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, text TEXT NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM translations WHERE expires_at < ?", (time.time(),))
+        self._conn.commit()
+
+        rows = self._conn.execute(
+            "SELECT key, expires_at, text FROM translations ORDER BY expires_at DESC LIMIT ?",
+            (self.max_entries,),
+        ).fetchall()
+        # 유효 기간이 많이 남은 항목이 LRU의 뒤쪽(최근)에 오도록 역순으로 추가
+        for key, expires_at, text in reversed(rows):
+            self._entries[key] = (expires_at, text)
+
+        logger.info(f"번역 캐시 로드 완료: {len(self._entries)}개 항목 ({self.path})")
+        return len(self._entries)
+
+    def close(self) -> None:
+        """SQLite 연결을 닫습니다."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def get(self, key: str) -> Optional[str]:
+        """캐시된 번역을 반환합니다. 메모리에 없으면 디스크에서 찾습니다 (없거나 만료되면 None)."""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        if self._conn is not None:
+            row = await asyncio.to_thread(self._read, key)
+            if row is not None and row[0] > now:
+                self._remember(key, row[0], row[1])
+                self.disk_hits += 1
+                return row[1]
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, text: str, ttl: Optional[float] = None) -> None:
+        """번역 결과를 메모리와 SQLite에 저장합니다 (ttl이 0 이하이면 저장하지 않음)."""
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        if ttl <= 0 or not text:
+            return
+        expires_at = time.time() + ttl
+        self._remember(key, expires_at, text)
+        if self._conn is not None:
+            # 디스크 쓰기는 이벤트 루프를 막지 않도록 스레드에서 실행
+            await asyncio.to_thread(self._write, key, expires_at, text)
+
+    async def stream(
+        self,
+        key: str,
+        produce: Callable[[], AsyncIterator[str]],
+        ttl: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        캐시된 번역을 반환하거나, 없으면 produce()의 토큰을 그대로 내보내면서 결과를 저장합니다.
+        같은 키의 번역이 이미 진행 중이면 그 결과를 기다렸다가 한 번에 내보냅니다.
+
+        Args:
+            key: make_key로 만든 캐시 키
+            produce: 번역 토큰을 내보내는 비동기 이터레이터를 만드는 함수
+            ttl: 결과 유효 기간 (초, None이면 기본값)
+        """
+        while True:
+            text = await self.get(key)
+            if text is not None:
+                yield text
+                return
+
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            try:
+                text = await asyncio.shield(future)
+            except _Abandoned:
+                # 진행하던 요청이 취소됨: 다시 확인한 뒤 직접 번역
+                continue
+            yield text
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        # 대기자가 없을 때 예외가 회수되지 않았다는 경고 방지
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        parts = []
+        try:
+            async for token in produce():
+                parts.append(token)
+                yield token
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            future.set_exception(_Abandoned())
+            raise
+        else:
+            text = "".join(parts)
+            future.set_result(text)
+            await self.put(key, text, ttl)
+        finally:
+            self._inflight.pop(key, None)
+
+    def _remember(self, key: str, expires_at: float, text: str) -> None:
+        self._entries[key] = (expires_at, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _read(self, key: str) -> Optional[tuple[float, str]]:
+        with self._lock:
+            if self._conn is None:
+                return None
+            return self._conn.execute(
+                "SELECT expires_at, text FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _write(self, key: str, expires_at: float, text: str) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (key, expires_at, text) VALUES (?, ?, ?)",
+                (key, expires_at, text),
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict[str, int]:
+        """캐시 통계를 반환합니다."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "evictions": self.evictions,
+        }
+
+# 프로세스 전역 캐시
+_translation_cache: Optional[TranslationCache] = None
+
+def get_translation_cache() -> Optional[TranslationCache]:
+    """프로세스 전역 번역 캐시를 반환합니다 (TRANSLATION_CACHE_ENABLED=false이면 None)."""
+    global _translation_cache
+    if _translation_cache is None and os.getenv("TRANSLATION_CACHE_ENABLED", "true").lower() == "true":
+        _translation_cache = TranslationCache()
+    return _translation_cache
+
+def open_translation_cache() -> Optional[TranslationCache]:
+    """프로세스 전역 번역 캐시를 생성하고 디스크에서 로드합니다."""
+    cache = get_translation_cache()
+    if cache is None:
+        return None
+    try:
+        cache.load()
+    except sqlite3.Error as e:
+        # 디스크 캐시를 열 수 없어도 메모리 캐시로 계속 동작
+        logger.error(f"번역 캐시 파일을 열 수 없음: {e}")
+    return cache
+
+def close_translation_cache() -> None:
+    """프로세스 전역 번역 캐시를 닫습니다."""
+    global _translation_cache
+    if _translation_cache is not None:
+        _translation_cache.close()
+        _translation_cache = None
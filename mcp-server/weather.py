@@ -1,9 +1,15 @@
 import sys
 import os
-from typing import Any
-import httpx
-from mcp.server.fastmcp import FastMCP
+import json
+from contextlib import asynccontextmanager
+from typing import Annotated
+from mcp.server.fastmcp import Context, FastMCP
+from pydantic import Field
 from logger_config import setup_logger
+from nws_client import fetch_forecast, fetch_points, nws_lifespan
+from forecast_batch import iter_forecast_batch, validate_batch
+from alerts_index import alerts_lifespan, fetch_state_alerts
+from geocoder import find_nearest_place, lookup_place, route_query
 
 # Set encoding for proper character handling
 sys.stdout.reconfigure(encoding='utf-8')
@@ -12,29 +18,18 @@ sys.stderr.reconfigure(encoding='utf-8')
 # 로거 설정
 logger = setup_logger("weather")
 
-# Initialize FastMCP server
-mcp = FastMCP("weather")
-
 # Constants
-NWS_API_BASE = "https://api.weather.gov"
+NWS_API_BASE = os.getenv("NWS_API_BASE", "https://api.weather.gov")
 USER_AGENT = "weather-app/1.0"
 
-async def make_nws_request(url: str) -> dict[str, Any] | None:
-    """Make a request to the NWS API with proper error handling."""
-    logger.debug(f"NWS API 호출: {url}")
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "application/geo+json"
-    }
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            logger.debug("NWS API 응답 성공")
-            return response.json()
-        except Exception as e:
-            logger.error(f"NWS API 오류: {e}")
-            return None
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """서버 수명 동안 NWS 커넥션 풀과 전국 경보 수집기를 유지합니다."""
+    async with nws_lifespan(USER_AGENT), alerts_lifespan(NWS_API_BASE):
+        yield
+
+# Initialize FastMCP server
+mcp = FastMCP("weather", lifespan=server_lifespan)
 
 def format_alert(feature: dict) -> str:
     """Format an alert feature into a readable string."""
@@ -55,8 +50,7 @@ async def get_alerts(state: str) -> str:
         state: Two-letter US state code (e.g. CA, NY)
     """
     logger.info(f"날씨 경보 요청: state={state}")
-    url = f"{NWS_API_BASE}/alerts/active/area/{state}"
-    data = await make_nws_request(url)
+    data = await fetch_state_alerts(state, NWS_API_BASE)
 
     if not data or "features" not in data:
         logger.error(f"경보를 가져올 수 없거나 경보가 없음: {state}")
@@ -80,16 +74,14 @@ async def get_forecast(latitude: float, longitude: float) -> str:
     """
     logger.info(f"날씨 예보 요청: lat={latitude}, lon={longitude}")
     # First get the forecast grid endpoint
-    points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-    points_data = await make_nws_request(points_url)
+    points_data = await fetch_points(latitude, longitude, NWS_API_BASE)
 
     if not points_data:
         logger.error(f"위치에 대한 예보 데이터를 가져올 수 없음: {latitude}, {longitude}")
         return "Unable to fetch forecast data for this location."
 
-    # Get the forecast URL from the points response
-    forecast_url = points_data["properties"]["forecast"]
-    forecast_data = await make_nws_request(forecast_url)
+    # Get the forecast from the points response
+    forecast_data = await fetch_forecast(points_data)
 
     if not forecast_data:
         logger.error("상세 예보를 가져올 수 없음")
@@ -110,6 +102,75 @@ Forecast: {period['detailedForecast']}
     logger.info("날씨 예보 생성 완료")
     return "\n---\n".join(forecasts)
 
+@mcp.tool()
+async def get_forecast_batch(
+    locations: list[dict[str, float]],
+    ctx: Context,
+    concurrency: Annotated[int | None, Field(ge=1)] = None,
+) -> str:
+    """Get weather forecasts for many locations at once.
+
+    Locations in the same NWS grid cell are fetched once. Each location's result is
+    sent as a progress notification message as soon as it completes (when the call
+    has a progressToken), and all results are returned at the end as NDJSON lines
+    (one per location, in completion order, then a summary).
+
+    Args:
+        locations: List of objects with latitude and longitude
+        concurrency: Maximum concurrent NWS requests (1 to BATCH_MAX_LOCATIONS, optional)
+    """
+    logger.info(f"일괄 예보 요청: {len(locations)}개 좌표")
+    error = validate_batch(len(locations), concurrency)
+    if error:
+        return error
+
+    coords = [(float(location["latitude"]), float(location["longitude"])) for location in locations]
+    lines = []
+    async for result in iter_forecast_batch(coords, NWS_API_BASE, concurrency):
+        line = json.dumps(result, ensure_ascii=False)
+        lines.append(line)
+        if result["type"] == "result":
+            # 완료된 좌표의 결과를 진행 알림 메시지로 바로 전달 (최종 응답을 기다리지 않아도 됨)
+            await ctx.report_progress(len(lines), len(coords), message=line)
+    return "\n".join(lines)
+
+@mcp.tool()
+async def geocode(place: str, limit: int = 5) -> str:
+    """Find coordinates for a US city or state name without a network geocoder.
+
+    Args:
+        place: Place name in English or Korean, typos allowed (e.g. Seattle, "Portland, ME", 시애틀)
+        limit: Maximum number of results
+    """
+    matches = lookup_place(place, limit)
+    if not matches:
+        return f"No matching place found for {place}."
+    return "\n".join(str(match) for match in matches)
+
+@mcp.tool()
+async def nearest_place(latitude: float, longitude: float, limit: int = 1) -> str:
+    """Find the known US cities nearest to a location.
+
+    Args:
+        latitude: Latitude of the location
+        longitude: Longitude of the location
+        limit: Maximum number of results
+    """
+    matches = find_nearest_place(latitude, longitude, limit)
+    if not matches:
+        return "No known place found."
+    return "\n".join(str(match) for match in matches)
+
+@mcp.tool()
+async def route_weather_query(query: str) -> str:
+    """Choose the weather tool and arguments for a natural language query (offline, no LLM).
+
+    Args:
+        query: Natural language weather query (Korean or English)
+    """
+    tool_name, tool_args = route_query(query)
+    return json.dumps({"tool": tool_name, "arguments": tool_args}, ensure_ascii=False)
+
 if __name__ == "__main__":
     # Initialize and run the server
     mcp.run(transport='stdio')
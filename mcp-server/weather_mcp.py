@@ -5,6 +5,7 @@ Weather MCP Server - Cursor에서 사용 가능한 MCP 서버
 
 import asyncio
 import json
+import os
 import sys
 from typing import Any, Sequence
 import httpx
@@ -21,32 +22,27 @@ from mcp.types import (
     TextContent,
 )
 
+from nws_client import fetch_forecast, fetch_points, nws_lifespan
+from forecast_batch import batch_max_locations, iter_forecast_batch, validate_batch
+from alerts_index import alerts_lifespan, fetch_state_alerts
+from query_timing import QueryTimer
+from geocoder import find_nearest_place, lookup_place, route_query
+from logger_config import setup_logger
+
+# 로거 설정
+logger = setup_logger("weather-mcp")
+
 # National Weather Service API constants
-NWS_API_BASE = "https://api.weather.gov"
+NWS_API_BASE = os.getenv("NWS_API_BASE", "https://api.weather.gov")
 USER_AGENT = "weather-mcp/1.0"
 
 # Ollama API constants
-OLLAMA_URL = "http://localhost:11434"
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
 OLLAMA_MODEL = "llama3:8b"
 
 # Create server instance
 server = Server("weather-mcp")
 
-async def make_nws_request(url: str) -> dict | None:
-    """Make a request to the National Weather Service API"""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                url,
-                headers={"User-Agent": USER_AGENT},
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"Error making NWS request to {url}: {e}", file=sys.stderr)
-            return None
-
 async def call_ollama(messages: list) -> dict:
     """Call Ollama API"""
     # Convert messages to prompt format for Ollama
@@ -123,6 +119,40 @@ async def handle_list_tools() -> ListToolsResult:
                     "required": ["latitude", "longitude"]
                 }
             ),
+            Tool(
+                name="get_forecast_batch",
+                description="Get weather forecasts for many locations at once (NDJSON, one line per location)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "locations": {
+                            "type": "array",
+                            "description": "List of locations",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "latitude": {
+                                        "type": "number",
+                                        "description": "Latitude of the location"
+                                    },
+                                    "longitude": {
+                                        "type": "number",
+                                        "description": "Longitude of the location"
+                                    }
+                                },
+                                "required": ["latitude", "longitude"]
+                            }
+                        },
+                        "concurrency": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "maximum": batch_max_locations(),
+                            "description": "Maximum concurrent NWS requests"
+                        }
+                    },
+                    "required": ["locations"]
+                }
+            ),
             Tool(
                 name="get_alerts",
                 description="Get weather alerts for a US state",
@@ -137,6 +167,60 @@ async def handle_list_tools() -> ListToolsResult:
                     "required": ["state"]
                 }
             ),
+            Tool(
+                name="geocode",
+                description="Find coordinates for a US city or state name (offline, typos allowed)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "place": {
+                            "type": "string",
+                            "description": "Place name in English or Korean (e.g. Seattle, \"Portland, ME\", 시애틀)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum number of results"
+                        }
+                    },
+                    "required": ["place"]
+                }
+            ),
+            Tool(
+                name="nearest_place",
+                description="Find the known US cities nearest to a location",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "latitude": {
+                            "type": "number",
+                            "description": "Latitude of the location"
+                        },
+                        "longitude": {
+                            "type": "number",
+                            "description": "Longitude of the location"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum number of results"
+                        }
+                    },
+                    "required": ["latitude", "longitude"]
+                }
+            ),
+            Tool(
+                name="route_weather_query",
+                description="Choose the weather tool and arguments for a natural language query (offline, no LLM)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "query": {
+                            "type": "string",
+                            "description": "Natural language weather query (Korean or English)"
+                        }
+                    },
+                    "required": ["query"]
+                }
+            ),
             Tool(
                 name="process_weather_query",
                 description="Process a natural language weather query with AI assistance",
@@ -163,12 +247,10 @@ async def handle_call_tool(name: str, arguments: dict) -> CallToolResult:
         longitude = arguments["longitude"]
         
         # Get forecast data
-        points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-        points_data = await make_nws_request(points_url)
+        points_data = await fetch_points(latitude, longitude, NWS_API_BASE)
         
         if points_data:
-            forecast_url = points_data["properties"]["forecast"]
-            forecast_data = await make_nws_request(forecast_url)
+            forecast_data = await fetch_forecast(points_data)
             
             if forecast_data:
                 periods = forecast_data["properties"]["periods"]
@@ -192,12 +274,34 @@ Forecast: {period['detailedForecast']}
             content=[TextContent(type="text", text=result)]
         )
         
+    elif name == "get_forecast_batch":
+        locations = arguments["locations"]
+        
+        error = validate_batch(len(locations), arguments.get("concurrency"))
+        if error:
+            result = error
+        else:
+            coords = [(float(location["latitude"]), float(location["longitude"])) for location in locations]
+            # 호출에 progressToken이 있으면 완료된 좌표의 결과를 진행 알림 메시지로 바로 전달
+            ctx = server.request_context
+            progress_token = ctx.meta.progressToken if ctx.meta else None
+            lines = []
+            async for item in iter_forecast_batch(coords, NWS_API_BASE, arguments.get("concurrency")):
+                line = json.dumps(item, ensure_ascii=False)
+                lines.append(line)
+                if item["type"] == "result" and progress_token is not None:
+                    await ctx.session.send_progress_notification(progress_token, len(lines), len(coords), message=line)
+            result = "\n".join(lines)
+            
+        return CallToolResult(
+            content=[TextContent(type="text", text=result)]
+        )
+        
     elif name == "get_alerts":
         state = arguments["state"]
         
         # Get alerts data
-        url = f"{NWS_API_BASE}/alerts/active/area/{state}"
-        data = await make_nws_request(url)
+        data = await fetch_state_alerts(state, NWS_API_BASE)
         
         if data and "features" in data:
             if data["features"]:
@@ -212,104 +316,99 @@ Forecast: {period['detailedForecast']}
             content=[TextContent(type="text", text=result)]
         )
         
+    elif name == "geocode":
+        place = arguments["place"]
+        matches = lookup_place(place, int(arguments.get("limit", 5)))
+        
+        if matches:
+            result = "\n".join(str(match) for match in matches)
+        else:
+            result = f"No matching place found for {place}."
+            
+        return CallToolResult(
+            content=[TextContent(type="text", text=result)]
+        )
+        
+    elif name == "nearest_place":
+        matches = find_nearest_place(
+            float(arguments["latitude"]), float(arguments["longitude"]), int(arguments.get("limit", 1))
+        )
+        
+        if matches:
+            result = "\n".join(str(match) for match in matches)
+        else:
+            result = "No known place found."
+            
+        return CallToolResult(
+            content=[TextContent(type="text", text=result)]
+        )
+        
+    elif name == "route_weather_query":
+        tool_name, tool_args = route_query(arguments["query"])
+        result = json.dumps({"tool": tool_name, "arguments": tool_args}, ensure_ascii=False)
+        
+        return CallToolResult(
+            content=[TextContent(type="text", text=result)]
+        )
+        
     elif name == "process_weather_query":
         query = arguments["query"]
+        logger.info(f"process_weather_query 호출됨: {query}")
+        timer = QueryTimer()
+        intent = "general"
         
         try:
-            # 시스템 메시지 생성
-            system_message = f"""
-You are a helpful assistant with access to weather tools. 
-Available tools: ['get_alerts', 'get_forecast']
-When asked about weather, I will automatically call the appropriate weather tool.
-답변은 한국어로 해주세요.
-"""
-
-            messages = [
-                {
-                    "role": "system",
-                    "content": system_message
-                },
-                {
-                    "role": "user",
-                    "content": query
-                }
-            ]
-
-            # 초기 Ollama 호출
-            response = await call_ollama(messages)
+            # 날씨 관련 키워드 감지 (LLM 호출 전에 로컬에서 의도 분류)
+            with timer.stage("classify"):
+                weather_keywords = ["weather", "forecast", "temperature", "날씨", "예보", "기온"]
+                query_lower = query.lower()
+                is_weather_query = any(keyword in query_lower for keyword in weather_keywords)
             
-            if "response" not in response:
-                return CallToolResult(
-                    content=[TextContent(type="text", text="AI 모델 응답을 받을 수 없습니다.")]
-                )
-
-            response_text = response["response"]
-            
-            # 날씨 관련 키워드 감지
-            weather_keywords = ["weather", "forecast", "temperature", "날씨", "예보", "기온"]
-            query_lower = query.lower()
-            
-            if any(keyword in query_lower for keyword in weather_keywords):
-                # 위치에 따른 도구 선택
-                tool_name = None
-                tool_args = {}
+            if is_weather_query:
+                # 날씨 질의는 번역 호출 하나로 충분하므로 일반 응답용 LLM 호출을 생략
+                timer.skip_llm_call()
                 
-                if any(location in query_lower for location in ["los angeles", "la", "캘리포니아", "california"]):
-                    tool_name = "get_forecast"
-                    tool_args = {"latitude": 34.0522, "longitude": -118.2437}
-                elif any(location in query_lower for location in ["new york", "뉴욕", "ny"]):
-                    tool_name = "get_forecast"
-                    tool_args = {"latitude": 40.7128, "longitude": -74.0060}
-                elif any(location in query_lower for location in ["texas", "텍사스", "tx"]):
-                    tool_name = "get_alerts"
-                    tool_args = {"state": "TX"}
-                elif any(location in query_lower for location in ["california", "캘리포니아", "ca"]):
-                    tool_name = "get_alerts"
-                    tool_args = {"state": "CA"}
-                else:
-                    # 기본적으로 LA 날씨 제공
-                    tool_name = "get_forecast"
-                    tool_args = {"latitude": 34.0522, "longitude": -118.2437}
+                # 질의에 언급된 지명으로 도구 선택 (지명이 없으면 LA 예보)
+                tool_name, tool_args = route_query(query)
+                intent = f"weather/{tool_name}"
                 
                 # 날씨 API 호출
-                if tool_name == "get_forecast":
-                    points_url = f"{NWS_API_BASE}/points/{tool_args['latitude']},{tool_args['longitude']}"
-                    points_data = await make_nws_request(points_url)
-                    
-                    if points_data:
-                        forecast_url = points_data["properties"]["forecast"]
-                        forecast_data = await make_nws_request(forecast_url)
+                with timer.stage("nws"):
+                    if tool_name == "get_forecast":
+                        points_data = await fetch_points(tool_args['latitude'], tool_args['longitude'], NWS_API_BASE)
                         
-                        if forecast_data:
-                            periods = forecast_data["properties"]["periods"]
-                            forecasts = []
-                            for period in periods[:5]:
-                                forecast = f"""
+                        if points_data:
+                            forecast_data = await fetch_forecast(points_data)
+                            
+                            if forecast_data:
+                                periods = forecast_data["properties"]["periods"]
+                                forecasts = []
+                                for period in periods[:5]:
+                                    forecast = f"""
 {period['name']}:
 Temperature: {period['temperature']}°{period['temperatureUnit']}
 Wind: {period['windSpeed']} {period['windDirection']}
 Forecast: {period['detailedForecast']}
 """
-                                forecasts.append(forecast)
-                            
-                            weather_data = "\n---\n".join(forecasts)
+                                    forecasts.append(forecast)
+                                
+                                weather_data = "\n---\n".join(forecasts)
+                            else:
+                                weather_data = "날씨 데이터를 가져올 수 없습니다."
                         else:
                             weather_data = "날씨 데이터를 가져올 수 없습니다."
-                    else:
-                        weather_data = "날씨 데이터를 가져올 수 없습니다."
+                            
+                    elif tool_name == "get_alerts":
+                        data = await fetch_state_alerts(tool_args['state'], NWS_API_BASE)
                         
-                elif tool_name == "get_alerts":
-                    url = f"{NWS_API_BASE}/alerts/active/area/{tool_args['state']}"
-                    data = await make_nws_request(url)
-                    
-                    if data and "features" in data:
-                        if data["features"]:
-                            alerts = [format_alert(feature) for feature in data["features"]]
-                            weather_data = "\n---\n".join(alerts)
+                        if data and "features" in data:
+                            if data["features"]:
+                                alerts = [format_alert(feature) for feature in data["features"]]
+                                weather_data = "\n---\n".join(alerts)
+                            else:
+                                weather_data = "이 지역에 활성화된 경보가 없습니다."
                         else:
-                            weather_data = "이 지역에 활성화된 경보가 없습니다."
-                    else:
-                        weather_data = "경보 데이터를 가져올 수 없습니다."
+                            weather_data = "경보 데이터를 가져올 수 없습니다."
                 
                 # 한국어 번역 요청
                 translation_system_message = f"""
@@ -337,7 +436,8 @@ Forecast: {period['detailedForecast']}
 
                 # 최종 번역 응답
                 try:
-                    final_response = await call_ollama(translation_messages)
+                    with timer.stage("llm_translate", llm=True):
+                        final_response = await call_ollama(translation_messages)
                     if "response" in final_response:
                         result = final_response["response"]
                     else:
@@ -345,12 +445,39 @@ Forecast: {period['detailedForecast']}
                 except Exception as e:
                     result = weather_data
             else:
-                # 날씨 관련이 아닌 경우 기본 응답
-                result = response_text
+                # 날씨 관련이 아닌 경우에만 일반 LLM 응답 생성
+                system_message = f"""
+You are a helpful assistant with access to weather tools. 
+Available tools: ['get_alerts', 'get_forecast']
+When asked about weather, I will automatically call the appropriate weather tool.
+답변은 한국어로 해주세요.
+"""
+
+                messages = [
+                    {
+                        "role": "system",
+                        "content": system_message
+                    },
+                    {
+                        "role": "user",
+                        "content": query
+                    }
+                ]
+
+                with timer.stage("llm", llm=True):
+                    response = await call_ollama(messages)
+                
+                if "response" not in response:
+                    return CallToolResult(
+                        content=[TextContent(type="text", text="AI 모델 응답을 받을 수 없습니다.")]
+                    )
+
+                result = response["response"]
                 
         except Exception as e:
             result = f"오류가 발생했습니다: {str(e)}"
-            
+        
+        logger.info(f"process_weather_query 완료 ({intent}) - {timer.summary()}")
         return CallToolResult(
             content=[TextContent(type="text", text=result)]
         )
@@ -360,8 +487,8 @@ Forecast: {period['detailedForecast']}
 
 async def main():
     """Run the MCP server"""
-    # Run the server
-    async with stdio_server() as (read_stream, write_stream):
+    # Run the server (NWS 커넥션 풀과 전국 경보 수집기는 서버 수명 동안 유지)
+    async with nws_lifespan(USER_AGENT), alerts_lifespan(NWS_API_BASE), stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
             write_stream,
@@ -5,11 +5,18 @@ Weather MCP Server - Cursor에서 사용 가능한 MCP 서버 (FastMCP 기반)
 
 import sys
 import os
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Annotated
 import httpx
 import json
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+from pydantic import Field
 from logger_config import setup_logger
+from nws_client import fetch_forecast, fetch_points, nws_lifespan
+from forecast_batch import iter_forecast_batch, validate_batch
+from alerts_index import alerts_lifespan, fetch_state_alerts
+from query_timing import QueryTimer
+from geocoder import find_nearest_place, lookup_place, route_query
 
 # Set encoding for proper character handling
 sys.stdout.reconfigure(encoding='utf-8')
@@ -20,30 +27,22 @@ logger = setup_logger("weather-mcp-simple")
 
 logger.info("MCP 서버 시작 중...")
 
-# Initialize FastMCP server
-mcp = FastMCP("weather-mcp")
-
-logger.info("FastMCP 서버 초기화 완료")
-
 # Constants
-NWS_API_BASE = "https://api.weather.gov"
+NWS_API_BASE = os.getenv("NWS_API_BASE", "https://api.weather.gov")
 USER_AGENT = "weather-mcp/1.0"
-OLLAMA_URL = "http://localhost:11434"
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
 OLLAMA_MODEL = "llama3:8b"
 
-async def make_nws_request(url: str) -> dict[str, Any] | None:
-    """Make a request to the NWS API with proper error handling."""
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "application/geo+json"
-    }
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
-        except Exception:
-            return None
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """서버 수명 동안 NWS 커넥션 풀과 전국 경보 수집기를 유지합니다."""
+    async with nws_lifespan(USER_AGENT), alerts_lifespan(NWS_API_BASE):
+        yield
+
+# Initialize FastMCP server
+mcp = FastMCP("weather-mcp", lifespan=server_lifespan)
+
+logger.info("FastMCP 서버 초기화 완료")
 
 async def call_ollama(messages: list) -> dict:
     """Call Ollama API"""
@@ -105,8 +104,7 @@ async def get_alerts(state: str) -> str:
     Args:
         state: Two-letter US state code (e.g. CA, NY)
     """
-    url = f"{NWS_API_BASE}/alerts/active/area/{state}"
-    data = await make_nws_request(url)
+    data = await fetch_state_alerts(state, NWS_API_BASE)
 
     if not data or "features" not in data:
         return "Unable to fetch alerts or no alerts found."
@@ -126,15 +124,13 @@ async def get_forecast(latitude: float, longitude: float) -> str:
         longitude: Longitude of the location
     """
     # First get the forecast grid endpoint
-    points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-    points_data = await make_nws_request(points_url)
+    points_data = await fetch_points(latitude, longitude, NWS_API_BASE)
 
     if not points_data:
         return "Unable to fetch forecast data for this location."
 
-    # Get the forecast URL from the points response
-    forecast_url = points_data["properties"]["forecast"]
-    forecast_data = await make_nws_request(forecast_url)
+    # Get the forecast from the points response
+    forecast_data = await fetch_forecast(points_data)
 
     if not forecast_data:
         return "Unable to fetch detailed forecast."
@@ -153,6 +149,75 @@ Forecast: {period['detailedForecast']}
 
     return "\n---\n".join(forecasts)
 
+@mcp.tool()
+async def get_forecast_batch(
+    locations: list[dict[str, float]],
+    ctx: Context,
+    concurrency: Annotated[int | None, Field(ge=1)] = None,
+) -> str:
+    """Get weather forecasts for many locations at once.
+
+    Locations in the same NWS grid cell are fetched once. Each location's result is
+    sent as a progress notification message as soon as it completes (when the call
+    has a progressToken), and all results are returned at the end as NDJSON lines
+    (one per location, in completion order, then a summary).
+
+    Args:
+        locations: List of objects with latitude and longitude
+        concurrency: Maximum concurrent NWS requests (1 to BATCH_MAX_LOCATIONS, optional)
+    """
+    logger.info(f"get_forecast_batch 호출됨: {len(locations)}개 좌표")
+    error = validate_batch(len(locations), concurrency)
+    if error:
+        return error
+
+    coords = [(float(location["latitude"]), float(location["longitude"])) for location in locations]
+    lines = []
+    async for result in iter_forecast_batch(coords, NWS_API_BASE, concurrency):
+        line = json.dumps(result, ensure_ascii=False)
+        lines.append(line)
+        if result["type"] == "result":
+            # 완료된 좌표의 결과를 진행 알림 메시지로 바로 전달 (최종 응답을 기다리지 않아도 됨)
+            await ctx.report_progress(len(lines), len(coords), message=line)
+    return "\n".join(lines)
+
+@mcp.tool()
+async def geocode(place: str, limit: int = 5) -> str:
+    """Find coordinates for a US city or state name without a network geocoder.
+
+    Args:
+        place: Place name in English or Korean, typos allowed (e.g. Seattle, "Portland, ME", 시애틀)
+        limit: Maximum number of results
+    """
+    matches = lookup_place(place, limit)
+    if not matches:
+        return f"No matching place found for {place}."
+    return "\n".join(str(match) for match in matches)
+
+@mcp.tool()
+async def nearest_place(latitude: float, longitude: float, limit: int = 1) -> str:
+    """Find the known US cities nearest to a location.
+
+    Args:
+        latitude: Latitude of the location
+        longitude: Longitude of the location
+        limit: Maximum number of results
+    """
+    matches = find_nearest_place(latitude, longitude, limit)
+    if not matches:
+        return "No known place found."
+    return "\n".join(str(match) for match in matches)
+
+@mcp.tool()
+async def route_weather_query(query: str) -> str:
+    """Choose the weather tool and arguments for a natural language query (offline, no LLM).
+
+    Args:
+        query: Natural language weather query (Korean or English)
+    """
+    tool_name, tool_args = route_query(query)
+    return json.dumps({"tool": tool_name, "arguments": tool_args}, ensure_ascii=False)
+
 @mcp.tool()
 async def process_weather_query(query: str) -> str:
     """Process a natural language weather query with AI assistance.
@@ -161,107 +226,62 @@ async def process_weather_query(query: str) -> str:
         query: Natural language weather query (Korean or English)
     """
     logger.info(f"process_weather_query 호출됨: {query}")
+    timer = QueryTimer()
+    intent = "general"
     
     try:
-        # 시스템 메시지 생성
-        system_message = f"""
-You are a helpful assistant with access to weather tools. 
-Available tools: ['get_alerts', 'get_forecast']
-When asked about weather, I will automatically call the appropriate weather tool.
-답변은 한국어로 해주세요.
-"""
-
-        messages = [
-            {
-                "role": "system",
-                "content": system_message
-            },
-            {
-                "role": "user",
-                "content": query
-            }
-        ]
-
-        logger.debug("Ollama 호출 시작...")
-        
-        # 초기 Ollama 호출
-        response = await call_ollama(messages)
-        
-        logger.debug("Ollama 응답 받음")
+        # 날씨 관련 키워드 감지 (LLM 호출 전에 로컬에서 의도 분류)
+        with timer.stage("classify"):
+            weather_keywords = ["weather", "forecast", "temperature", "날씨", "예보", "기온"]
+            query_lower = query.lower()
+            is_weather_query = any(keyword in query_lower for keyword in weather_keywords)
         
-        if "response" not in response:
-            logger.error("AI 모델 응답을 받을 수 없습니다.")
-            return "AI 모델 응답을 받을 수 없습니다."
-
-        response_text = response["response"]
-        
-        # 날씨 관련 키워드 감지
-        weather_keywords = ["weather", "forecast", "temperature", "날씨", "예보", "기온"]
-        query_lower = query.lower()
-        
-        if any(keyword in query_lower for keyword in weather_keywords):
-            logger.debug("날씨 관련 질의 감지됨")
+        if is_weather_query:
+            logger.debug("날씨 관련 질의 감지됨 - 일반 LLM 응답 생략")
+            # 날씨 질의는 번역 호출 하나로 충분하므로 일반 응답용 LLM 호출을 생략
+            timer.skip_llm_call()
             
-            # 위치에 따른 도구 선택
-            tool_name = None
-            tool_args = {}
-            
-            if any(location in query_lower for location in ["los angeles", "la", "캘리포니아", "california"]):
-                tool_name = "get_forecast"
-                tool_args = {"latitude": 34.0522, "longitude": -118.2437}
-            elif any(location in query_lower for location in ["new york", "뉴욕", "ny"]):
-                tool_name = "get_forecast"
-                tool_args = {"latitude": 40.7128, "longitude": -74.0060}
-            elif any(location in query_lower for location in ["texas", "텍사스", "tx"]):
-                tool_name = "get_alerts"
-                tool_args = {"state": "TX"}
-            elif any(location in query_lower for location in ["california", "캘리포니아", "ca"]):
-                tool_name = "get_alerts"
-                tool_args = {"state": "CA"}
-            else:
-                # 기본적으로 LA 날씨 제공
-                tool_name = "get_forecast"
-                tool_args = {"latitude": 34.0522, "longitude": -118.2437}
+            # 질의에 언급된 지명으로 도구 선택 (지명이 없으면 LA 예보)
+            tool_name, tool_args = route_query(query)
+            intent = f"weather/{tool_name}"
             
             # 날씨 API 호출
-            if tool_name == "get_forecast":
-                points_url = f"{NWS_API_BASE}/points/{tool_args['latitude']},{tool_args['longitude']}"
-                points_data = await make_nws_request(points_url)
-                
-                if points_data:
-                    forecast_url = points_data["properties"]["forecast"]
-                    forecast_data = await make_nws_request(forecast_url)
+            with timer.stage("nws"):
+                if tool_name == "get_forecast":
+                    points_data = await fetch_points(tool_args['latitude'], tool_args['longitude'], NWS_API_BASE)
                     
-                    if forecast_data:
-                        periods = forecast_data["properties"]["periods"]
-                        forecasts = []
-                        for period in periods[:5]:
-                            forecast = f"""
+                    if points_data:
+                        forecast_data = await fetch_forecast(points_data)
+                        
+                        if forecast_data:
+                            periods = forecast_data["properties"]["periods"]
+                            forecasts = []
+                            for period in periods[:5]:
+                                forecast = f"""
 {period['name']}:
 Temperature: {period['temperature']}°{period['temperatureUnit']}
 Wind: {period['windSpeed']} {period['windDirection']}
 Forecast: {period['detailedForecast']}
 """
-                            forecasts.append(forecast)
-                        
-                        weather_data = "\n---\n".join(forecasts)
+                                forecasts.append(forecast)
+                            
+                            weather_data = "\n---\n".join(forecasts)
+                        else:
+                            weather_data = "날씨 데이터를 가져올 수 없습니다."
                     else:
                         weather_data = "날씨 데이터를 가져올 수 없습니다."
-                else:
-                    weather_data = "날씨 데이터를 가져올 수 없습니다."
+                        
+                elif tool_name == "get_alerts":
+                    data = await fetch_state_alerts(tool_args['state'], NWS_API_BASE)
                     
-            elif tool_name == "get_alerts":
-                url = f"{NWS_API_BASE}/alerts/active/area/{tool_args['state']}"
-                data = await make_nws_request(url)
-                
-                if data and "features" in data:
-                    if data["features"]:
-                        alerts = [format_alert(feature) for feature in data["features"]]
-                        weather_data = "\n---\n".join(alerts)
+                    if data and "features" in data:
+                        if data["features"]:
+                            alerts = [format_alert(feature) for feature in data["features"]]
+                            weather_data = "\n---\n".join(alerts)
+                        else:
+                            weather_data = "이 지역에 활성화된 경보가 없습니다."
                     else:
-                        weather_data = "이 지역에 활성화된 경보가 없습니다."
-                else:
-                    weather_data = "경보 데이터를 가져올 수 없습니다."
+                        weather_data = "경보 데이터를 가져올 수 없습니다."
             
             # 한국어 번역 요청
             translation_system_message = f"""
@@ -289,7 +309,8 @@ Forecast: {period['detailedForecast']}
 
             # 최종 번역 응답
             try:
-                final_response = await call_ollama(translation_messages)
+                with timer.stage("llm_translate", llm=True):
+                    final_response = await call_ollama(translation_messages)
                 if "response" in final_response:
                     result = final_response["response"]
                 else:
@@ -297,12 +318,40 @@ Forecast: {period['detailedForecast']}
             except Exception as e:
                 result = weather_data
         else:
-            # 날씨 관련이 아닌 경우 기본 응답
-            result = response_text
+            # 날씨 관련이 아닌 경우에만 일반 LLM 응답 생성
+            system_message = f"""
+You are a helpful assistant with access to weather tools. 
+Available tools: ['get_alerts', 'get_forecast']
+When asked about weather, I will automatically call the appropriate weather tool.
+답변은 한국어로 해주세요.
+"""
+
+            messages = [
+                {
+                    "role": "system",
+                    "content": system_message
+                },
+                {
+                    "role": "user",
+                    "content": query
+                }
+            ]
+
+            logger.debug("Ollama 호출 시작...")
+            with timer.stage("llm", llm=True):
+                response = await call_ollama(messages)
+            logger.debug("Ollama 응답 받음")
+            
+            if "response" not in response:
+                logger.error("AI 모델 응답을 받을 수 없습니다.")
+                return "AI 모델 응답을 받을 수 없습니다."
+
+            result = response["response"]
             
     except Exception as e:
         result = f"오류가 발생했습니다: {str(e)}"
-        
+    
+    logger.info(f"process_weather_query 완료 ({intent}) - {timer.summary()}")
     return result
 
 if __name__ == "__main__":